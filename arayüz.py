@@ -1,9 +1,209 @@
 import tkinter as tk
-from tkinter import scrolledtext
+from tkinter import scrolledtext, ttk
 import subprocess
 import threading
 import os
 import signal
+import time
+from collections import deque
+from get import ClientConfig, TelemetryClient
+
+# Log kuyruğu Tk döngüsünde LOG_FLUSH_MS'de bir, her seferde en çok LOG_BATCH_LINES satır boşaltılır
+LOG_FLUSH_MS = 100
+LOG_BATCH_LINES = 200
+# Henüz çizilmemiş satırlar bu sınırı aşarsa en eskileri düşer
+LOG_PENDING_LIMIT = 5000
+# Log alanlarında tutulan en fazla (çizilen) satır; fazlası baştan silinir
+LOG_SCROLLBACK_LINES = 2000
+
+class LogPane:
+    """
+    Bir ScrolledText ve ona yazılmayı bekleyen satırların kuyruğu. append her thread'den
+    çağrılabilir; flush yalnızca Tk ana döngüsünden çağrılır.
+    """
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.lines = 0
+        self._pending = deque(maxlen=LOG_PENDING_LIMIT)
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    def append(self, message):
+        with self._lock:
+            if len(self._pending) == LOG_PENDING_LIMIT:
+                self._dropped += 1
+            self._pending.append(message)
+
+    def _take(self):
+        with self._lock:
+            pending, self._pending = self._pending, deque(maxlen=LOG_PENDING_LIMIT)
+            dropped, self._dropped = self._dropped, 0
+        return pending, dropped
+
+    def flush(self):
+        pending, dropped = self._take()
+        if not pending and not dropped:
+            return
+
+        # Arayüzün yetişemediği satırlar atlanır; yalnızca en yeni LOG_BATCH_LINES satır çizilir
+        skipped = dropped + max(0, len(pending) - LOG_BATCH_LINES)
+        while len(pending) > LOG_BATCH_LINES:
+            pending.popleft()
+
+        # Art arda tekrarlanan satırlar tek satırda toplanır
+        out = []
+        if skipped:
+            out.append(f"... {skipped} satır atlandı")
+        previous, repeat = None, 0
+        for line in pending:
+            if line == previous:
+                repeat += 1
+                continue
+            if repeat:
+                out.append(f"{previous} (x{repeat + 1})")
+            elif previous is not None:
+                out.append(previous)
+            previous, repeat = line, 0
+        if previous is not None:
+            out.append(f"{previous} (x{repeat + 1})" if repeat else previous)
+
+        # Kullanıcı yukarı kaydırmışsa görünümü sona çekme
+        at_bottom = self.widget.yview()[1] >= 0.999
+        self.widget.insert(tk.END, "\n".join(out) + "\n")
+        # Traceback gibi çok satırlı mesajlar görünen satır sayısıyla sayılır
+        self.lines += sum(entry.count("\n") + 1 for entry in out)
+        if self.lines > LOG_SCROLLBACK_LINES:
+            excess = self.lines - LOG_SCROLLBACK_LINES
+            self.widget.delete("1.0", f"{excess + 1}.0")
+            self.lines = LOG_SCROLLBACK_LINES
+        if at_bottom:
+            self.widget.see(tk.END)
+
+# Filo tablosu en fazla FLEET_REFRESH_MS'de bir güncellenir; arada gelen olaylar drone başına birleşir
+FLEET_REFRESH_MS = 250
+# Veri gelmeyen drone'ların yaş hücresi de bu aralıkla yenilenir
+FLEET_AGE_REFRESH_S = 1.0
+FLEET_COLUMNS = (
+    ("lat", "Enlem", 100), ("lon", "Boylam", 100), ("alt", "Yükseklik", 80),
+    ("north", "Kuzey", 70), ("east", "Doğu", 70), ("down", "Aşağı", 70),
+    ("battery", "Batarya", 70), ("age", "Yaş (sn)", 70)
+)
+
+def _fmt(value, digits):
+    return "N/A" if value is None else f"{value:.{digits}f}"
+
+def fleet_row(drone_data, now):
+    """Drone verisini tablo hücrelerine çevir; gösterim hassasiyeti gereksiz hücre yazımlarını da önler"""
+    position = drone_data.get("position") or {}
+    velocity = drone_data.get("velocity") or {}
+    ingest = [stamp.get("ingest") for stamp in (drone_data.get("timestamps") or {}).values() if stamp.get("ingest")]
+    return (
+        _fmt(position.get("lat"), 6), _fmt(position.get("lon"), 6), _fmt(position.get("alt"), 1),
+        _fmt(velocity.get("north"), 1), _fmt(velocity.get("east"), 1), _fmt(velocity.get("down"), 1),
+        _fmt(drone_data.get("battery"), 0), _fmt(now - max(ingest), 1) if ingest else "N/A"
+    )
+
+class FleetTable:
+    """
+    Sunucunun /telemetry/stream akışına doğrudan abone olan, drone başına bir satırlık tablo.
+    Akış thread'i değişen drone'ları biriktirir; Tk döngüsü yalnızca değişen hücreleri yazar.
+    """
+
+    def __init__(self, root, parent, log):
+        self.root = root
+        self.log = log
+        self.tree = ttk.Treeview(parent, columns=[c[0] for c in FLEET_COLUMNS], height=12)
+        self.tree.heading("#0", text="Drone")
+        self.tree.column("#0", width=90)
+        for column, title, width in FLEET_COLUMNS:
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width, anchor=tk.E)
+        scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+
+        self.client = None
+        self._data = {}
+        self._rows = {}
+        self._changed = set()
+        self._reset = False
+        self._lock = threading.Lock()
+        self._refresh_scheduled = False
+        self._last_full_refresh = 0.0
+
+    def start(self, stream_url):
+        if self.client is not None:
+            self.log("Filo görünümü zaten çalışıyor!")
+            return
+        self.client = TelemetryClient(ClientConfig(stream=True, stream_url=stream_url))
+        threading.Thread(target=self._follow, args=(self.client,), daemon=True).start()
+        if not self._refresh_scheduled:
+            self._refresh_scheduled = True
+            self.root.after(FLEET_REFRESH_MS, self.refresh)
+        self.log(f"Filo görünümü başlatıldı: {stream_url}")
+
+    def stop(self):
+        if self.client is None:
+            return
+        # Akış thread'i bir sonraki satırda (en geç keepalive ile) çıkar
+        self.client.stop()
+        self.client = None
+        self.log("Filo görünümü durduruldu.")
+
+    def _follow(self, client):
+        client.start()
+        for event, data, _ in client.iter_stream_events():
+            if client is not self.client:
+                return
+            with self._lock:
+                if event == "snapshot":
+                    # Yeniden bağlanma ya da sunucu yeniden başlatma: tablo baştan kurulur
+                    self._data = dict(data)
+                    self._reset = True
+                elif event == "remove":
+                    for drone_id in data.get("drones", []):
+                        self._data.pop(drone_id, None)
+                        self._changed.add(drone_id)
+                else:
+                    self._data.update(data)
+                    self._changed.update(data)
+
+    def refresh(self):
+        now = time.time()
+        full = now - self._last_full_refresh >= FLEET_AGE_REFRESH_S
+        if full:
+            self._last_full_refresh = now
+        with self._lock:
+            reset, self._reset = self._reset, False
+            changed, self._changed = self._changed, set()
+            data = self._data
+            if reset or full:
+                changed = set(data) | (changed & set(self._rows))
+            updates = {drone_id: data[drone_id] for drone_id in changed if drone_id in data}
+
+        # Snapshot'ta olmayan ya da kaldırılan drone'ların satırları silinir
+        for drone_id in list(self._rows):
+            if drone_id not in updates and (reset or drone_id in changed):
+                self.tree.delete(drone_id)
+                del self._rows[drone_id]
+
+        for drone_id, drone_data in updates.items():
+            row = fleet_row(drone_data, now)
+            old = self._rows.get(drone_id)
+            if old is None:
+                self.tree.insert("", tk.END, iid=drone_id, text=drone_id, values=row)
+            else:
+                for (column, _, _), value, old_value in zip(FLEET_COLUMNS, row, old):
+                    if value != old_value:
+                        self.tree.set(drone_id, column, value)
+            self._rows[drone_id] = row
+
+        if self.client is not None:
+            self.root.after(FLEET_REFRESH_MS, self.refresh)
+        else:
+            self._refresh_scheduled = False
 
 class SimulationGUI:
     def __init__(self, root):
@@ -47,6 +247,14 @@ class SimulationGUI:
         self.start_get_data_btn.pack()
         self.stop_get_data_btn = tk.Button(self.get_data_frame, text="Stop Get Data", command=self.stop_get_data, width=12)
         self.stop_get_data_btn.pack(pady=2)
+
+        # Filo Görünümü Butonları
+        self.fleet_view_frame = tk.Frame(self.controls_frame)
+        self.fleet_view_frame.pack(pady=5)
+        self.start_fleet_view_btn = tk.Button(self.fleet_view_frame, text="Start Fleet View", command=self.start_fleet_view, width=12)
+        self.start_fleet_view_btn.pack()
+        self.stop_fleet_view_btn = tk.Button(self.fleet_view_frame, text="Stop Fleet View", command=self.stop_fleet_view, width=12)
+        self.stop_fleet_view_btn.pack(pady=2)
         
         # Sağ taraf: Stop All butonu
         self.stop_all_frame = tk.Frame(self.button_frame)
@@ -69,14 +277,29 @@ class SimulationGUI:
         self.get_data_log_label.pack()
         self.get_data_log = scrolledtext.ScrolledText(self.log_frame, width=80, height=20)  # Height 20'ye çıkarıldı
         self.get_data_log.pack(pady=5)
+
+        self.log_panes = {
+            "sim_server": LogPane(self.sim_server_log),
+            "get_data": LogPane(self.get_data_log)
+        }
+        self.root.after(LOG_FLUSH_MS, self.flush_logs)
+
+        # Canlı filo tablosu
+        self.fleet_label = tk.Label(root, text="Fleet")
+        self.fleet_label.pack()
+        self.fleet_frame = tk.Frame(root)
+        self.fleet_frame.pack(pady=5, fill=tk.BOTH, expand=True)
+        self.fleet_table = FleetTable(root, self.fleet_frame, lambda message: self.log(message, "get_data"))
         
     def log(self, message, log_type="sim_server"):
-        if log_type == "get_data":
-            self.get_data_log.insert(tk.END, message + "\n")
-            self.get_data_log.see(tk.END)
-        else:
-            self.sim_server_log.insert(tk.END, message + "\n")
-            self.sim_server_log.see(tk.END)
+        """Thread güvenli; satır kuyruğa alınır ve Tk döngüsünde toplu olarak çizilir"""
+        pane = self.log_panes["get_data" if log_type == "get_data" else "sim_server"]
+        pane.append(message)
+
+    def flush_logs(self):
+        for pane in self.log_panes.values():
+            pane.flush()
+        self.root.after(LOG_FLUSH_MS, self.flush_logs)
     
     def run_command(self, command, process_key):
         try:
@@ -133,6 +356,12 @@ class SimulationGUI:
         else:
             self.log("Get Data zaten çalışıyor!", "get_data")
     
+    def start_fleet_view(self):
+        self.fleet_table.start(ClientConfig().stream_url)
+
+    def stop_fleet_view(self):
+        self.fleet_table.stop()
+    
     def stop_process(self, process_key):
         process = self.processes.get(process_key)
         if process is not None:
@@ -168,6 +397,7 @@ class SimulationGUI:
     def stop_all(self):
         self.log("Tüm süreçler durduruluyor...", "sim_server")
         self.log("Tüm süreçler durduruluyor...", "get_data")
+        self.fleet_table.stop()
         for key in self.processes.keys():
             self.stop_process(key)
         subprocess.run("rosnode kill -a", shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
@@ -0,0 +1,199 @@
+"""
+Telemetri hattının uçtan uca ölçümü. PX4 gerektirmez: sunucu ayrı bir süreçte sentetik
+filo ile çalışır, ölçüm bu süreçten yapılır. Her filo boyutu için:
+
+  - ingest: depoya saniyede yazılan örnek sayısı (X-Telemetry-Version artışından)
+  - /telemetry: N eşzamanlı istemcide gecikme yüzdelikleri, istek/sn, yanıt boyutu
+  - sunucu sürecinin RSS'i (ölçüm boyunca en yüksek değer)
+
+Çalıştırma:
+    python benchmarks/pipeline.py --sizes 10 100 1000 --clients 8 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import socket
+import statistics
+import sys
+import time
+from dataclasses import asdict
+from typing import Dict, List
+
+import aiohttp
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server6
+from telemetry_codec import JSON_MIME, PACKED_MIME
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _percentile(values: List[float], p: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(p / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
+
+def _serve(config: server6.ServerConfig):
+    """Sunucu süreci girişi"""
+    server6.main(config)
+
+async def _wait_ready(session: aiohttp.ClientSession, url: str, num_drones: int, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(url) as response:
+                if response.status == 200 and len(await response.json()) >= num_drones:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError(f"Sunucu {timeout} sn içinde {num_drones} drone'a ulaşmadı")
+
+async def _version(session: aiohttp.ClientSession, url: str) -> int:
+    async with session.get(url, headers={"Accept": PACKED_MIME}) as response:
+        await response.read()
+        return int(response.headers["X-Telemetry-Version"])
+
+async def _client(session: aiohttp.ClientSession, url: str, accept: str, until: float,
+                  latencies: List[float], sizes: List[int]):
+    while time.monotonic() < until:
+        started = time.perf_counter()
+        async with session.get(url, headers={"Accept": accept}) as response:
+            body = await response.read()
+        latencies.append(time.perf_counter() - started)
+        sizes.append(len(body))
+
+async def _sample_rss(process: psutil.Process, until: float, samples: List[int]):
+    """Sunucu ve alt süreçlerinin (shard işçileri, mavsdk_server) toplam RSS'i"""
+    while time.monotonic() < until:
+        try:
+            rss = process.memory_info().rss
+        except psutil.Error:
+            return
+        for child in process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                # Örnekleme sırasında kapanan alt süreç
+                pass
+        samples.append(rss)
+        await asyncio.sleep(0.2)
+
+async def _measure(url: str, pid: int, args, num_drones: int) -> Dict:
+    accept = PACKED_MIME if args.format == "packed" else JSON_MIME
+    connector = aiohttp.TCPConnector(limit=args.clients)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await _wait_ready(session, url, num_drones, args.startup_timeout)
+        await asyncio.sleep(args.warmup)
+
+        # Ingest: istemci yükü olmadan depo sürümünün artış hızı
+        v0, t0 = await _version(session, url), time.monotonic()
+        await asyncio.sleep(args.duration)
+        v1, t1 = await _version(session, url), time.monotonic()
+
+        # HTTP: N eşzamanlı istemci, aynı süre boyunca
+        latencies: List[float] = []
+        sizes: List[int] = []
+        rss: List[int] = []
+        until = time.monotonic() + args.duration
+        started = time.monotonic()
+        await asyncio.gather(
+            _sample_rss(psutil.Process(pid), until, rss),
+            *[_client(session, url, accept, until, latencies, sizes) for _ in range(args.clients)]
+        )
+        elapsed = time.monotonic() - started
+
+    return {
+        "num_drones": num_drones,
+        "ingest_samples_per_sec": round((v1 - v0) / (t1 - t0), 1),
+        "requests": len(latencies),
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50) * 1000, 3),
+            "p90": round(_percentile(latencies, 90) * 1000, 3),
+            "p99": round(_percentile(latencies, 99) * 1000, 3),
+            "max": round(max(latencies, default=float("nan")) * 1000, 3),
+        },
+        "response_bytes": int(statistics.mean(sizes)) if sizes else 0,
+        "server_rss_bytes": max(rss, default=0),
+    }
+
+def run_scenario(args, num_drones: int) -> Dict:
+    config = server6.ServerConfig(
+        host="127.0.0.1",
+        port=_free_port(),
+        num_drones=num_drones,
+        ingest_backend="synthetic",
+        persistent_streams=True,
+        synthetic_rate_hz=args.rate,
+        async_http=args.http == "async",
+        num_shards=args.shards,
+        history_size=args.history_size
+    )
+    process = multiprocessing.get_context("spawn").Process(target=_serve, args=(config,))
+    process.start()
+    try:
+        result = asyncio.run(_measure(f"http://127.0.0.1:{config.port}/telemetry", process.pid, args, num_drones))
+    finally:
+        # Sunucu süreci daemon değil (parçalı modda kendi işçilerini başlatır); burada her durumda
+        # kapatılır. Parçalı modda işçiler de kapansın diye önce SIGTERM
+        process.terminate()
+        process.join(timeout=15)
+        if process.is_alive():
+            process.kill()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetri hattı uçtan uca ölçüm")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--clients", type=int, default=8, help="Eşzamanlı /telemetry istemcisi")
+    parser.add_argument("--duration", type=float, default=5.0, help="Her ölçüm aşamasının süresi (sn)")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--rate", type=float, default=10.0, help="Sentetik filo adım hızı (Hz)")
+    parser.add_argument("--http", choices=["flask", "async"], default="async")
+    parser.add_argument("--format", choices=["json", "packed"], default="json")
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--history-size", type=int, default=3600)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--output", default="bench_output.json", help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    results = []
+    for num_drones in args.sizes:
+        result = run_scenario(args, num_drones)
+        results.append(result)
+        latency = result["latency_ms"]
+        print(
+            f"{num_drones:>6} drone | ingest {result['ingest_samples_per_sec']:>9.1f} örnek/sn | "
+            f"{result['requests_per_sec']:>8.1f} istek/sn | p50 {latency['p50']:.2f} ms "
+            f"p99 {latency['p99']:.2f} ms | {result['response_bytes']} B | "
+            f"RSS {result['server_rss_bytes'] / 2**20:.1f} MiB",
+            flush=True
+        )
+
+    report = {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+            "server_defaults": asdict(server6.ServerConfig()),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Sonuçlar yazıldı: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Yakınlık indeksinin güncelleme ve sorgu sürelerini tüm filoyu tarayan doğrusal aramayla
+karşılaştırır. Çakışma sorgusu hem güncellemelerle tutulan çiftlerden (separation) hem de
+tam ızgara taramasından ölçülür. Drone'lar sabit yoğunlukla (drone başına spacing x spacing metre) rastgele
+dağıtılır. Çalıştırma: python benchmarks/spatial.py
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import timeit
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spatial_index import EARTH_RADIUS_M, SpatialIndex
+
+FLEET_SIZES = [100, 1000, 5000]
+HOME = (47.397742, 8.545594, 488.0)
+
+def make_positions(num_drones: int, spacing: float, seed: int = 0) -> Dict[str, Tuple[float, float, float]]:
+    """Kare bir alana düzgün dağılmış (lat, lon, alt) konumları"""
+    rng = random.Random(seed)
+    half = math.sqrt(num_drones) * spacing / 2
+    lat0, lon0, alt0 = HOME
+    positions = {}
+    for i in range(num_drones):
+        north, east = rng.uniform(-half, half), rng.uniform(-half, half)
+        positions[f"drone_{i}"] = (
+            lat0 + math.degrees(north / EARTH_RADIUS_M),
+            lon0 + math.degrees(east / (EARTH_RADIUS_M * math.cos(math.radians(lat0)))),
+            alt0 + rng.uniform(0, 50)
+        )
+    return positions
+
+def linear_nearby(index: SpatialIndex, lat: float, lon: float, radius: float) -> List[Tuple[str, float]]:
+    """İndeks olmadan: her drone'a uzaklık"""
+    qx, qy = index.project(lat, lon)
+    result = [
+        (drone_id, d) for drone_id, (x, y, _) in ((k, index.position(k)) for k in index._slots)
+        if (d := math.hypot(x - qx, y - qy)) <= radius
+    ]
+    result.sort(key=lambda item: item[1])
+    return result
+
+def measure(func, repeat: int) -> float:
+    """Bir çağrının ortalama süresi (mikrosaniye), en iyi 5 turdan"""
+    return min(timeit.repeat(func, number=repeat, repeat=5)) / repeat * 1e6
+
+def run(fleet_sizes: List[int], spacing: float, radius: float, separation: float, cell_size: float) -> List[Dict]:
+    results = []
+    for num_drones in fleet_sizes:
+        positions = make_positions(num_drones, spacing)
+        index = SpatialIndex(cell_size, HOME[:2], separation=separation)
+        plain = SpatialIndex(cell_size, HOME[:2])
+        for drone_id, (lat, lon, alt) in positions.items():
+            index.update(drone_id, lat, lon, alt)
+            plain.update(drone_id, lat, lon, alt)
+
+        rng = random.Random(1)
+        drone_ids = list(positions)
+        moves = [(d, *positions[d]) for d in (rng.choice(drone_ids) for _ in range(1000))]
+        lat, lon, _ = HOME
+        repeat = max(10, 20000 // num_drones)
+        results.append({
+            "num_drones": num_drones,
+            "update_us": measure(lambda: [plain.update(*m) for m in moves], 1) / len(moves),
+            "update_separation_us": measure(lambda: [index.update(*m) for m in moves], 1) / len(moves),
+            "nearby_us": measure(lambda: index.nearby(lat, lon, radius), repeat * 10),
+            "linear_nearby_us": measure(lambda: linear_nearby(index, lat, lon, radius), repeat),
+            "nearby_count": len(index.nearby(lat, lon, radius)),
+            "conflicts_us": measure(lambda: index.conflicts(separation), repeat),
+            "scan_conflicts_us": measure(lambda: plain.conflicts(separation), max(3, repeat // 10)),
+            "conflict_pairs": len(index.conflicts(separation)),
+        })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=FLEET_SIZES)
+    parser.add_argument("--spacing", type=float, default=30.0, help="drone başına düşen kare alanın kenarı (m)")
+    parser.add_argument("--radius", type=float, default=100.0, help="/telemetry/nearby yarıçapı (m)")
+    parser.add_argument("--separation", type=float, default=5.0, help="/telemetry/conflicts yatay ayrımı (m)")
+    parser.add_argument("--cell-size", type=float, default=100.0)
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.spacing, args.radius, args.separation, args.cell_size)
+    print(f"{'drone':>6} {'update':>8} {'+ayrım':>8} {'nearby':>9} {'doğrusal':>10} {'komşu':>6} "
+          f"{'çiftler':>9} {'tarama':>10} {'çift':>6}  (µs)")
+    for r in results:
+        print(f"{r['num_drones']:>6} {r['update_us']:>8.2f} {r['update_separation_us']:>8.2f} {r['nearby_us']:>9.1f} "
+              f"{r['linear_nearby_us']:>10.1f} {r['nearby_count']:>6} {r['conflicts_us']:>9.1f} "
+              f"{r['scan_conflicts_us']:>10.1f} {r['conflict_pairs']:>6}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
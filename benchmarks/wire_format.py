@@ -0,0 +1,82 @@
+"""
+/telemetry için JSON ve paketli ikili biçimi karşılaştırır: yanıt boyutu,
+kodlama ve çözme süresi. Çalıştırma: python benchmarks/wire_format.py
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telemetry_codec import decode_packed, encode_packed
+
+FLEET_SIZES = [5, 100, 1000]
+
+def make_fleet(num_drones: int, seed: int = 0) -> Dict[str, Dict]:
+    """server6.telemetry_data ile aynı biçimde rastgele bir filo"""
+    rng = random.Random(seed)
+    return {
+        f"drone_{i}": {
+            "position": {
+                "lat": 47.3977 + rng.uniform(-0.01, 0.01),
+                "lon": 8.5456 + rng.uniform(-0.01, 0.01),
+                "alt": 488.0 + rng.uniform(0, 50)
+            },
+            "velocity": {
+                "north": rng.uniform(-5, 5),
+                "east": rng.uniform(-5, 5),
+                "down": rng.uniform(-1, 1)
+            },
+            "battery": round(rng.uniform(20, 100), 1)
+        }
+        for i in range(num_drones)
+    }
+
+def measure(func, repeat: int) -> float:
+    """Bir çağrının ortalama süresi (mikrosaniye), en iyi 5 turdan"""
+    return min(timeit.repeat(func, number=repeat, repeat=5)) / repeat * 1e6
+
+def run(fleet_sizes: List[int]) -> List[Dict]:
+    results = []
+    for num_drones in fleet_sizes:
+        data = make_fleet(num_drones)
+        repeat = max(10, 20000 // num_drones)
+
+        # Flask jsonify debug dışında sıkışık JSON üretir
+        json_body = json.dumps(data, separators=(",", ":")).encode()
+        packed_body = encode_packed(data, 1)
+        results.append({
+            "num_drones": num_drones,
+            "json_bytes": len(json_body),
+            "packed_bytes": len(packed_body),
+            "json_encode_us": measure(lambda: json.dumps(data, separators=(",", ":")).encode(), repeat),
+            "packed_encode_us": measure(lambda: encode_packed(data, 1), repeat),
+            "json_decode_us": measure(lambda: json.loads(json_body), repeat),
+            "packed_decode_us": measure(lambda: decode_packed(packed_body), repeat),
+        })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=FLEET_SIZES)
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    results = run(args.sizes)
+    print(f"{'drone':>6} {'json B':>9} {'packed B':>9} {'enc json':>10} {'enc pack':>10} "
+          f"{'dec json':>10} {'dec pack':>10}  (µs)")
+    for r in results:
+        print(f"{r['num_drones']:>6} {r['json_bytes']:>9} {r['packed_bytes']:>9} "
+              f"{r['json_encode_us']:>10.1f} {r['packed_encode_us']:>10.1f} "
+              f"{r['json_decode_us']:>10.1f} {r['packed_decode_us']:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import asyncio
+import bisect
+import math
+import mmap
+import struct
+import time
+from typing import Callable, Iterator, Optional, Tuple
+
+RECORDING_MAGIC = b"TLMREC01"
+
+# Başlık: magic, kayıt boyutu, kayıt başlangıç zamanı (epoch)
+FILE_HEADER = struct.Struct('<8sId')
+FILE_HEADER_SIZE = 64
+
+# Kayıt: zaman, drone kimliği, tür, üç değer (kullanılmayanlar NaN)
+RECORD = struct.Struct('<d16sB7x3d')
+DRONE_ID_SIZE = 16
+
+# Zaman indeksi girdisi: zaman, kayıt numarası
+INDEX_ENTRY = struct.Struct('<dQ')
+
+KIND_REGISTER = 0
+KIND_POSITION = 1
+KIND_VELOCITY = 2
+KIND_BATTERY = 3
+# Drone çalışırken kaldırıldı (değerler NaN)
+KIND_REMOVE = 4
+
+_KINDS = {"position": KIND_POSITION, "velocity": KIND_VELOCITY, "battery": KIND_BATTERY, "remove": KIND_REMOVE}
+
+def _encode_value(key: Optional[str], value) -> Tuple[float, float, float]:
+    if key == "position":
+        return value.get("lat", math.nan), value.get("lon", math.nan), value.get("alt", math.nan)
+    if key == "velocity":
+        return value.get("north", math.nan), value.get("east", math.nan), value.get("down", math.nan)
+    if key == "battery":
+        return float(value), math.nan, math.nan
+    return math.nan, math.nan, math.nan
+
+def _decode_value(kind: int, a: float, b: float, c: float):
+    if kind == KIND_POSITION:
+        return "position", {"lat": a, "lon": b, "alt": c}
+    if kind == KIND_VELOCITY:
+        return "velocity", {"north": a, "east": b, "down": c}
+    if kind == KIND_BATTERY:
+        return "battery", a
+    if kind == KIND_REMOVE:
+        return "remove", None
+    return None, None
+
+class FlightRecorder:
+    """
+    Depoya giren her örneği sabit boyutlu kayıtlar halinde sona ekleyen kayıt cihazı.
+    Yanındaki .idx dosyası index_interval saniyede bir (zaman, kayıt numarası) tutar.
+    """
+
+    def __init__(self, path: str, index_interval: float = 1.0):
+        self.path = path
+        self.index_interval = index_interval
+        self.start_time = time.time()
+        self.count = 0
+        self._next_index_time = 0.0
+        self._file = open(path, "wb")
+        self._index = open(path + ".idx", "wb")
+        header = FILE_HEADER.pack(RECORDING_MAGIC, RECORD.size, self.start_time)
+        self._file.write(header.ljust(FILE_HEADER_SIZE, b'\x00'))
+
+    def record(self, drone_id: str, key: Optional[str], value, timestamp: Optional[float] = None):
+        """key None ise drone kaydı, değilse bir telemetri örneği yaz"""
+        if self._file is None:
+            return
+        t = time.time() if timestamp is None else timestamp
+        if t >= self._next_index_time:
+            self._index.write(INDEX_ENTRY.pack(t, self.count))
+            self._next_index_time = t + self.index_interval
+            # İndeks girdileri aynı zamanda kaza durumunda kaybedilecek veriyi sınırlar
+            self._file.flush()
+            self._index.flush()
+        kind = _KINDS.get(key, KIND_REGISTER)
+        self._file.write(RECORD.pack(t, drone_id.encode()[:DRONE_ID_SIZE], kind, *_encode_value(key, value)))
+        self.count += 1
+
+    def remove(self, drone_id: str, timestamp: Optional[float] = None):
+        """Drone'un kaldırıldığını yaz; oynatmada da o anda depodan çıkarılır"""
+        self.record(drone_id, "remove", None, timestamp)
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._index.close()
+        self._file = None
+
+class FlightReplayer:
+    """Bir kaydı mmap ile okuyup örnekleri orijinal zamanlamayla (ya da hızlandırılmış) yeniden oynatır"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, record_size, self.start_time = FILE_HEADER.unpack_from(self._mm, 0)
+        if magic != RECORDING_MAGIC or record_size != RECORD.size:
+            self._mm.close()
+            raise ValueError(f"{path} bir telemetri kaydı değil")
+        # Yarım yazılmış son kayıt yok sayılır
+        self.count = (len(self._mm) - FILE_HEADER_SIZE) // RECORD.size
+
+        self._index_times, self._index_records = [], []
+        try:
+            with open(path + ".idx", "rb") as f:
+                for t, record_no in INDEX_ENTRY.iter_unpack(f.read()):
+                    if record_no < self.count:
+                        self._index_times.append(t)
+                        self._index_records.append(record_no)
+        except FileNotFoundError:
+            pass
+
+    def duration(self) -> float:
+        if self.count == 0:
+            return 0.0
+        return self.record_time(self.count - 1) - self.record_time(0)
+
+    def record_time(self, record_no: int) -> float:
+        return RECORD.unpack_from(self._mm, FILE_HEADER_SIZE + record_no * RECORD.size)[0]
+
+    def seek(self, offset: float) -> int:
+        """Kaydın başından offset saniye sonrasına denk gelen ilk kaydın numarası"""
+        if offset <= 0 or self.count == 0:
+            return 0
+        target = self.record_time(0) + offset
+        # İndeksle kaba konum, ardından kayıtlar üzerinde ikili arama
+        i = bisect.bisect_right(self._index_times, target) - 1
+        lo = self._index_records[i] if i >= 0 else 0
+        hi = self._index_records[i + 1] if i + 1 < len(self._index_records) else self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.record_time(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def records(self, start: int = 0) -> Iterator[Tuple[float, str, Optional[str], object]]:
+        """(zaman, drone_id, alan, değer) dizisi; alan None ise drone kaydı, "remove" ise kaldırma"""
+        for record_no in range(start, self.count):
+            t, raw_id, kind, a, b, c = RECORD.unpack_from(self._mm, FILE_HEADER_SIZE + record_no * RECORD.size)
+            key, value = _decode_value(kind, a, b, c)
+            yield t, raw_id.rstrip(b'\x00').decode(), key, value
+
+    async def replay(self, on_register: Callable[[str], None], on_sample: Callable[[str, str, object], None],
+                     speed: float = 1.0, start_offset: float = 0.0, is_known: Callable[[str], bool] = None,
+                     on_remove: Optional[Callable[[str], None]] = None):
+        """
+        Kaydı oynat. speed 1.0 gerçek zaman, N kat hızlı, 0 ise beklemeden en yüksek hız.
+        Kaldırma kayıtları on_remove'a gider; kaldırılan drone'un sonraki örnekleri onu yeniden kaydeder.
+        """
+        wall_start = time.monotonic()
+        first_t = None
+        for n, (t, drone_id, key, value) in enumerate(self.records(self.seek(start_offset))):
+            if first_t is None:
+                first_t = t
+            if speed > 0:
+                delay = (t - first_t) / speed - (time.monotonic() - wall_start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif n % 1000 == 0:
+                # En yüksek hızda da HTTP isteklerine sıra ver
+                await asyncio.sleep(0)
+
+            if key == "remove":
+                if on_remove is not None:
+                    on_remove(drone_id)
+                continue
+            if key is None or (is_known is not None and not is_known(drone_id)):
+                on_register(drone_id)
+            if key is not None:
+                on_sample(drone_id, key, value)
+
+    def close(self):
+        self._mm.close()
@@ -1,12 +1,16 @@
 import asyncio
-import subprocess
+import math
 import os
 import logging
 import signal
+import time
 import psutil
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Set
 from dataclasses import dataclass
 from pathlib import Path
+from mavlink_ingest import MSG_HEARTBEAT, parse_messages
+from process_logs import ProcessLogPump
+from resource_monitor import ResourceMonitor
 
 # Logging yapılandırması
 logging.basicConfig(
@@ -23,22 +27,145 @@ logger = logging.getLogger(__name__)
 class SimulationConfig:
     num_drones: int = 5
     px4_path: str = "/home/baris/PX4-Autopilot/build/px4_sitl_default/bin/px4"
+    # PX4 süreçlerinin çalışma dizini
+    px4_root: str = "/home/baris/PX4-Autopilot"
     gazebo_path: str = "/usr/bin/gazebo"
     world_path: str = "/home/baris/PX4-Autopilot/Tools/sitl_gazebo/worlds/empty.world"
     base_port: int = 14540
     positions: List[str] = None
+    # Aynı anda başlatılan en fazla PX4 örneği
+    launch_concurrency: int = 4
+    # Başlatılamayan bir örnek atlanmadan önce kaç kez yeniden denenir
+    launch_retries: int = 1
+    px4_ready_timeout: float = 30.0
+    # Gazebo hazır sayılması için master portunun (gzserver) bağlantı kabul etmesi beklenir
+    gazebo_master_port: int = 11345
+    gazebo_ready_timeout: float = 30.0
+    # Süreç çıktıları log_dir altında drone_<i>.log / gazebo.log dönen dosyalarına yazılır
+    log_dir: str = "logs"
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_backup_count: int = 3
+    # Bu seviye ve üzerindeki satırlar süreç başına saniyede forward_rate ile ana loga iletilir
+    forward_level: str = "WARNING"
+    forward_rate: float = 5.0
+    # Aynı makinede birden çok simülasyon için: PX4 örnek numarası (-i) ve MAVLink portu bu kadar kaydırılır
+    instance_offset: int = 0
+    # gz sim izolasyonu için GZ_PARTITION (None: ayarlanmaz)
+    gz_partition: Optional[str] = None
+    # False ise makinedeki diğer Gazebo süreçlerine dokunulmaz; temizlik yalnızca bu yöneticinin süreçleriyle sınırlı kalır
+    kill_existing_gazebo: bool = True
+    # Ana thread dışında ya da başka bir yöneticinin içinde çalışırken False
+    install_signal_handlers: bool = True
+    # Gazebo ve PX4 süreçlerinin kaynak örnekleme aralığı (0: kapalı)
+    resource_interval: float = 2.0
+    resource_log_interval: float = 30.0
+    # Makine CPU / bellek kullanımı bu yüzdelerden birini aşarken yeni drone başlatılmaz (None: sınırsız)
+    max_host_cpu_percent: Optional[float] = None
+    max_host_memory_percent: Optional[float] = None
 
     def __post_init__(self):
         if self.positions is None:
             self.positions = [f"{i},{i+1}" for i in range(self.num_drones)]
 
+# PX4 SITL konsolunda açılışın tamamlandığını gösteren satırlar
+PX4_READY_MARKERS = ("Startup script returned successfully", "Ready for takeoff")
+
+class HeartbeatProtocol(asyncio.DatagramProtocol):
+    """Porta gelen ilk MAVLink HEARTBEAT paketinde future'ı tamamlar"""
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+
+    def datagram_received(self, data: bytes, addr):
+        if self.future.done():
+            return
+        for _, _, msgid, _ in parse_messages(data):
+            if msgid == MSG_HEARTBEAT:
+                self.future.set_result(addr)
+                return
+
+async def wait_tcp_port(host: str, port: int, timeout: float, interval: float = 0.2) -> bool:
+    """Port bağlantı kabul edene kadar dene"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), interval * 5)
+            writer.close()
+            return True
+        except (OSError, asyncio.TimeoutError):
+            await asyncio.sleep(interval)
+    return False
+
+def parse_pose(pose) -> str:
+    """
+    PX4_GZ_MODEL_POSE değerini doğrula: 2-6 virgülle ayrılmış sonlu sayı (x,y[,z,roll,pitch,yaw]).
+    Geçersizse ValueError; geçerliyse boşlukları atılmış hali döner.
+    """
+    if not isinstance(pose, str):
+        raise ValueError(f"Geçersiz poz: {pose!r}")
+    parts = [part.strip() for part in pose.split(",")]
+    try:
+        values = [float(part) for part in parts]
+    except ValueError:
+        raise ValueError(f"Geçersiz poz: {pose!r}") from None
+    if not 2 <= len(values) <= 6 or not all(math.isfinite(v) for v in values):
+        raise ValueError(f"Geçersiz poz: {pose!r} (2-6 sayı bekleniyor: x,y[,z,roll,pitch,yaw])")
+    return ",".join(parts)
+
+def kill_process_tree(pids: List[int], timeout: float = 5.0):
+    """Süreçleri alt süreçleriyle birlikte önce SIGTERM, süre dolarsa SIGKILL ile kapat"""
+    procs = []
+    for pid in pids:
+        try:
+            parent = psutil.Process(pid)
+            procs.extend(parent.children(recursive=True) + [parent])
+        except psutil.NoSuchProcess:
+            pass
+    for proc in procs:
+        try:
+            proc.terminate()
+        except psutil.NoSuchProcess:
+            pass
+    _, alive = psutil.wait_procs(procs, timeout=timeout)
+    for proc in alive:
+        try:
+            proc.kill()
+        except psutil.NoSuchProcess:
+            pass
+
 class SimulationManager:
     def __init__(self, config: SimulationConfig):
         self.config = config
-        self.processes: List[subprocess.Popen] = []
+        self.processes: List[asyncio.subprocess.Process] = []
+        self.drone_processes: Dict[int, asyncio.subprocess.Process] = {}
+        # Drone başına Gazebo başlangıç konumu "x,y"; sonradan eklenen drone'lar kendi konumunu verebilir
+        self.poses: Dict[int, str] = dict(enumerate(config.positions))
+        self._reported_exits: Set[int] = set()
+        self._drain_tasks: List[asyncio.Task] = []
+        self.log_pump = ProcessLogPump(
+            log_dir=config.log_dir,
+            max_bytes=config.log_max_bytes,
+            backup_count=config.log_backup_count,
+            forward_level=logging.getLevelName(config.forward_level),
+            forward_rate=config.forward_rate,
+            forward_logger=logger
+        )
+        self.resource_monitor: Optional[ResourceMonitor] = None
+        if config.resource_interval > 0:
+            self.resource_monitor = ResourceMonitor(config.resource_interval, config.resource_log_interval)
         self._cleanup_done = False
-        self._setup_signal_handlers()
-        self._kill_existing_gazebo()
+        if config.install_signal_handlers:
+            self._setup_signal_handlers()
+        if config.kill_existing_gazebo:
+            self._kill_existing_gazebo()
+
+    def _process_env(self) -> Dict[str, str]:
+        """Gazebo ve PX4 süreçlerinin ortamı; ikisi de bu yığının Gazebo master'ına bağlanır"""
+        env = os.environ.copy()
+        env["GAZEBO_MASTER_URI"] = f"http://127.0.0.1:{self.config.gazebo_master_port}"
+        if self.config.gz_partition:
+            env["GZ_PARTITION"] = self.config.gz_partition
+        return env
 
     def _kill_existing_gazebo(self):
         """Çalışan Gazebo süreçlerini sonlandır"""
@@ -64,75 +191,215 @@ class SimulationManager:
     async def start_gazebo(self) -> bool:
         """Gazebo simülasyonunu başlat"""
         # Önce var olan Gazebo süreçlerini temizle
-        self._kill_existing_gazebo()
+        if self.config.kill_existing_gazebo:
+            self._kill_existing_gazebo()
         
         gazebo_cmd = f"{self.config.gazebo_path} --verbose {self.config.world_path}"
         logger.info(f"Gazebo başlatılıyor: {gazebo_cmd}")
         
         try:
-            with open("gazebo_output.log", "w") as log_file:
-                gazebo_process = subprocess.Popen(
-                    gazebo_cmd,
-                    shell=True,
-                    stdout=log_file,
-                    stderr=log_file,
-                    text=True
-                )
+            started = time.monotonic()
+            gazebo_process = await asyncio.create_subprocess_shell(
+                gazebo_cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                stdin=asyncio.subprocess.DEVNULL,
+                env=self._process_env()
+            )
             self.processes.append(gazebo_process)
-            await asyncio.sleep(5)
+            if self.resource_monitor is not None:
+                self.resource_monitor.track("gazebo", gazebo_process.pid, "gazebo")
+            self._drain_tasks.append(asyncio.create_task(self.log_pump.pump("gazebo", gazebo_process.stdout)))
+
+            probe = asyncio.create_task(wait_tcp_port(
+                "127.0.0.1", self.config.gazebo_master_port, self.config.gazebo_ready_timeout
+            ))
+            exited = asyncio.create_task(gazebo_process.wait())
+            done, _ = await asyncio.wait({probe, exited}, return_when=asyncio.FIRST_COMPLETED)
+            if exited in done:
+                probe.cancel()
+                logger.error(f"Gazebo kapandı (çıkış kodu {gazebo_process.returncode}), {self.config.log_dir}/gazebo.log'a bakın")
+                return False
+            exited.cancel()
+            if not probe.result():
+                # Master portu olmayan kurulumlar (ör. gz sim) için süreç yaşıyorsa devam edilir
+                logger.warning(f"Gazebo {self.config.gazebo_ready_timeout:.0f} sn içinde "
+                               f"{self.config.gazebo_master_port} portunu açmadı, devam ediliyor")
+            else:
+                logger.info(f"Gazebo {time.monotonic() - started:.1f} sn içinde hazır")
             return True
         except Exception as e:
             logger.error(f"Gazebo başlatılırken hata: {e}")
             return False
 
-    async def start_drone(self, drone_id: int) -> bool:
-        """Belirli bir drone'u başlat"""
-        port = self.config.base_port + drone_id
-        pose = self.config.positions[drone_id]
+    async def _drain_output(self, drone_id: int, process: asyncio.subprocess.Process,
+                            ready: asyncio.Future):
+        """PX4 çıktısını log dosyasına akıt; hazır satırı görülünce ready'yi tamamla"""
+        def on_line(text: str):
+            if not ready.done() and any(marker in text for marker in PX4_READY_MARKERS):
+                ready.set_result("stdout")
+
+        await self.log_pump.pump(f"drone_{drone_id}", process.stdout, on_line)
+
+    async def _listen_heartbeat(self, port: int, ready: asyncio.Future):
+        """base_port + i'ye gelen ilk HEARTBEAT'i bekle; port doluysa yalnızca stdout'a güvenilir"""
+        loop = asyncio.get_running_loop()
+        heartbeat = loop.create_future()
+        try:
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: HeartbeatProtocol(heartbeat), local_addr=("0.0.0.0", port)
+            )
+        except OSError as e:
+            logger.debug(f"{port} portu dinlenemedi ({e}), hazır olma stdout'tan izlenecek")
+            return
+        try:
+            await asyncio.shield(heartbeat)
+            if not ready.done():
+                ready.set_result("heartbeat")
+        finally:
+            transport.close()
+            # Soket bir sonraki döngü turunda kapanır; port toplayıcıya boş devredilsin
+            await asyncio.sleep(0)
+
+    async def _launch_drone(self, drone_id: int) -> bool:
+        """Tek bir başlatma denemesi; PX4 hazır olana, kapanana ya da süre dolana kadar bekler"""
+        instance = self.config.instance_offset + drone_id
+        port = self.config.base_port + instance
+        pose = self.poses.get(drone_id, f"{drone_id},{drone_id + 1}")
         system_id = drone_id + 1  # SYSID_THISMAV 1’den başlar (1, 2, 3, 4, 5)
         
-        cmd = (
-            f"PX4_SYS_AUTOSTART=4001 "
-            f"PX4_GZ_MODEL_POSE='{pose}' "
-            f"PX4_SIM_MODEL=gz_x500 "
-            f"PX4_SITL_PORT={port} "
-            f"SYSID_THISMAV={system_id} "  # Her drone için farklı SYSID_THISMAV
-            f"{self.config.px4_path} -i {drone_id}"
+        # Kabuk kullanılmaz; poz API'den gelebildiği için yalnızca ortam değişkeni olarak geçer
+        argv = [self.config.px4_path, "-i", str(instance)]
+        env = {
+            **self._process_env(),
+            "PX4_SYS_AUTOSTART": "4001",
+            "PX4_GZ_MODEL_POSE": pose,
+            "PX4_SIM_MODEL": "gz_x500",
+            "PX4_SITL_PORT": str(port),
+            "SYSID_THISMAV": str(system_id),  # Her drone için farklı SYSID_THISMAV
+        }
+
+        logger.info(f"Drone {drone_id} başlatılıyor: {' '.join(argv)} (poz {pose}, port {port})")
+        started = time.monotonic()
+
+        process = await asyncio.create_subprocess_exec(
+            *argv,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            stdin=asyncio.subprocess.DEVNULL,
+            cwd=self.config.px4_root,
+            env=env
         )
-        
-        logger.info(f"Drone {drone_id} başlatılıyor: {cmd}")
-        
+        ready = asyncio.get_running_loop().create_future()
+        drain = asyncio.create_task(self._drain_output(drone_id, process, ready))
+        heartbeat = asyncio.create_task(self._listen_heartbeat(port, ready))
+        exited = asyncio.create_task(process.wait())
         try:
-            process = subprocess.Popen(
-                cmd,
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                cwd="/home/baris/PX4-Autopilot",
-                text=True
+            done, _ = await asyncio.wait(
+                {ready, exited}, timeout=self.config.px4_ready_timeout, return_when=asyncio.FIRST_COMPLETED
             )
+        finally:
+            heartbeat.cancel()
+            exited.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+        if ready in done:
             self.processes.append(process)
-            
-            # İlk drone için 10 saniye, diğerleri için 2 saniye bekle
-            wait_time = 10 if drone_id == 0 else 2
-            await asyncio.sleep(wait_time)
-            return process.poll() is None
-        except Exception as e:
-            logger.error(f"Drone {drone_id} başlatılırken hata: {e}")
+            self.drone_processes[drone_id] = process
+            self._drain_tasks.append(drain)
+            if self.resource_monitor is not None:
+                # px4'ün başlattığı alt süreçler de bu kayda dahildir
+                self.resource_monitor.track(f"px4_{drone_id}", process.pid, "px4")
+            logger.info(f"Drone {drone_id} {time.monotonic() - started:.1f} sn içinde hazır ({ready.result()})")
+            return True
+
+        if process.returncode is not None:
+            logger.error(f"Drone {drone_id} açılış sırasında kapandı (çıkış kodu {process.returncode})")
+        else:
+            logger.error(f"Drone {drone_id} {self.config.px4_ready_timeout:.0f} sn içinde hazır olmadı")
+            await asyncio.get_running_loop().run_in_executor(None, kill_process_tree, [process.pid])
+        drain.cancel()
+        return False
+
+    async def start_drone(self, drone_id: int) -> bool:
+        """Belirli bir drone'u başlat; başarısız olursa launch_retries kez yeniden dene"""
+        for attempt in range(self.config.launch_retries + 1):
+            if attempt:
+                logger.info(f"Drone {drone_id} yeniden deneniyor ({attempt}/{self.config.launch_retries})")
+            try:
+                if await self._launch_drone(drone_id):
+                    return True
+            except Exception as e:
+                logger.error(f"Drone {drone_id} başlatılırken hata: {e}")
+        return False
+
+    def host_saturated(self) -> bool:
+        """Makine yükü max_host_cpu_percent / max_host_memory_percent sınırlarını aşıyor mu"""
+        if self.resource_monitor is None:
             return False
+        return self.resource_monitor.host_saturated(
+            self.config.max_host_cpu_percent, self.config.max_host_memory_percent
+        )
+
+    async def start_drones(self) -> List[int]:
+        """Drone'ları en fazla launch_concurrency paralellikle başlat; hazır olanların listesi"""
+        semaphore = asyncio.Semaphore(self.config.launch_concurrency)
+
+        async def launch(drone_id: int) -> bool:
+            async with semaphore:
+                if self.host_saturated():
+                    host = self.resource_monitor.last["host"]
+                    logger.warning(
+                        f"Makine doygun (CPU %{host.get('cpu_percent')}, bellek %{host.get('memory_percent')}), "
+                        f"drone {drone_id} başlatılmıyor"
+                    )
+                    return False
+                return await self.start_drone(drone_id)
+
+        started = time.monotonic()
+        results = await asyncio.gather(*(launch(i) for i in range(self.config.num_drones)))
+        ready = [i for i, ok in enumerate(results) if ok]
+        skipped = [i for i, ok in enumerate(results) if not ok]
+        logger.info(f"{len(ready)}/{self.config.num_drones} drone {time.monotonic() - started:.1f} sn içinde hazır")
+        if skipped:
+            logger.warning(f"Atlanan drone'lar: {skipped}")
+        return ready
+
+    async def add_drone(self, drone_id: int, pose: Optional[str] = None) -> bool:
+        """Çalışan dünyaya tek bir PX4 örneği ekle; Gazebo ve diğer drone'lar yeniden başlatılmaz"""
+        if drone_id in self.drone_processes:
+            logger.warning(f"Drone {drone_id} zaten çalışıyor")
+            return False
+        if self.host_saturated():
+            logger.warning(f"Makine doygun, drone {drone_id} başlatılmıyor")
+            return False
+        if pose is not None:
+            self.poses[drone_id] = parse_pose(pose)
+        self._reported_exits.discard(drone_id)
+        return await self.start_drone(drone_id)
+
+    async def remove_drone(self, drone_id: int) -> bool:
+        """Tek bir PX4 örneğini süreç ağacıyla kapat; dünya çalışmaya devam eder"""
+        process = self.drone_processes.pop(drone_id, None)
+        if process is None:
+            return False
+        # monitor_processes bu kapanışı hata olarak raporlamasın
+        self._reported_exits.add(drone_id)
+        if process in self.processes:
+            self.processes.remove(process)
+        if self.resource_monitor is not None:
+            self.resource_monitor.untrack(f"px4_{drone_id}")
+        await asyncio.get_running_loop().run_in_executor(None, kill_process_tree, [process.pid])
+        logger.info(f"Drone {drone_id} kapatıldı")
+        return True
 
     async def monitor_processes(self):
-        """Tüm süreçleri izle ve logla"""
+        """Beklenmedik şekilde kapanan süreçleri logla"""
         while True:
-            for i, proc in enumerate(self.processes):
-                if proc.poll() is None:  # Süreç hala çalışıyorsa
-                    if i > 0:  # Gazebo hariç drone'lar için
-                        out = proc.stdout.readline()
-                        err = proc.stderr.readline()
-                        if out:
-                            logger.debug(f"Drone {i-1} stdout: {out.strip()}")
-                        if err:
-                            logger.debug(f"Drone {i-1} stderr: {err.strip()}")
+            for drone_id, proc in list(self.drone_processes.items()):
+                if proc.returncode is not None and drone_id not in self._reported_exits:
+                    self._reported_exits.add(drone_id)
+                    logger.error(f"Drone {drone_id} kapandı (çıkış kodu {proc.returncode})")
             await asyncio.sleep(1)
 
     def cleanup(self):
@@ -144,34 +411,43 @@ class SimulationManager:
         self._cleanup_done = True
         
         # Önce tüm Gazebo süreçlerini sonlandır
-        self._kill_existing_gazebo()
+        if self.config.kill_existing_gazebo:
+            self._kill_existing_gazebo()
         
-        # Sonra diğer süreçleri temizle
-        for proc in self.processes:
-            try:
-                proc.terminate()
-                proc.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                proc.kill()
-            except Exception as e:
-                logger.error(f"Süreç kapatılırken hata: {e}")
+        # Sonra diğer süreçleri temizle; kabuk altındaki px4 süreçleri de dahil
+        for task in self._drain_tasks:
+            task.cancel()
+        try:
+            kill_process_tree([proc.pid for proc in self.processes])
+        except Exception as e:
+            logger.error(f"Süreç kapatılırken hata: {e}")
+        self.log_pump.stop()
 
-    async def run(self):
-        """Simülasyonu çalıştır"""
+    async def run(self, on_ready: Optional[Callable[[List[int]], None]] = None, require_drones: bool = True):
+        """
+        Simülasyonu çalıştır; on_ready hazır olan drone indeksleriyle bir kez çağrılır.
+        require_drones False ise hiç drone hazır olmasa da dünya açık kalır (drone'lar sonradan eklenir).
+        """
+        resource_task = None
+        if self.resource_monitor is not None:
+            resource_task = asyncio.create_task(self.resource_monitor.run())
         try:
             if not await self.start_gazebo():
                 return
 
-            for i in range(self.config.num_drones):
-                if not await self.start_drone(i):
-                    logger.error(f"Drone {i} başlatılamadı")
-                    return
-                logger.info(f"Drone {i} başarıyla başlatıldı")
+            ready = await self.start_drones()
+            if not ready and require_drones:
+                logger.error("Hiçbir drone başlatılamadı")
+                return
+            if on_ready is not None:
+                on_ready(ready)
 
             await self.monitor_processes()
         except Exception as e:
             logger.error(f"Simülasyon çalışırken hata: {e}")
         finally:
+            if resource_task is not None:
+                resource_task.cancel()
             self.cleanup()
 
 async def main():
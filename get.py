@@ -1,10 +1,19 @@
+import asyncio
+import random
 import requests
 import time
 import json
 import logging
+import struct
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
+from telemetry_codec import JSON_MIME, PACKED_MIME, decode_packed
+from telemetry_shm import (
+    DEFAULT_SHM_NAME, HEADER, RECORD, SEQ, SHM_LAYOUT_VERSION, SHM_MAGIC,
+    attach_readonly, record_offset, unpack_record
+)
 
 # Logging yapılandırması
 logging.basicConfig(
@@ -24,32 +33,234 @@ class ClientConfig:
     update_interval: float = 2.0
     max_retries: int = 3
     retry_delay: float = 1.0
+    # /telemetry yanıt biçimi: "json" ya da ikili kayıtlar için "packed" (zaman damgaları dahil)
+    wire_format: str = "json"
+    # Akış modu: /telemetry/stream üzerinden sunucunun ittiği güncellemeleri dinle
+    stream: bool = False
+    stream_url: str = "http://localhost:5000/telemetry/stream"
+    # Sunucu en geç 15 sn'de bir keepalive gönderir; bu süre boyunca sessizlik kopma sayılır
+    stream_read_timeout: float = 30.0
+    # Gecikme/bayatlık yüzdelikleri drone başına son latency_window örnekten hesaplanır
+    latency_window: int = 500
+    latency_log_interval: float = 10.0
+    # Tam ekran terminal görünümü (telemetry_dashboard); yalnızca değişen hücreler yeniden çizilir
+    dashboard: bool = False
+    dashboard_refresh: float = 0.25
+    # Birden çok sunucudan toplama: {ad alanı: taban URL}, ör. {"sim1": "http://10.0.0.5:5000"}.
+    # Verildiğinde asyncio tabanlı FleetClient kullanılır; drone kimlikleri "sim1/drone_0" olur
+    servers: Optional[Dict[str, str]] = None
+    # Sunucu başına açık tutulan keep-alive bağlantı sayısı
+    connections_per_server: int = 4
+    # Hata sonrası bekleme retry_delay'den başlayıp her denemede ikiye katlanır
+    max_backoff: float = 30.0
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Sıralı listede en yakın sıra yöntemiyle q. yüzdelik"""
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+class LatencyTracker:
+    """
+    Drone başına uçtan uca gecikme (alış - kaynak zamanı) ve bayatlık (alış - sunucuya giriş
+    zamanı) örneklerini sınırlı pencerelerde tutar. Sunucu ve istemci saatlerinin senkron
+    olduğu varsayılır (aynı makine ya da NTP).
+    """
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self.latency: Dict[str, Deque[float]] = {}
+        self.staleness: Dict[str, Deque[float]] = {}
+        # Aynı örneği birden çok kez saymamak için alan başına son görülen kaynak zamanı
+        self._seen: Dict[Tuple[str, str], float] = {}
+        self.transit: Deque[float] = deque(maxlen=window)
+
+    def _series(self, store: Dict[str, Deque[float]], drone_id: str) -> Deque[float]:
+        series = store.get(drone_id)
+        if series is None:
+            series = store[drone_id] = deque(maxlen=self.window)
+        return series
+
+    def observe(self, data: Dict, received: float, published: Optional[float] = None):
+        """Yanıttaki zaman damgalarını işle; timestamps taşımayan kayıtlar atlanır"""
+        if published is not None:
+            self.transit.append(received - published)
+        for drone_id, drone_data in data.items():
+            timestamps = drone_data.get("timestamps")
+            if not timestamps:
+                continue
+            newest_ingest = None
+            for key, stamp in timestamps.items():
+                ingest = stamp.get("ingest")
+                if ingest is not None and (newest_ingest is None or ingest > newest_ingest):
+                    newest_ingest = ingest
+                # Kaynak zamanı bilinmiyorsa (ör. mavsdk) gecikme sunucuya girişten ölçülür
+                source = stamp.get("source")
+                if source is None:
+                    source = ingest
+                if source is None or self._seen.get((drone_id, key)) == source:
+                    continue
+                self._seen[(drone_id, key)] = source
+                self._series(self.latency, drone_id).append(received - source)
+            if newest_ingest is not None:
+                self._series(self.staleness, drone_id).append(received - newest_ingest)
+
+    def summary(self, drone_id: str) -> Dict[str, Tuple[float, float, float]]:
+        """Drone için (p50, p90, p99) saniye; örneği olmayan seri dahil edilmez"""
+        result = {}
+        for name, store in (("latency", self.latency), ("staleness", self.staleness)):
+            series = store.get(drone_id)
+            if series:
+                values = sorted(series)
+                result[name] = (percentile(values, 50), percentile(values, 90), percentile(values, 99))
+        return result
+
+    def log_summary(self):
+        for drone_id in sorted(set(self.latency) | set(self.staleness)):
+            summary = self.summary(drone_id)
+            parts = [
+                f"{name} p50={p50 * 1000:.1f}ms p90={p90 * 1000:.1f}ms p99={p99 * 1000:.1f}ms"
+                for name, (p50, p90, p99) in summary.items()
+            ]
+            logger.info(f"{drone_id}: " + ", ".join(parts))
+        if self.transit:
+            values = sorted(self.transit)
+            logger.info(
+                f"Yayın->alış: p50={percentile(values, 50) * 1000:.1f}ms "
+                f"p99={percentile(values, 99) * 1000:.1f}ms"
+            )
+
+class SSEParser:
+    """Satır satır beslenen Server-Sent Events ayrıştırıcısı; hem requests hem aiohttp akışı kullanır"""
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self.event, self.data_lines, self.published = "message", [], None
+
+    def feed(self, line: str) -> Optional[Tuple[str, Dict, Optional[float]]]:
+        """Olay tamamlandıysa (olay, veri, yayın zamanı), değilse None"""
+        if line == "":
+            # Boş satır olayı tamamlar
+            completed = None
+            if self.data_lines:
+                completed = self.event, json.loads("\n".join(self.data_lines)), self.published
+            self._reset()
+            return completed
+        if line.startswith(":"):
+            pass  # keepalive yorumu
+        elif line.startswith("event:"):
+            self.event = line[6:].strip()
+        elif line.startswith("published:"):
+            self.published = float(line[10:].strip())
+        elif line.startswith("data:"):
+            self.data_lines.append(line[5:].lstrip())
+        return None
+
+def removed_from(headers) -> List[str]:
+    """?since'li yanıtın X-Removed-Drones başlığındaki drone kimlikleri"""
+    value = headers.get("X-Removed-Drones")
+    return value.split(",") if value else []
+
+def print_fleet(data: Dict):
+    """
+    Telemetri verilerini güzel bir formatta yazdırır.
+    """
+    print("\n" + "="*50)
+    print(f"Telemetri Verileri - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*50)
+
+    for drone_id, drone_data in data.items():
+        print(f"\n{drone_id}:")
+        print(f"  Pozisyon:")
+        print(f"    Enlem: {drone_data['position'].get('lat', 'N/A')}°")
+        print(f"    Boylam: {drone_data['position'].get('lon', 'N/A')}°")
+        print(f"    Yükseklik: {drone_data['position'].get('alt', 'N/A')}m")
+
+        print(f"  Hız:")
+        print(f"    Kuzey: {drone_data['velocity'].get('north', 'N/A')} m/s")
+        print(f"    Doğu: {drone_data['velocity'].get('east', 'N/A')} m/s")
+        print(f"    Aşağı: {drone_data['velocity'].get('down', 'N/A')} m/s")
+
+        print(f"  Batarya: %{drone_data.get('battery', 'N/A')}")
+        print("-"*30)
 
 class TelemetryClient:
     def __init__(self, config: ClientConfig):
         self.config = config
+        # Yoklamalar arasında TCP bağlantısı açık kalır
+        self._session = requests.Session()
         self._running = False
         self._last_data: Optional[Dict] = None
         self._last_update: Optional[datetime] = None
+        # Koşullu/delta istekler için son alınan sürüm ve ETag
+        self._etag: Optional[str] = None
+        self._version: Optional[int] = None
+        self.latency = LatencyTracker(config.latency_window)
+        self._last_latency_log = time.monotonic()
+
+    def _observe_latency(self, data: Dict, received: float, published: Optional[float]):
+        self.latency.observe(data, received, published)
+        now = time.monotonic()
+        if now - self._last_latency_log >= self.config.latency_log_interval:
+            self._last_latency_log = now
+            self.latency.log_summary()
 
     def fetch_telemetry(self) -> Optional[Dict]:
         """
-        Sunucudan telemetri verilerini çeker.
+        Sunucudan telemetri verilerini çeker. Önceki bir yanıt varsa If-None-Match ve
+        ?since=<sürüm> ile yalnızca değişen drone'lar istenir ve son veriyle birleştirilir.
         
         Returns:
             Optional[Dict]: Telemetri verileri veya hata durumunda None
         """
         for attempt in range(self.config.max_retries):
             try:
-                response = requests.get(
+                headers = {"Accept": PACKED_MIME if self.config.wire_format == "packed" else JSON_MIME}
+                params = {}
+                if self._last_data is not None and self._version is not None:
+                    if self._etag:
+                        headers["If-None-Match"] = self._etag
+                    params["since"] = self._version
+
+                response = self._session.get(
                     self.config.server_url,
+                    headers=headers,
+                    params=params,
                     timeout=self.config.request_timeout
                 )
                 
-                if response.status_code == 200:
-                    data = response.json()
+                received = time.time()
+                published = response.headers.get("X-Publish-Time")
+                published = float(published) if published is not None else None
+
+                if response.status_code == 304:
+                    self._last_update = datetime.now()
+                    self._observe_latency(self._last_data, received, published)
+                    logger.debug("Telemetri verileri değişmemiş")
+                    return self._last_data
+                elif response.status_code == 200:
+                    data = self.decode_response(response)
+                    version = response.headers.get("X-Telemetry-Version")
+                    version = int(version) if version is not None else None
+
+                    if params and (version is None or version < self._version):
+                        # Sunucu yeniden başlamış; delta güvenilmez, tam veri iste
+                        logger.info("Sunucu sürümü geriye gitti, tam veri alınıyor")
+                        self._etag = self._version = None
+                        self._last_data = None
+                        continue
+                    if params:
+                        data = {**self._last_data, **data}
+                        # Delta yanıtı kaldırılan drone'ları içermez; başlıkla bildirilir
+                        for drone_id in removed_from(response.headers):
+                            data.pop(drone_id, None)
+
                     self._last_data = data
+                    self._etag = response.headers.get("ETag")
+                    self._version = version
                     self._last_update = datetime.now()
+                    self._observe_latency(data, received, published)
                     logger.debug("Telemetri verileri başarıyla alındı")
                     return data
                 else:
@@ -63,66 +274,394 @@ class TelemetryClient:
                 logger.error(f"Beklenmeyen hata: {str(e)}")
             except json.JSONDecodeError:
                 logger.error("Sunucudan gelen veri JSON formatında değil")
+            except (ValueError, struct.error) as e:
+                logger.error(f"Paketli telemetri çözülemedi: {str(e)}")
             
             if attempt < self.config.max_retries - 1:
                 time.sleep(self.config.retry_delay)
         
         return None
 
+    def decode_response(self, response: requests.Response) -> Dict:
+        """Yanıtı Content-Type'a göre JSON ya da paketli biçimden çöz"""
+        if response.headers.get("Content-Type", "").startswith(PACKED_MIME):
+            data, _ = decode_packed(response.content)
+            return data
+        return response.json()
+
+    def iter_stream_events(self) -> Iterator[Tuple[str, Dict, Optional[float]]]:
+        """
+        /telemetry/stream bağlantısını açar ve gelen SSE olaylarını (olay, veri, yayın zamanı)
+        olarak döndürür.
+        Bağlantı koptuğunda retry_delay kadar bekleyip yeniden bağlanır.
+        """
+        while self._running:
+            try:
+                with self._session.get(
+                    self.config.stream_url,
+                    stream=True,
+                    timeout=(self.config.request_timeout, self.config.stream_read_timeout)
+                ) as response:
+                    if response.status_code != 200:
+                        logger.error(f"Akış açılamadı. Hata kodu: {response.status_code}")
+                    else:
+                        logger.info("Telemetri akışına bağlanıldı")
+                        parser = SSEParser()
+                        for line in response.iter_lines(decode_unicode=True):
+                            if not self._running:
+                                return
+                            if line is None:
+                                continue
+                            completed = parser.feed(line)
+                            if completed is not None:
+                                yield completed
+
+            except requests.exceptions.Timeout:
+                logger.warning("Telemetri akışı zaman aşımına uğradı, yeniden bağlanılıyor...")
+            except requests.exceptions.ConnectionError:
+                logger.error("Sunucuya bağlanılamadı. Sunucunun çalıştığından emin olun.")
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Beklenmeyen hata: {str(e)}")
+            except json.JSONDecodeError:
+                logger.error("Sunucudan gelen veri JSON formatında değil")
+
+            if self._running:
+                time.sleep(self.config.retry_delay)
+
     def print_telemetry(self, data: Dict):
         """
         Telemetri verilerini güzel bir formatta yazdırır.
         """
-        print("\n" + "="*50)
-        print(f"Telemetri Verileri - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("="*50)
-        
-        for drone_id, drone_data in data.items():
-            print(f"\n{drone_id}:")
-            print(f"  Pozisyon:")
-            print(f"    Enlem: {drone_data['position'].get('lat', 'N/A')}°")
-            print(f"    Boylam: {drone_data['position'].get('lon', 'N/A')}°")
-            print(f"    Yükseklik: {drone_data['position'].get('alt', 'N/A')}m")
-            
-            print(f"  Hız:")
-            print(f"    Kuzey: {drone_data['velocity'].get('north', 'N/A')} m/s")
-            print(f"    Doğu: {drone_data['velocity'].get('east', 'N/A')} m/s")
-            print(f"    Aşağı: {drone_data['velocity'].get('down', 'N/A')} m/s")
-            
-            print(f"  Batarya: %{drone_data.get('battery', 'N/A')}")
-            print("-"*30)
+        print_fleet(data)
 
     def run(self):
         """
         Telemetri verilerini sürekli olarak çeken ana döngü.
         """
+        if self.config.dashboard:
+            from telemetry_dashboard import TelemetryDashboard
+            TelemetryDashboard(self, self.config.dashboard_refresh).run()
+            return
+
         self._running = True
         logger.info("Telemetri istemcisi başlatılıyor...")
         
         try:
-            while self._running:
-                data = self.fetch_telemetry()
-                if data:
-                    self.print_telemetry(data)
-                time.sleep(self.config.update_interval)
+            if self.config.stream:
+                self.run_stream()
+            else:
+                while self._running:
+                    data = self.fetch_telemetry()
+                    if data:
+                        self.print_telemetry(data)
+                    time.sleep(self.config.update_interval)
                 
         except KeyboardInterrupt:
             logger.info("Telemetri istemcisi kapatılıyor...")
         finally:
             self._running = False
 
+    def run_stream(self):
+        """
+        Akış modunda ana döngü: ilk snapshot'ı ve ardından yalnızca değişen drone'ları yazdırır.
+        """
+        self._last_data = {}
+        for event, data, published in self.iter_stream_events():
+            received = time.time()
+            if event == "remove":
+                for drone_id in data.get("drones", []):
+                    self._last_data.pop(drone_id, None)
+                logger.info(f"Kaldırılan drone'lar: {', '.join(data.get('drones', []))}")
+                continue
+            if event == "snapshot":
+                self._last_data = data
+            else:
+                self._last_data.update(data)
+            self._last_update = datetime.now()
+            self._observe_latency(data, received, published)
+            self.print_telemetry(data)
+
+    def start(self):
+        """
+        İstemciyi çalışır duruma getirir; run dışında iter_stream_events ya da fetch_telemetry ile
+        kendi döngüsünü kuran kullanıcılar (arayüz, pano) önce bunu çağırır.
+        """
+        self._running = True
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
     def stop(self):
         """
         İstemciyi durdurur.
         """
         self._running = False
 
+class ServerState:
+    """FleetClient'ın tek bir sunucu için tuttuğu durum"""
+
+    def __init__(self, name: str, base_url: str):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.data: Dict[str, Dict] = {}
+        self.etag: Optional[str] = None
+        self.version: Optional[int] = None
+        self.failures = 0
+        self.connected = False
+        self.last_ok: Optional[float] = None
+
+    def backoff(self, config: ClientConfig) -> float:
+        """Ardışık hata sayısına göre üstel bekleme; sunucular aynı anda yüklenmesin diye rastgele kaydırılır"""
+        delay = min(config.max_backoff, config.retry_delay * (2 ** max(0, self.failures - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+class FleetClient:
+    """
+    Birden çok server6.py örneğini tek asyncio döngüsünde eşzamanlı yoklayan ya da akışını
+    dinleyen istemci. Her sunucu için keep-alive bağlantı havuzu, zaman aşımı ve üstel bekleme
+    ayrı tutulur; sonuçlar "<ad alanı>/<drone_id>" kimlikleriyle tek filo görünümünde birleşir.
+    aiohttp gerektirir.
+    """
+
+    def __init__(self, config: ClientConfig):
+        self.config = config
+        self.servers = {name: ServerState(name, url) for name, url in (config.servers or {}).items()}
+        self.latency = LatencyTracker(config.latency_window)
+        self._last_latency_log = time.monotonic()
+        self._running = False
+
+    def fleet_view(self) -> Dict[str, Dict]:
+        """Tüm sunucuların son verisi, ad alanlı drone kimlikleriyle"""
+        fleet = {}
+        for state in self.servers.values():
+            for drone_id, drone_data in state.data.items():
+                fleet[f"{state.name}/{drone_id}"] = drone_data
+        return fleet
+
+    def server_status(self) -> Dict[str, Dict]:
+        return {
+            name: {
+                "connected": state.connected,
+                "failures": state.failures,
+                "drones": len(state.data),
+                "last_ok": state.last_ok
+            }
+            for name, state in self.servers.items()
+        }
+
+    def _observe_latency(self, state: ServerState, data: Dict, received: float, published: Optional[float]):
+        self.latency.observe({f"{state.name}/{k}": v for k, v in data.items()}, received, published)
+        now = time.monotonic()
+        if now - self._last_latency_log >= self.config.latency_log_interval:
+            self._last_latency_log = now
+            self.latency.log_summary()
+
+    def _mark_ok(self, state: ServerState):
+        if not state.connected:
+            logger.info(f"{state.name} sunucusundan veri alınıyor")
+        state.connected = True
+        state.failures = 0
+        state.last_ok = time.time()
+
+    def _mark_failed(self, state: ServerState, reason: str):
+        state.failures += 1
+        if state.connected or state.failures == 1:
+            logger.error(f"{state.name} sunucusu: {reason}")
+        state.connected = False
+
+    async def poll_server(self, session, state: ServerState):
+        """Tek sunucuyu update_interval aralıkla ETag/since delta istekleriyle yokla"""
+        import aiohttp
+
+        timeout = aiohttp.ClientTimeout(total=self.config.request_timeout)
+        while self._running:
+            headers = {"Accept": PACKED_MIME if self.config.wire_format == "packed" else JSON_MIME}
+            params = {}
+            if state.version is not None:
+                if state.etag:
+                    headers["If-None-Match"] = state.etag
+                params["since"] = str(state.version)
+            try:
+                async with session.get(f"{state.base_url}/telemetry", headers=headers,
+                                       params=params, timeout=timeout) as response:
+                    received = time.time()
+                    published = response.headers.get("X-Publish-Time")
+                    published = float(published) if published is not None else None
+                    if response.status == 304:
+                        self._mark_ok(state)
+                        self._observe_latency(state, state.data, received, published)
+                    elif response.status == 200:
+                        if response.headers.get("Content-Type", "").startswith(PACKED_MIME):
+                            data, _ = decode_packed(await response.read())
+                        else:
+                            data = await response.json()
+                        version = response.headers.get("X-Telemetry-Version")
+                        version = int(version) if version is not None else None
+                        if params and (version is None or version < state.version):
+                            # Sunucu yeniden başlamış; delta güvenilmez, hemen tam veri iste
+                            logger.info(f"{state.name} sunucu sürümü geriye gitti, tam veri alınıyor")
+                            state.etag = state.version = None
+                            continue
+                        if params:
+                            state.data = {**state.data, **data}
+                            for drone_id in removed_from(response.headers):
+                                state.data.pop(drone_id, None)
+                        else:
+                            state.data = data
+                        state.etag = response.headers.get("ETag")
+                        state.version = version
+                        self._mark_ok(state)
+                        self._observe_latency(state, data, received, published)
+                    else:
+                        self._mark_failed(state, f"Hata kodu: {response.status}")
+            except asyncio.TimeoutError:
+                self._mark_failed(state, "İstek zaman aşımına uğradı")
+            except aiohttp.ClientError as e:
+                self._mark_failed(state, f"Bağlanılamadı: {str(e)}")
+            except (ValueError, struct.error) as e:
+                self._mark_failed(state, f"Yanıt çözülemedi: {str(e)}")
+
+            await asyncio.sleep(self.config.update_interval if state.failures == 0 else state.backoff(self.config))
+
+    async def stream_server(self, session, state: ServerState):
+        """Tek sunucunun /telemetry/stream akışını dinle; koparsa üstel bekleyip yeniden bağlan"""
+        import aiohttp
+
+        timeout = aiohttp.ClientTimeout(
+            total=None, connect=self.config.request_timeout, sock_read=self.config.stream_read_timeout
+        )
+        while self._running:
+            try:
+                async with session.get(f"{state.base_url}/telemetry/stream", timeout=timeout) as response:
+                    if response.status != 200:
+                        self._mark_failed(state, f"Akış açılamadı. Hata kodu: {response.status}")
+                    else:
+                        parser = SSEParser()
+                        async for raw in response.content:
+                            completed = parser.feed(raw.decode().rstrip("\r\n"))
+                            if completed is None:
+                                continue
+                            event, data, published = completed
+                            received = time.time()
+                            if event == "remove":
+                                for drone_id in data.get("drones", []):
+                                    state.data.pop(drone_id, None)
+                                continue
+                            if event == "snapshot":
+                                state.data = data
+                            else:
+                                state.data.update(data)
+                            self._mark_ok(state)
+                            self._observe_latency(state, data, received, published)
+                        self._mark_failed(state, "Akış sunucu tarafından kapatıldı")
+            except asyncio.TimeoutError:
+                self._mark_failed(state, "Telemetri akışı zaman aşımına uğradı")
+            except aiohttp.ClientError as e:
+                self._mark_failed(state, f"Bağlanılamadı: {str(e)}")
+            except json.JSONDecodeError:
+                self._mark_failed(state, "Sunucudan gelen veri JSON formatında değil")
+
+            if self._running:
+                await asyncio.sleep(state.backoff(self.config))
+
+    async def print_loop(self):
+        while self._running:
+            await asyncio.sleep(self.config.update_interval)
+            fleet = self.fleet_view()
+            if fleet:
+                print_fleet(fleet)
+
+    async def run_async(self, print_updates: bool = True):
+        import aiohttp
+
+        self._running = True
+        # limit_per_host her sunucuya ayrı bir havuz sınırı uygular
+        connector = aiohttp.TCPConnector(
+            limit=self.config.connections_per_server * max(1, len(self.servers)),
+            limit_per_host=self.config.connections_per_server
+        )
+        worker = self.stream_server if self.config.stream else self.poll_server
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tasks = [asyncio.create_task(worker(session, state)) for state in self.servers.values()]
+            if print_updates:
+                tasks.append(asyncio.create_task(self.print_loop()))
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                self._running = False
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def run(self):
+        logger.info(f"Filo istemcisi {len(self.servers)} sunucu için başlatılıyor...")
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            logger.info("Filo istemcisi kapatılıyor...")
+
+    def stop(self):
+        self._running = False
+
+class SharedTelemetryReader:
+    """
+    Sunucunun paylaşımlı bellek bloğunu (ServerConfig.shm_name) kopyalamadan eşler ve
+    kayıtları seqlock sayacıyla tutarlı okur. Aynı makinede HTTP/JSON olmadan yüksek
+    frekansta okuma içindir.
+    """
+
+    def __init__(self, name: str = DEFAULT_SHM_NAME, max_retries: int = 100):
+        self.shm = attach_readonly(name)
+        self.buf = self.shm.buf
+        self.max_retries = max_retries
+        magic, version, self.capacity, record_size, _ = HEADER.unpack_from(self.buf, 0)
+        if magic != SHM_MAGIC or version != SHM_LAYOUT_VERSION or record_size < RECORD.size:
+            self.close()
+            raise ValueError(f"{name} beklenen telemetri düzeninde değil")
+
+    def count(self) -> int:
+        """Kullanılan kayıt sayısı"""
+        return HEADER.unpack_from(self.buf, 0)[4]
+
+    def read_record(self, slot: int) -> Optional[Tuple]:
+        """Tek bir kaydın ham alanları; yazıcı sürekli meşgulse None"""
+        offset = record_offset(slot)
+        for _ in range(self.max_retries):
+            before = SEQ.unpack_from(self.buf, offset)[0]
+            if not before & 1:
+                fields = RECORD.unpack_from(self.buf, offset)
+                if SEQ.unpack_from(self.buf, offset)[0] == before:
+                    return fields
+            # Yazıcı kaydın ortasında; işlemciyi bırakıp tekrar dene
+            time.sleep(0)
+        return None
+
+    def read_all(self) -> Dict:
+        """Tüm filo, /telemetry ile aynı biçimde"""
+        data = {}
+        for slot in range(self.count()):
+            fields = self.read_record(slot)
+            if fields is None:
+                logger.warning(f"Paylaşımlı bellek kaydı {slot} tutarlı okunamadı")
+                continue
+            drone_id, drone_data, _ = unpack_record(fields)
+            if not drone_id:
+                # Kaldırılmış bir drone'dan boşalan kayıt
+                continue
+            data[drone_id] = drone_data
+        return data
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+
 def main():
     """
     Ana çalıştırma fonksiyonu.
     """
     config = ClientConfig()
-    client = TelemetryClient(config)
+    client = FleetClient(config) if config.servers else TelemetryClient(config)
     
     try:
         client.run()
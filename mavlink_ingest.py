@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import struct
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAVLINK_V1_STX = 0xFE
+MAVLINK_V2_STX = 0xFD
+MAVLINK_IFLAG_SIGNED = 0x01
+MAVLINK_SIGNATURE_LEN = 13
+
+MSG_HEARTBEAT = 0
+MSG_SYS_STATUS = 1
+MSG_LOCAL_POSITION_NED = 32
+MSG_GLOBAL_POSITION_INT = 33
+MSG_BATTERY_STATUS = 147
+
+# Yalnızca yayınladığımız mesajlar çözülür: msgid -> (payload yapısı, CRC_EXTRA)
+# Alanlar MAVLink kablo sırasındadır (büyük tipten küçüğe), uzantı alanları dahil değildir
+MESSAGES: Dict[int, Tuple[struct.Struct, int]] = {
+    # custom_mode, type, autopilot, base_mode, system_status, mavlink_version
+    MSG_HEARTBEAT: (struct.Struct('<IBBBBB'), 50),
+    # sensors_present, sensors_enabled, sensors_health, load, voltage_battery, current_battery,
+    # drop_rate_comm, errors_comm, errors_count1..4, battery_remaining
+    MSG_SYS_STATUS: (struct.Struct('<IIIHHhHHHHHHb'), 124),
+    # time_boot_ms, x, y, z, vx, vy, vz
+    MSG_LOCAL_POSITION_NED: (struct.Struct('<I6f'), 185),
+    # time_boot_ms, lat, lon, alt, relative_alt, vx, vy, vz, hdg
+    MSG_GLOBAL_POSITION_INT: (struct.Struct('<IiiiihhhH'), 104),
+    # current_consumed, energy_consumed, temperature, voltages[10], current_battery,
+    # id, battery_function, type, battery_remaining
+    MSG_BATTERY_STATUS: (struct.Struct('<iih10HhBBBb'), 154),
+}
+
+MAV_COMP_ID_AUTOPILOT1 = 1
+
+def x25_crc(data: bytes, crc: int = 0xFFFF) -> int:
+    """MAVLink'in kullandığı CRC-16/MCRF4XX"""
+    for byte in data:
+        tmp = byte ^ (crc & 0xFF)
+        tmp = (tmp ^ (tmp << 4)) & 0xFF
+        crc = ((crc >> 8) ^ (tmp << 8) ^ (tmp << 3) ^ (tmp >> 4)) & 0xFFFF
+    return crc
+
+def encode_message(msgid: int, fields: Tuple, sysid: int = 1, compid: int = MAV_COMP_ID_AUTOPILOT1,
+                   seq: int = 0, version: int = 2) -> bytes:
+    """Desteklenen bir mesajı MAVLink v1/v2 çerçevesine paketle (test ve sentetik kaynaklar için)"""
+    layout, crc_extra = MESSAGES[msgid]
+    payload = layout.pack(*fields)
+    if version == 1:
+        header = bytes([len(payload), seq & 0xFF, sysid, compid, msgid])
+        stx = MAVLINK_V1_STX
+    else:
+        # MAVLink 2 sondaki sıfır baytları kırpar (en az bir bayt kalır)
+        payload = payload.rstrip(b'\x00') or b'\x00'
+        header = bytes([len(payload), 0, 0, seq & 0xFF, sysid, compid]) + msgid.to_bytes(3, 'little')
+        stx = MAVLINK_V2_STX
+    crc = x25_crc(bytes([crc_extra]), x25_crc(header + payload))
+    return bytes([stx]) + header + payload + struct.pack('<H', crc)
+
+def parse_messages(data: bytes) -> List[Tuple[int, int, int, Tuple]]:
+    """
+    Bir datagram içindeki desteklenen mesajları çöz.
+
+    Returns:
+        List[Tuple]: (sysid, compid, msgid, alanlar) listesi; bozuk ve bilinmeyen çerçeveler atlanır
+    """
+    messages = []
+    i = 0
+    n = len(data)
+    while i < n:
+        stx = data[i]
+        if stx == MAVLINK_V1_STX:
+            header_len = 5
+        elif stx == MAVLINK_V2_STX:
+            header_len = 9
+        else:
+            i += 1
+            continue
+        if i + 1 + header_len > n:
+            break
+
+        length = data[i + 1]
+        header = data[i + 1:i + 1 + header_len]
+        if stx == MAVLINK_V1_STX:
+            sysid, compid, msgid = header[2], header[3], header[4]
+            signature_len = 0
+        else:
+            sysid, compid = header[4], header[5]
+            msgid = int.from_bytes(header[6:9], 'little')
+            signature_len = MAVLINK_SIGNATURE_LEN if header[1] & MAVLINK_IFLAG_SIGNED else 0
+
+        payload_start = i + 1 + header_len
+        frame_end = payload_start + length + 2 + signature_len
+        if frame_end > n:
+            break
+
+        spec = MESSAGES.get(msgid)
+        if spec is None:
+            i = frame_end
+            continue
+
+        layout, crc_extra = spec
+        payload = data[payload_start:payload_start + length]
+        crc = struct.unpack_from('<H', data, payload_start + length)[0]
+        if x25_crc(bytes([crc_extra]), x25_crc(header + payload)) != crc:
+            # Gerçek bir çerçeve değilmiş; bir bayt ilerleyip yeniden senkronize ol
+            i += 1
+            continue
+
+        if len(payload) < layout.size:
+            payload = payload + bytes(layout.size - len(payload))
+        messages.append((sysid, compid, msgid, layout.unpack_from(payload)))
+        i = frame_end
+    return messages
+
+class MavlinkIngestProtocol(asyncio.DatagramProtocol):
+    """Tek bir drone'un UDP portunu dinler ve çözülen örnekleri depo biçiminde iletir"""
+
+    def __init__(self, drone_id: str, on_sample: Callable[[str, str, object, Optional[float]], None],
+                 on_connect: Optional[Callable[[str], None]] = None,
+                 rate_limits: Optional[Dict[str, float]] = None):
+        self.drone_id = drone_id
+        self.on_sample = on_sample
+        self.on_connect = on_connect
+        self.connected = False
+        # Otopilotun açılış anının duvar saati tahmini: (alış zamanı - time_boot) değerlerinin en küçüğü
+        self._boot_epoch: Optional[float] = None
+        self._min_period = {key: 1.0 / hz for key, hz in (rate_limits or {}).items() if hz}
+        self._last_update: Dict[str, float] = {}
+        # Makine doygunken tüm anahtarlara uygulanan alt sınır periyodu (0: kapalı)
+        self.throttle_period = 0.0
+
+    def _source_time(self, time_boot_ms: int, received: float) -> float:
+        """time_boot_ms'i duvar saatine çevir; tahmin en az gecikmeli paketle düzeltilir"""
+        boot_epoch = received - time_boot_ms / 1000.0
+        if self._boot_epoch is None or boot_epoch < self._boot_epoch or boot_epoch - self._boot_epoch > 60.0:
+            # Daha erken tahmin ya da otopilot yeniden başlamış
+            self._boot_epoch = boot_epoch
+        return self._boot_epoch + time_boot_ms / 1000.0
+
+    def _emit(self, key: str, value, source_time: Optional[float] = None):
+        min_period = max(self._min_period.get(key, 0.0), self.throttle_period)
+        if min_period:
+            now = time.monotonic()
+            if now - self._last_update.get(key, 0.0) < min_period:
+                return
+            self._last_update[key] = now
+        self.on_sample(self.drone_id, key, value, source_time)
+
+    def datagram_received(self, data: bytes, addr):
+        received = time.time()
+        for sysid, compid, msgid, fields in parse_messages(data):
+            if compid != MAV_COMP_ID_AUTOPILOT1:
+                continue
+            if not self.connected:
+                self.connected = True
+                if self.on_connect is not None:
+                    self.on_connect(self.drone_id)
+
+            if msgid == MSG_GLOBAL_POSITION_INT:
+                self._emit("position", {
+                    "lat": fields[1] / 1e7,
+                    "lon": fields[2] / 1e7,
+                    "alt": fields[3] / 1000.0
+                }, self._source_time(fields[0], received))
+            elif msgid == MSG_LOCAL_POSITION_NED:
+                self._emit("velocity", {
+                    "north": fields[4],
+                    "east": fields[5],
+                    "down": fields[6]
+                }, self._source_time(fields[0], received))
+            elif msgid == MSG_SYS_STATUS:
+                if fields[12] >= 0:
+                    self._emit("battery", round(float(fields[12]), 1))
+            elif msgid == MSG_BATTERY_STATUS:
+                # Yalnızca ana batarya; -1 bilinmiyor demektir
+                if fields[14] == 0 and fields[17] >= 0:
+                    self._emit("battery", round(float(fields[17]), 1))
+
+    def error_received(self, exc):
+        logger.error(f"{self.drone_id} MAVLink UDP hatası: {str(exc)}")
+
+class MavlinkIngest:
+    """Her drone portu için bir asyncio UDP uç noktası açan, mavsdk_server gerektirmeyen toplayıcı"""
+
+    def __init__(self, host: str, on_sample: Callable[[str, str, object, Optional[float]], None],
+                 on_connect: Optional[Callable[[str], None]] = None,
+                 rate_limits: Optional[Dict[str, float]] = None):
+        self.host = host
+        self.on_sample = on_sample
+        self.on_connect = on_connect
+        self.rate_limits = rate_limits
+        self.throttle_period = 0.0
+        self.transports: Dict[str, asyncio.DatagramTransport] = {}
+
+    async def listen(self, drone_id: str, port: int):
+        """drone_id için udpin://host:port adresini dinlemeye başla"""
+        loop = asyncio.get_running_loop()
+        protocol = MavlinkIngestProtocol(drone_id, self.on_sample, self.on_connect, self.rate_limits)
+        protocol.throttle_period = self.throttle_period
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: protocol,
+            local_addr=(self.host, port)
+        )
+        self.transports[drone_id] = transport
+
+    def remove(self, drone_id: str):
+        """drone_id'nin portunu kapat; kapandıktan sonra gelen datagram'lar işlenmez"""
+        transport = self.transports.pop(drone_id, None)
+        if transport is not None:
+            transport.close()
+
+    def set_throttle(self, rate_hz: Optional[float]):
+        """Tüm drone'lara anahtar başına en fazla rate_hz örnek uygula; None sınırı kaldırır"""
+        self.throttle_period = 1.0 / rate_hz if rate_hz else 0.0
+        for transport in self.transports.values():
+            transport.get_protocol().throttle_period = self.throttle_period
+
+    def close(self):
+        for transport in self.transports.values():
+            transport.close()
+        self.transports.clear()
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import logging.handlers
+import os
+import queue
+import time
+from typing import Callable, Dict, Optional
+
+# PX4 konsol satırları "INFO  [modül] ...", Gazebo classic ise "[Msg] ...", "[Wrn] ...", "[Err] ..." ile başlar
+_LEVEL_PREFIXES = (
+    ("ERROR", logging.ERROR), ("PANIC", logging.CRITICAL), ("WARN", logging.WARNING),
+    ("INFO", logging.INFO), ("DEBUG", logging.DEBUG),
+    ("[Err]", logging.ERROR), ("[Wrn]", logging.WARNING), ("[Msg]", logging.INFO), ("[Dbg]", logging.DEBUG),
+)
+
+def line_level(line: str) -> int:
+    """Simülatör çıktı satırının log seviyesi; tanınmayan satırlar INFO sayılır"""
+    stripped = line.lstrip()
+    for prefix, level in _LEVEL_PREFIXES:
+        if stripped.startswith(prefix):
+            return level
+    return logging.INFO
+
+class RateLimiter:
+    """Saniyede rate, en fazla burst satıra izin veren jeton kovası"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last = time.monotonic()
+        self.suppressed = 0
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        self.suppressed += 1
+        return False
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Kuyruk doluysa kaydı bekletmeden düşürür; disk yavaşlasa da simülasyon çıktısı okunmaya devam eder"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Satır zaten biçimlenmiş metin; QueueHandler'ın kopyalama/biçimleme maliyetine gerek yok
+        return record
+
+class _RoutingHandler(logging.Handler):
+    """Kuyruk dinleyicisinin thread'inde kayıtları süreç adına göre kendi dönen dosyasına yazar"""
+
+    def __init__(self, handlers: Dict[str, logging.Handler]):
+        super().__init__()
+        self.handlers = handlers
+
+    def emit(self, record: logging.LogRecord):
+        handler = self.handlers.get(record.name)
+        if handler is not None:
+            handler.handle(record)
+
+class ProcessLogPump:
+    """
+    Simülatör süreçlerinin stdout'unu asyncio görevleriyle okuyup süreç başına dönen log
+    dosyalarına yazar. Dosya yazımı ayrı bir thread'de yapılır; forward_level ve üzerindeki
+    satırlar süreç başına forward_rate ile sınırlanarak ana logger'a da iletilir.
+    """
+
+    def __init__(self, log_dir: str = "logs", max_bytes: int = 10 * 1024 * 1024, backup_count: int = 3,
+                 file_level: int = logging.DEBUG, forward_level: int = logging.WARNING,
+                 forward_rate: float = 5.0, forward_burst: float = 20.0, queue_size: int = 10000,
+                 forward_logger: Optional[logging.Logger] = None):
+        self.log_dir = log_dir
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.file_level = file_level
+        self.forward_level = forward_level
+        self.forward_rate = forward_rate
+        self.forward_burst = forward_burst
+        self.forward_logger = forward_logger or logging.getLogger(__name__)
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._queue_handler = _DroppingQueueHandler(self._queue)
+        self._file_handlers: Dict[str, logging.Handler] = {}
+        self._listener = logging.handlers.QueueListener(self._queue, _RoutingHandler(self._file_handlers))
+        self._started = False
+
+    def start(self):
+        if not self._started:
+            os.makedirs(self.log_dir, exist_ok=True)
+            self._listener.start()
+            self._started = True
+
+    def stop(self):
+        """Kuyruktaki satırları yazıp dosyaları kapat"""
+        if not self._started:
+            return
+        self._listener.stop()
+        self._started = False
+        for handler in self._file_handlers.values():
+            handler.close()
+        if self._queue_handler.dropped:
+            self.forward_logger.warning(f"Disk yetişemediği için {self._queue_handler.dropped} log satırı düşürüldü")
+
+    def _process_logger(self, name: str) -> logging.Logger:
+        logger_name = f"sim.{name}"
+        if logger_name not in self._file_handlers:
+            handler = logging.handlers.RotatingFileHandler(
+                os.path.join(self.log_dir, f"{name}.log"),
+                maxBytes=self.max_bytes, backupCount=self.backup_count
+            )
+            handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+            self._file_handlers[logger_name] = handler
+        process_logger = logging.getLogger(logger_name)
+        process_logger.propagate = False
+        process_logger.setLevel(self.file_level)
+        if self._queue_handler not in process_logger.handlers:
+            process_logger.addHandler(self._queue_handler)
+        return process_logger
+
+    async def pump(self, name: str, stream: asyncio.StreamReader, on_line: Optional[Callable[[str], None]] = None):
+        """stream kapanana kadar satırları oku; on_line her satırla çağrılır (ör. hazır olma tespiti)"""
+        self.start()
+        process_logger = self._process_logger(name)
+        limiter = RateLimiter(self.forward_rate, self.forward_burst)
+        while True:
+            try:
+                line = await stream.readline()
+            except ValueError:
+                # StreamReader sınırını aşan satır atıldı; akış okunmaya devam eder
+                continue
+            if not line:
+                break
+            text = line.decode(errors="replace").rstrip()
+            if on_line is not None:
+                on_line(text)
+            level = line_level(text)
+            process_logger.log(level, text)
+            if level >= self.forward_level:
+                if limiter.allow():
+                    if limiter.suppressed:
+                        self.forward_logger.warning(f"{name}: {limiter.suppressed} satır hız sınırı nedeniyle iletilmedi")
+                        limiter.suppressed = 0
+                    self.forward_logger.log(level, f"{name}: {text}")
+        if limiter.suppressed:
+            self.forward_logger.warning(f"{name}: {limiter.suppressed} satır hız sınırı nedeniyle iletilmedi")
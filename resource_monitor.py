@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+class TrackedProcess:
+    """İzlenen bir süreç ve (kabuk altında başlatılanlar için) alt süreçleri"""
+
+    def __init__(self, name: str, kind: str, pid: int):
+        self.name = name
+        self.kind = kind
+        self.pid = pid
+        self.process = psutil.Process(pid)
+        # cpu_percent ilk çağrıda 0 döner; her süreç nesnesi örnekler arasında saklanır
+        self._procs: Dict[int, psutil.Process] = {pid: self.process}
+        self.process.cpu_percent(None)
+        for child in self.process.children(recursive=True):
+            child.cpu_percent(None)
+            self._procs[child.pid] = child
+
+    def sample(self) -> Optional[Dict]:
+        """Süreç ağacının toplam kaynak kullanımı; süreç kapanmışsa None"""
+        try:
+            if self.process.status() == psutil.STATUS_ZOMBIE:
+                return None
+            children = self.process.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return None
+
+        alive = {self.pid: self.process}
+        for child in children:
+            known = self._procs.get(child.pid)
+            if known is None:
+                child.cpu_percent(None)
+                known = child
+            alive[child.pid] = known
+        self._procs = alive
+
+        cpu = rss = threads = read_bytes = write_bytes = 0
+        for proc in alive.values():
+            try:
+                with proc.oneshot():
+                    cpu += proc.cpu_percent(None)
+                    rss += proc.memory_info().rss
+                    threads += proc.num_threads()
+                    try:
+                        io = proc.io_counters()
+                        read_bytes += io.read_bytes
+                        write_bytes += io.write_bytes
+                    except (psutil.AccessDenied, AttributeError):
+                        # io_counters her platformda yok
+                        pass
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                continue
+            except psutil.AccessDenied:
+                continue
+        return {
+            "kind": self.kind,
+            "pid": self.pid,
+            "processes": len(alive),
+            "cpu_percent": round(cpu, 1),
+            "rss_bytes": rss,
+            "threads": threads,
+            "read_bytes": read_bytes,
+            "write_bytes": write_bytes
+        }
+
+class ResourceMonitor:
+    """
+    Simülasyon yığınının süreçlerini (Gazebo, PX4, mavsdk_server, shard işçileri) ve makinenin
+    genel yükünü psutil ile örnekler. Son örnek snapshot() ile API'ye verilir, log_interval'da
+    bir özet loglanır; host_saturated kısma/başlatma politikaları için kullanılır.
+    """
+
+    def __init__(self, interval: float = 2.0, log_interval: float = 30.0, window: int = 3):
+        self.interval = interval
+        self.log_interval = log_interval
+        self.tracked: Dict[str, TrackedProcess] = {}
+        self.last: Dict = {"host": {}, "processes": {}, "sampled_at": None}
+        self._host_cpu: Deque[float] = deque(maxlen=window)
+        self._host_memory: Deque[float] = deque(maxlen=window)
+        self._running = False
+        psutil.cpu_percent(None)
+
+    def track(self, name: str, pid: int, kind: str):
+        try:
+            self.tracked[name] = TrackedProcess(name, kind, pid)
+        except psutil.NoSuchProcess:
+            pass
+
+    def untrack(self, name: str):
+        self.tracked.pop(name, None)
+
+    def sample(self) -> Dict:
+        processes = {}
+        for name, tracked in list(self.tracked.items()):
+            result = tracked.sample()
+            if result is None:
+                self.untrack(name)
+            else:
+                processes[name] = result
+
+        memory = psutil.virtual_memory()
+        host = {
+            "cpu_percent": psutil.cpu_percent(None),
+            "cpu_count": psutil.cpu_count(),
+            "memory_percent": memory.percent,
+            "memory_available_bytes": memory.available,
+            "load_average": list(psutil.getloadavg()) if hasattr(psutil, "getloadavg") else None
+        }
+        self._host_cpu.append(host["cpu_percent"])
+        self._host_memory.append(host["memory_percent"])
+        self.last = {"host": host, "processes": processes, "sampled_at": time.time()}
+        return self.last
+
+    def snapshot(self) -> Dict:
+        """Son örnek; süreç türüne göre toplamlarla birlikte"""
+        totals: Dict[str, Dict] = {}
+        for sample in self.last["processes"].values():
+            total = totals.setdefault(sample["kind"], {"count": 0, "cpu_percent": 0.0, "rss_bytes": 0, "threads": 0})
+            total["count"] += 1
+            total["cpu_percent"] = round(total["cpu_percent"] + sample["cpu_percent"], 1)
+            total["rss_bytes"] += sample["rss_bytes"]
+            total["threads"] += sample["threads"]
+        return {**self.last, "totals": totals}
+
+    def host_saturated(self, cpu_percent: Optional[float] = None, memory_percent: Optional[float] = None) -> bool:
+        """Son pencere ortalaması eşiklerden birini aşıyor mu; henüz örnek yoksa False"""
+        if cpu_percent is not None and self._host_cpu:
+            if sum(self._host_cpu) / len(self._host_cpu) >= cpu_percent:
+                return True
+        if memory_percent is not None and self._host_memory:
+            if sum(self._host_memory) / len(self._host_memory) >= memory_percent:
+                return True
+        return False
+
+    def log_summary(self):
+        snapshot = self.snapshot()
+        host = snapshot["host"]
+        parts: List[str] = [
+            f"{kind}: {t['count']} süreç, %{t['cpu_percent']} CPU, {t['rss_bytes'] / 2**20:.0f} MiB"
+            for kind, t in sorted(snapshot["totals"].items())
+        ]
+        logger.info(
+            f"Kaynaklar: makine %{host.get('cpu_percent')} CPU, %{host.get('memory_percent')} bellek"
+            + ("; " + "; ".join(parts) if parts else "")
+        )
+
+    async def run(self):
+        """interval'da bir örnekle; örnekleme döngüyü bloklamasın diye executor'da yapılır"""
+        if self._running:
+            return
+        self._running = True
+        loop = asyncio.get_running_loop()
+        next_log = time.monotonic() + self.log_interval
+        try:
+            while True:
+                await loop.run_in_executor(None, self.sample)
+                if self.log_interval and time.monotonic() >= next_log:
+                    next_log = time.monotonic() + self.log_interval
+                    self.log_summary()
+                await asyncio.sleep(self.interval)
+        finally:
+            self._running = False
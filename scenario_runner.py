@@ -0,0 +1,204 @@
+"""
+Aynı makinede birbirinden bağımsız birden çok simülasyon yığını (SimulationManager + telemetri
+sunucusu) çalıştırır. Her yığın ayrı bir süreçtir ve kendi MAVLink / gRPC / HTTP port aralığını,
+Gazebo master portunu ve log dizinini kullanır; temizlik yalnızca o yığının süreçlerine dokunur.
+
+Örnek:
+    python scenario_runner.py --stacks 4 --drones 5 --duration 600
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import List, Optional, Tuple
+
+from gazebo_simulation import SimulationConfig, SimulationManager
+import server6
+from server6 import ServerConfig
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ScenarioConfig:
+    num_stacks: int = 2
+    drones_per_stack: int = 5
+    # Yığın i'nin PX4 örnek numaraları, MAVLink ve gRPC portları i * port_stride kaydırılır
+    port_stride: int = 100
+    log_root: str = "scenario_logs"
+    # Yığınların kapanması için beklenecek en uzun süre; sonra SIGKILL
+    stop_timeout: float = 20.0
+    # Yığınlar için şablonlar; yığın i'nin HTTP ve Gazebo master portu şablondaki değere i eklenerek bulunur
+    simulation: SimulationConfig = field(default_factory=SimulationConfig)
+    server: ServerConfig = field(default_factory=ServerConfig)
+
+def stack_configs(config: ScenarioConfig, index: int) -> Tuple[SimulationConfig, ServerConfig]:
+    """Yığın index için çakışmayan portlarla simülasyon ve sunucu yapılandırması"""
+    if config.drones_per_stack > config.port_stride:
+        raise ValueError(
+            f"drones_per_stack ({config.drones_per_stack}) port_stride'dan ({config.port_stride}) büyük olamaz"
+        )
+    offset = index * config.port_stride
+    simulation = replace(
+        config.simulation,
+        num_drones=config.drones_per_stack,
+        positions=None,
+        instance_offset=offset,
+        gazebo_master_port=config.simulation.gazebo_master_port + index,
+        gz_partition=f"stack_{index}",
+        log_dir=f"{config.log_root}/stack_{index}",
+        kill_existing_gazebo=False,
+        install_signal_handlers=False
+    )
+    server = replace(
+        config.server,
+        num_drones=config.drones_per_stack,
+        base_port=config.simulation.base_port + offset,
+        server_base_port=config.server.server_base_port + offset,
+        port=config.server.port + index,
+        shm_name=f"{config.server.shm_name}_{index}" if config.server.shm_name else None,
+        record_path=f"{config.log_root}/stack_{index}/flight.rec" if config.server.record_path else None
+    )
+    return simulation, server
+
+def _run_stack(index: int, simulation_config: SimulationConfig, server_config: ServerConfig):
+    """Yığın sürecinin giriş noktası: simülasyonu başlat, drone'lar hazır olunca toplayıcıyı çalıştır"""
+    formatter = logging.Formatter(f'%(asctime)s - stack_{index} - %(levelname)s - %(message)s')
+    # Modüllerin basicConfig'i çalışma dizinindeki ortak log dosyalarını açar; her yığın kendi log_dir'ine yazar
+    os.makedirs(simulation_config.log_dir, exist_ok=True)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.FileHandler):
+            root.removeHandler(handler)
+            handler.close()
+            root.addHandler(logging.FileHandler(
+                os.path.join(simulation_config.log_dir, os.path.basename(handler.baseFilename))
+            ))
+    for handler in root.handlers:
+        handler.setFormatter(formatter)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        stop_event = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop_event.set)
+
+        manager = SimulationManager(simulation_config)
+        ready_future = loop.create_future()
+        simulation = asyncio.create_task(manager.run(
+            on_ready=lambda ready: ready_future.done() or ready_future.set_result(ready)
+        ))
+        stop = asyncio.create_task(stop_event.wait())
+        collector = None
+        try:
+            done, _ = await asyncio.wait({ready_future, simulation, stop}, return_when=asyncio.FIRST_COMPLETED)
+            if ready_future not in done:
+                return
+
+            config = replace(server_config, drone_ids=ready_future.result())
+            # /resources Gazebo ve PX4 süreçlerini de göstersin; mavsdk_server'lar aynı izleyiciye eklenir
+            server6.resource_monitor = manager.resource_monitor
+            server6.configure_store(config)
+            threading.Thread(target=server6.run_flask, args=(config,), daemon=True).start()
+            collector = server6.create_collector(config)
+            telemetry = asyncio.create_task(collector.start_telemetry())
+            await asyncio.wait({simulation, telemetry, stop}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop.cancel()
+            if collector is not None:
+                await collector.stop()
+            # SimulationManager.run'ın finally bloğu bu yığının süreç ağaçlarını kapatır
+            simulation.cancel()
+            await asyncio.gather(simulation, return_exceptions=True)
+            if server6.shm_writer is not None:
+                server6.shm_writer.close()
+            if server6.flight_recorder is not None:
+                server6.flight_recorder.close()
+
+    asyncio.run(run())
+
+class ScenarioRunner:
+    """Yığın süreçlerini başlatır, izler ve kapatır"""
+
+    def __init__(self, config: ScenarioConfig):
+        self.config = config
+        self.processes: List[multiprocessing.Process] = []
+
+    def start(self):
+        ctx = multiprocessing.get_context("spawn")
+        for index in range(self.config.num_stacks):
+            simulation, server = stack_configs(self.config, index)
+            process = ctx.Process(target=_run_stack, args=(index, simulation, server), name=f"stack_{index}")
+            process.start()
+            self.processes.append(process)
+            logger.info(
+                f"stack_{index} başlatıldı (pid {process.pid}): HTTP {server.port}, "
+                f"MAVLink {server.base_port}-{server.base_port + self.config.drones_per_stack - 1}, "
+                f"Gazebo master {simulation.gazebo_master_port}"
+            )
+
+    def wait(self, duration: Optional[float] = None):
+        """duration dolana ya da tüm yığınlar kapanana kadar bekle"""
+        deadline = time.monotonic() + duration if duration else None
+        while any(p.is_alive() for p in self.processes):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(0.5)
+
+    def stop(self):
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + self.config.stop_timeout
+        for process in self.processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"{process.name} zamanında kapanmadı, öldürülüyor")
+                process.kill()
+                process.join()
+            logger.info(f"{process.name} kapandı (çıkış kodu {process.exitcode})")
+
+    def run(self, duration: Optional[float] = None):
+        self.start()
+        try:
+            self.wait(duration)
+        except KeyboardInterrupt:
+            logger.info("Senaryo kapatılıyor...")
+        finally:
+            self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Aynı makinede bağımsız simülasyon yığınları çalıştır")
+    parser.add_argument("--stacks", type=int, default=2)
+    parser.add_argument("--drones", type=int, default=5)
+    parser.add_argument("--duration", type=float, default=None, help="saniye; verilmezse Ctrl-C'ye kadar")
+    parser.add_argument("--port-stride", type=int, default=100)
+    parser.add_argument("--px4-path", default=SimulationConfig.px4_path)
+    parser.add_argument("--px4-root", default=SimulationConfig.px4_root)
+    parser.add_argument("--gazebo-path", default=SimulationConfig.gazebo_path)
+    parser.add_argument("--world-path", default=SimulationConfig.world_path)
+    parser.add_argument("--backend", default=ServerConfig.ingest_backend, choices=["mavsdk", "mavlink"])
+    parser.add_argument("--log-root", default="scenario_logs")
+    args = parser.parse_args()
+
+    config = ScenarioConfig(
+        num_stacks=args.stacks,
+        drones_per_stack=args.drones,
+        port_stride=args.port_stride,
+        log_root=args.log_root,
+        simulation=SimulationConfig(
+            px4_path=args.px4_path,
+            px4_root=args.px4_root,
+            gazebo_path=args.gazebo_path,
+            world_path=args.world_path
+        ),
+        server=ServerConfig(ingest_backend=args.backend)
+    )
+    ScenarioRunner(config).run(args.duration)
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,29 @@
 import asyncio
+import atexit
+import json
+import math
 import threading
 import logging
+import multiprocessing
+import queue
 import os
 import subprocess
 import signal
 import time
-from dataclasses import dataclass
-from typing import Dict, List, Optional
-from flask import Flask, jsonify
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+from flask import Flask, Response, g, jsonify, request
 from mavsdk import System
+from flight_recorder import FlightRecorder, FlightReplayer
+from mavlink_ingest import MavlinkIngest
+from resource_monitor import ResourceMonitor
+from spatial_index import SpatialIndex
+from synthetic_fleet import SyntheticFleet, SyntheticSystem
+from telemetry_codec import JSON_MIME, PACKED_MIME, encode_packed, wants_packed
+from telemetry_history import TelemetryHistory
+from telemetry_metrics import PROMETHEUS_MIME, TelemetryMetrics, route_label
+from telemetry_shm import SharedTelemetryWriter
+from telemetry_stream import AsyncStreamSubscriber, TelemetryBroadcaster, format_pending, format_sse
 
 # Logging yapılandırması
 logging.basicConfig(
@@ -31,7 +46,67 @@ class ServerConfig:
     telemetry_interval: float = 2.0
     mavsdk_server_path: str = "/home/baris/.local/lib/python3.10/site-packages/mavsdk/bin/mavsdk_server"
     connection_timeout: float = 10.0
-    server_startup_delay: float = 5.0
+    # mavsdk_server'ın gRPC portunu açması için beklenecek en uzun süre
+    server_ready_timeout: float = 30.0
+    # Aynı anda bağlantısı kurulan en fazla drone sayısı
+    connect_concurrency: int = 8
+    # Kalıcı akış modu: her drone için stream başına tek uzun ömürlü abonelik
+    persistent_streams: bool = False
+    # Stream başına hız sınırı (Hz); None ise otopilotun gönderdiği hızda
+    position_rate_hz: Optional[float] = None
+    velocity_rate_hz: Optional[float] = None
+    battery_rate_hz: Optional[float] = None
+    # Drone başına tutulacak geçmiş satırı sayısı (0: geçmiş kapalı)
+    history_size: int = 3600
+    # Telemetri kaynağı: "mavsdk" (drone başına mavsdk_server),
+    # "mavlink" (base_port + i UDP portlarını doğrudan dinleyip MAVLink çözen asyncio toplayıcı) ya da
+    # "synthetic" (PX4/Gazebo olmadan System yerine sentetik filo)
+    ingest_backend: str = "mavsdk"
+    mavlink_listen_host: str = "127.0.0.1"
+    # Sentetik filonun adım hızı ve rastgelelik tohumu
+    synthetic_rate_hz: float = 10.0
+    synthetic_seed: int = 0
+    # Aynı makinedeki okuyucular için paylaşımlı bellek anlık görüntüsü (None: kapalı)
+    shm_name: Optional[str] = None
+    shm_capacity: int = 1024
+    # Depoya giren her örneği bu dosyaya kaydet (None: kapalı)
+    record_path: Optional[str] = None
+    # Canlı toplama yerine bu kaydı oynat; hız 1.0 gerçek zaman, N kat, 0 en yüksek hız
+    replay_path: Optional[str] = None
+    replay_speed: float = 1.0
+    replay_start: float = 0.0
+    replay_loop: bool = False
+    # Bu sunucunun topladığı drone indeksleri (None: 0..num_drones-1)
+    drone_ids: Optional[List[int]] = None
+    # Birden fazla ise drone'lar bu kadar işçi sürecine bölünür, sonuçlar tek depoda birleşir
+    num_shards: int = 1
+    shard_flush_interval: float = 0.05
+    shard_stats_interval: float = 1.0
+    # HTTP API'yi Flask thread'i yerine telemetri ile aynı asyncio döngüsünde (aiohttp) çalıştır
+    async_http: bool = False
+    http_keepalive_timeout: float = 75.0
+    # Kapanışta süren isteklerin bitmesi için beklenecek en uzun süre; akışlar on_shutdown'da kapatılır
+    http_shutdown_timeout: float = 5.0
+    # mavsdk_server / shard süreçlerinin ve makinenin kaynak örnekleme aralığı (0: kapalı)
+    resource_interval: float = 2.0
+    resource_log_interval: float = 30.0
+    # Makine CPU'su bu yüzdeyi aşınca telemetri hızı throttle_rate_hz'e düşürülür (None: kapalı);
+    # yük eşiğin throttle_release_margin altına inince eski hıza dönülür
+    throttle_cpu_percent: Optional[float] = None
+    throttle_rate_hz: float = 2.0
+    throttle_release_margin: float = 10.0
+    # Kalıcı akış olmayan (yoklama) modda kısma sırasında telemetry_interval bu katsayıyla büyütülür;
+    # varsayılan 2 sn aralık zaten 1 / throttle_rate_hz'ten uzun olduğu için tek başına Hz sınırı etkisizdir
+    throttle_poll_factor: float = 4.0
+    # Drone'lar çalışırken /drones API'siyle eklenip çıkarılabilir; hiç drone bağlanmasa da toplayıcı açık kalır
+    hot_plug: bool = False
+    # /telemetry/nearby ve /telemetry/conflicts için ızgara hücre boyutu (metre, 0: kapalı);
+    # izdüşüm başlangıcı (lat, lon) verilmezse ilk gelen konumdur
+    spatial_cell_size: float = 100.0
+    spatial_origin: Optional[Tuple[float, float]] = None
+    # Yatayda bu mesafeden (metre) yakın çiftler her konum güncellemesinde tutulur; /telemetry/conflicts
+    # bu eşiğe kadar filoyu taramadan yanıtlanır (0: her sorguda tam tarama)
+    spatial_separation: float = 10.0
 
 # Flask uygulaması
 app = Flask(__name__)
@@ -39,163 +114,1333 @@ app = Flask(__name__)
 # Telemetri verilerini saklamak için global sözlük
 telemetry_data: Dict[str, Dict] = {}
 
+# Depo sürümü her güncellemede artar; drone_versions her drone'un son değiştiği sürümü tutar
+telemetry_version: int = 0
+drone_versions: Dict[str, int] = {}
+
+# Kaldırılan drone'lar ve kaldırıldıkları sürüm; since'li istemciler silinmeyi buradan öğrenir
+removed_drones: Dict[str, int] = {}
+
+# Drone başına sabit boyutlu telemetri geçmişi (configure_store ile kurulur)
+telemetry_history: Optional[TelemetryHistory] = None
+
+# Filo durumunu paylaşımlı belleğe yansıtan yazıcı (configure_store ile kurulur)
+shm_writer: Optional[SharedTelemetryWriter] = None
+
+# Her örneği diske ekleyen uçuş kaydedici (configure_store ile kurulur)
+flight_recorder: Optional[FlightRecorder] = None
+
+# Drone güncellemelerini /telemetry/stream abonelerine iten yayıncı
+broadcaster = TelemetryBroadcaster()
+
+# Sıcak yol ölçümleri (/metrics)
+metrics = TelemetryMetrics()
+
+# Parça (shard) işçi süreçlerinin sağlık ve verim bilgileri
+shard_status: Dict[int, Dict] = {}
+
+# Konum güncellemeleriyle artımlı güncellenen yakınlık indeksi (configure_store ile kurulur)
+spatial_index: Optional[SpatialIndex] = None
+
+# Alt süreçlerin ve makinenin kaynak kullanımı (configure_store ile kurulur, /resources)
+resource_monitor: Optional[ResourceMonitor] = None
+
+# Makine doygunken uygulanan telemetri hız sınırı (Hz); None ise kısma yok
+telemetry_throttle_hz: Optional[float] = None
+
+# /drones API'sinin çağırdığı, çalışırken drone ekleyip çıkaran denetleyici (TelemetryServer ya da
+# SimulationDaemon); add_drone / remove_drone / list_drones ile kendi döngüsünü (loop) sunar
+drone_controller = None
+
+# İşçi süreçte depoya yazılan her örneği ana sürece ileten yayıncı
+shard_publisher: Optional["ShardPublisher"] = None
+
+# Akışta güncelleme yokken bağlantıyı canlı tutmak için yorum satırı aralığı (saniye)
+STREAM_KEEPALIVE = 15.0
+
+def select_telemetry(since: Optional[int] = None) -> Dict[str, Dict]:
+    """
+    Tüm depo ya da since sürümünden sonra değişen drone'lar. Flask başka bir thread'den okurken
+    unregister_drone kayıt silebilir; bu yüzden sözlüğün kendisi değil anlık kopyası döner.
+    """
+    if since is None:
+        return dict(telemetry_data)
+    changed = {}
+    for drone_id, drone_version in list(drone_versions.items()):
+        if drone_version > since:
+            entry = telemetry_data.get(drone_id)
+            if entry is not None:
+                changed[drone_id] = entry
+    return changed
+
+def select_removed(since: Optional[int]) -> List[str]:
+    """since sürümünden sonra kaldırılan drone'lar"""
+    if since is None:
+        return []
+    return [drone_id for drone_id, version in list(removed_drones.items()) if version > since]
+
+def query_history(drone: Optional[str], since: Optional[float], until: Optional[float],
+                  step: Optional[float]) -> Tuple[Dict, int]:
+    """/telemetry/history yanıt gövdesi ve HTTP durum kodu"""
+    if telemetry_history is None:
+        return {"error": "Telemetri geçmişi kapalı"}, 404
+
+    drone_ids = [drone] if drone else telemetry_history.drone_ids()
+    result = {}
+    for drone_id in drone_ids:
+        history = telemetry_history.query(drone_id, since, until, step)
+        if history is not None:
+            result[drone_id] = history
+    if drone and not result:
+        return {"error": f"{drone} için geçmiş bulunamadı"}, 404
+    return result, 200
+
+def query_resources() -> Tuple[Dict, int]:
+    """/resources yanıt gövdesi ve HTTP durum kodu"""
+    if resource_monitor is None:
+        return {"error": "Kaynak izleme kapalı"}, 404
+    return {**resource_monitor.snapshot(), "throttle_hz": telemetry_throttle_hz}, 200
+
+def query_nearby(lat: Optional[float], lon: Optional[float], alt: Optional[float], radius: Optional[float],
+                 drone: Optional[str], limit: Optional[int]) -> Tuple[Dict, int]:
+    """/telemetry/nearby yanıt gövdesi ve HTTP durum kodu; merkez lat/lon ya da bir drone olabilir"""
+    if spatial_index is None:
+        return {"error": "Yakınlık indeksi kapalı"}, 404
+    if radius is None or radius <= 0:
+        return {"error": "Pozitif bir radius (metre) gerekli"}, 400
+    if drone is not None:
+        position = (telemetry_data.get(drone) or {}).get("position")
+        if not position:
+            return {"error": f"{drone} için konum bulunamadı"}, 404
+        lat, lon = position["lat"], position["lon"]
+        if alt is None:
+            alt = position["alt"]
+    elif lat is None or lon is None:
+        return {"error": "lat ve lon ya da drone gerekli"}, 400
+    if not (math.isfinite(lat) and math.isfinite(lon)):
+        # GPS fix'i olmayan drone NaN konum bildirir
+        return {"error": "Geçerli bir konum yok"}, 404 if drone is not None else 400
+
+    started = time.perf_counter()
+    result = spatial_index.nearby(lat, lon, radius, alt, exclude=drone, limit=limit)
+    metrics.observe_spatial("nearby", time.perf_counter() - started)
+    return {
+        "center": {"lat": lat, "lon": lon, "alt": alt},
+        "radius": radius,
+        "drones": [{"drone_id": drone_id, "distance": round(distance, 2)} for drone_id, distance in result]
+    }, 200
+
+def query_conflicts(horizontal: Optional[float], vertical: Optional[float]) -> Tuple[Dict, int]:
+    """/telemetry/conflicts: yatayda horizontal, dikeyde vertical metreden yakın drone çiftleri"""
+    if spatial_index is None:
+        return {"error": "Yakınlık indeksi kapalı"}, 404
+    if horizontal is None or horizontal <= 0:
+        return {"error": "Pozitif bir horizontal (metre) gerekli"}, 400
+    started = time.perf_counter()
+    pairs = spatial_index.conflicts(horizontal, vertical)
+    metrics.observe_spatial("conflicts", time.perf_counter() - started)
+    return {"horizontal": horizontal, "vertical": vertical, "pairs": pairs}, 200
+
+async def manage_drones(action: str, options: Optional[Dict] = None,
+                        drone_id: Optional[str] = None) -> Tuple[Dict, int]:
+    """/drones isteğini denetleyicinin döngüsünde yürüt; yanıt gövdesi ve HTTP durum kodu"""
+    if drone_controller is None:
+        return {"error": "Çalışırken drone ekleme/çıkarma kapalı (hot_plug)"}, 404
+    try:
+        if action == "list":
+            return drone_controller.list_drones(), 200
+        if action == "add":
+            if not isinstance(options, dict):
+                return {"error": "İstek gövdesi bir JSON nesnesi olmalı"}, 400
+            return await drone_controller.add_drone(options.get("index"), options), 201
+        if await drone_controller.remove_drone(drone_id):
+            return {"removed": drone_id}, 200
+        return {"error": f"{drone_id} bulunamadı"}, 404
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    except RuntimeError as e:
+        # Başlatma / bağlantı başarısız ya da makine doygun
+        return {"error": str(e)}, 503
+
+def _call_controller(coro) -> Tuple[Dict, int]:
+    """manage_drones'u Flask thread'inden denetleyicinin asyncio döngüsüne gönderip sonucunu bekle"""
+    if drone_controller is None:
+        return asyncio.run(coro)
+    return asyncio.run_coroutine_threadsafe(coro, drone_controller.loop).result()
+
+def serialize_telemetry(data: Dict[str, Dict], version: int, accept: str) -> Tuple[bytes, str]:
+    """Yanıt gövdesini Accept'e göre kodla ve süresini ölç"""
+    started = time.perf_counter()
+    if wants_packed(accept):
+        body, mimetype, fmt = encode_packed(data, version), PACKED_MIME, "packed"
+    else:
+        body, mimetype, fmt = json.dumps(data, separators=(",", ":")).encode(), JSON_MIME, "json"
+    metrics.observe_serialize(fmt, time.perf_counter() - started)
+    return body, mimetype
+
+def render_metrics() -> str:
+    return metrics.render({
+        "telemetry_store_drones": len(telemetry_data),
+        "telemetry_store_version": telemetry_version,
+        "telemetry_history_bytes": (
+            telemetry_history.bytes_per_drone() * len(telemetry_history.drone_ids())
+            if telemetry_history is not None else 0
+        ),
+        "telemetry_stream_subscribers": len(broadcaster),
+    })
+
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def _observe_request(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        rule = request.url_rule.rule if request.url_rule is not None else None
+        metrics.observe_request(route_label(rule), request.method, response.status_code,
+                                time.perf_counter() - started)
+    return response
+
 # Flask API endpoint'i
 @app.route('/telemetry', methods=['GET'])
 def get_telemetry():
-    return jsonify(telemetry_data)
+    # Sürüm veriden önce okunur; arada gelen güncelleme bir sonraki istekte tekrar gönderilir
+    version = telemetry_version
+    if request.if_none_match.contains(str(version)):
+        response = Response(status=304)
+    else:
+        data = select_telemetry(request.args.get('since', type=int))
+        body, mimetype = serialize_telemetry(data, version, request.headers.get('Accept', ''))
+        response = Response(body, mimetype=mimetype)
+        removed = select_removed(request.args.get('since', type=int))
+        if removed:
+            response.headers['X-Removed-Drones'] = ",".join(removed)
+    response.set_etag(str(version))
+    response.headers['X-Telemetry-Version'] = str(version)
+    response.headers['X-Publish-Time'] = repr(time.time())
+    response.headers['Vary'] = 'Accept'
+    return response
+
+@app.route('/telemetry/history', methods=['GET'])
+def get_telemetry_history():
+    body, status = query_history(
+        request.args.get('drone'),
+        request.args.get('since', type=float),
+        request.args.get('until', type=float),
+        request.args.get('step', type=float)
+    )
+    return jsonify(body), status
+
+@app.route('/telemetry/stream', methods=['GET'])
+def stream_telemetry():
+    # Snapshot'tan önce abone ol ki aradaki güncellemeler kaçmasın
+    subscriber = broadcaster.subscribe()
+
+    def events():
+        try:
+            yield format_sse("snapshot", dict(telemetry_data), time.time())
+            while True:
+                pending = subscriber.pop(STREAM_KEEPALIVE)
+                if pending is None:
+                    # broadcaster.close(): sunucu kapanıyor
+                    break
+                if pending:
+                    yield format_pending(pending, time.time())
+                else:
+                    yield ": keepalive\n\n"
+        finally:
+            broadcaster.unsubscribe(subscriber)
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/telemetry/nearby', methods=['GET'])
+def get_telemetry_nearby():
+    body, status = query_nearby(
+        request.args.get('lat', type=float),
+        request.args.get('lon', type=float),
+        request.args.get('alt', type=float),
+        request.args.get('radius', type=float),
+        request.args.get('drone'),
+        request.args.get('limit', type=int)
+    )
+    return jsonify(body), status
+
+@app.route('/telemetry/conflicts', methods=['GET'])
+def get_telemetry_conflicts():
+    body, status = query_conflicts(
+        request.args.get('horizontal', type=float),
+        request.args.get('vertical', type=float)
+    )
+    return jsonify(body), status
+
+@app.route('/shards', methods=['GET'])
+def get_shards():
+    return jsonify(shard_status)
+
+@app.route('/resources', methods=['GET'])
+def get_resources():
+    body, status = query_resources()
+    return jsonify(body), status
+
+@app.route('/drones', methods=['GET'])
+def list_drones():
+    body, status = _call_controller(manage_drones("list"))
+    return jsonify(body), status
+
+@app.route('/drones', methods=['POST'])
+def add_drone():
+    # Gövde yoksa varsayılanlarla ekle; bozuk JSON ya da nesne olmayan gövde manage_drones'ta 400 döner
+    options = request.get_json(force=True, silent=True) if request.get_data() else {}
+    body, status = _call_controller(manage_drones("add", options=options))
+    return jsonify(body), status
+
+@app.route('/drones/<drone_id>', methods=['DELETE'])
+def remove_drone(drone_id):
+    body, status = _call_controller(manage_drones("remove", drone_id=drone_id))
+    return jsonify(body), status
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    return Response(render_metrics(), content_type=PROMETHEUS_MIME)
+
+def _query_arg(request, name: str, cast):
+    """aiohttp sorgu parametresini Flask'taki type= gibi dönüştür; hatalıysa None"""
+    value = request.query.get(name)
+    if value is None:
+        return None
+    try:
+        return cast(value)
+    except ValueError:
+        return None
+
+def create_async_app():
+    """Flask endpoint'lerinin aiohttp karşılıkları; telemetri ile aynı döngüde çalışır"""
+    from aiohttp import web
+
+    async def get_telemetry_async(request):
+        version = telemetry_version
+        headers = {
+            'ETag': f'"{version}"',
+            'X-Telemetry-Version': str(version),
+            'X-Publish-Time': repr(time.time()),
+            'Vary': 'Accept'
+        }
+        if any(etag.value in (str(version), '*') for etag in request.if_none_match or ()):
+            return web.Response(status=304, headers=headers)
+        since = _query_arg(request, 'since', int)
+        data = select_telemetry(since)
+        body, mimetype = serialize_telemetry(data, version, request.headers.get('Accept', ''))
+        removed = select_removed(since)
+        if removed:
+            headers['X-Removed-Drones'] = ",".join(removed)
+        return web.Response(body=body, content_type=mimetype, headers=headers)
+
+    async def get_telemetry_history_async(request):
+        body, status = query_history(
+            request.query.get('drone'),
+            _query_arg(request, 'since', float),
+            _query_arg(request, 'until', float),
+            _query_arg(request, 'step', float)
+        )
+        return web.json_response(body, status=status)
+
+    async def get_telemetry_nearby_async(request):
+        body, status = query_nearby(
+            _query_arg(request, 'lat', float),
+            _query_arg(request, 'lon', float),
+            _query_arg(request, 'alt', float),
+            _query_arg(request, 'radius', float),
+            request.query.get('drone'),
+            _query_arg(request, 'limit', int)
+        )
+        return web.json_response(body, status=status)
+
+    async def get_telemetry_conflicts_async(request):
+        body, status = query_conflicts(
+            _query_arg(request, 'horizontal', float),
+            _query_arg(request, 'vertical', float)
+        )
+        return web.json_response(body, status=status)
+
+    async def get_shards_async(request):
+        return web.json_response(shard_status)
+
+    async def get_resources_async(request):
+        body, status = query_resources()
+        return web.json_response(body, status=status)
+
+    async def call_controller_async(coro):
+        if drone_controller is None or drone_controller.loop is asyncio.get_running_loop():
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, drone_controller.loop))
+
+    async def list_drones_async(request):
+        body, status = await call_controller_async(manage_drones("list"))
+        return web.json_response(body, status=status)
+
+    async def add_drone_async(request):
+        try:
+            options = await request.json() if request.can_read_body else {}
+        except ValueError:
+            options = None
+        body, status = await call_controller_async(manage_drones("add", options=options))
+        return web.json_response(body, status=status)
+
+    async def remove_drone_async(request):
+        body, status = await call_controller_async(manage_drones("remove", drone_id=request.match_info['drone_id']))
+        return web.json_response(body, status=status)
+
+    async def get_metrics_async(request):
+        response = web.Response(text=render_metrics())
+        response.headers['Content-Type'] = PROMETHEUS_MIME
+        return response
+
+    @web.middleware
+    async def observe_request(request, handler):
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await handler(request)
+            status = response.status
+            return response
+        except web.HTTPException as e:
+            status = e.status
+            raise
+        finally:
+            resource = request.match_info.route.resource
+            metrics.observe_request(route_label(resource.canonical if resource is not None else None),
+                                    request.method, status, time.perf_counter() - started)
+
+    async def stream_telemetry_async(request):
+        subscriber = broadcaster.subscribe(AsyncStreamSubscriber(asyncio.get_running_loop()))
+        response = web.StreamResponse(headers={
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
+        try:
+            await response.prepare(request)
+            await response.write(format_sse("snapshot", dict(telemetry_data), time.time()).encode())
+            while True:
+                pending = await subscriber.pop_async(STREAM_KEEPALIVE)
+                if pending is None:
+                    # broadcaster.close(): sunucu kapanıyor
+                    break
+                if pending:
+                    await response.write(format_pending(pending, time.time()).encode())
+                else:
+                    await response.write(b": keepalive\n\n")
+        except ConnectionResetError:
+            pass
+        finally:
+            broadcaster.unsubscribe(subscriber)
+        return response
+
+    async def close_streams(app):
+        # Açık /telemetry/stream işleyicileri dönmeden runner.cleanup bitmez
+        broadcaster.close()
+
+    async_app = web.Application(middlewares=[observe_request])
+    async_app.on_shutdown.append(close_streams)
+    async_app.router.add_get('/telemetry', get_telemetry_async)
+    async_app.router.add_get('/telemetry/history', get_telemetry_history_async)
+    async_app.router.add_get('/telemetry/stream', stream_telemetry_async)
+    async_app.router.add_get('/telemetry/nearby', get_telemetry_nearby_async)
+    async_app.router.add_get('/telemetry/conflicts', get_telemetry_conflicts_async)
+    async_app.router.add_get('/shards', get_shards_async)
+    async_app.router.add_get('/resources', get_resources_async)
+    async_app.router.add_get('/drones', list_drones_async)
+    async_app.router.add_post('/drones', add_drone_async)
+    async_app.router.add_delete('/drones/{drone_id}', remove_drone_async)
+    async_app.router.add_get('/metrics', get_metrics_async)
+    return async_app
+
+def configure_store(config: ServerConfig):
+    """Depoya bağlı isteğe bağlı bileşenleri yapılandırmaya göre kur"""
+    global telemetry_history, shm_writer, flight_recorder, resource_monitor, spatial_index
+    if config.record_path:
+        flight_recorder = FlightRecorder(config.record_path)
+        atexit.register(flight_recorder.close)
+        logger.info(f"Telemetri kaydı: {config.record_path}")
+    if config.shm_name:
+        shm_writer = SharedTelemetryWriter(config.shm_name, config.shm_capacity)
+        atexit.register(shm_writer.close)
+        logger.info(f"Paylaşımlı bellek anlık görüntüsü: /{config.shm_name} ({config.shm_capacity} kayıt)")
+    if config.history_size > 0:
+        telemetry_history = TelemetryHistory(config.history_size)
+        logger.info(
+            f"Telemetri geçmişi: drone başına {config.history_size} satır "
+            f"({telemetry_history.bytes_per_drone() // 1024} KiB)"
+        )
+    if config.spatial_cell_size > 0:
+        spatial_index = SpatialIndex(config.spatial_cell_size, config.spatial_origin, config.spatial_separation)
+    # Aynı süreçteki SimulationManager kendi izleyicisini verdiyse o paylaşılır
+    if config.resource_interval > 0 and resource_monitor is None:
+        resource_monitor = ResourceMonitor(config.resource_interval, config.resource_log_interval)
+
+def _bump_version(drone_id: str):
+    global telemetry_version
+    telemetry_version += 1
+    drone_versions[drone_id] = telemetry_version
+
+def register_drone(drone_id: str):
+    """Yeni bağlanan drone için boş bir kayıt oluştur"""
+    telemetry_data[drone_id] = {"position": {}, "velocity": {}, "battery": 0, "timestamps": {}}
+    removed_drones.pop(drone_id, None)
+    _bump_version(drone_id)
+    metrics.register_drone(drone_id)
+
+    if shm_writer is not None:
+        shm_writer.write(drone_id, telemetry_data[drone_id])
+
+    if flight_recorder is not None:
+        flight_recorder.record(drone_id, None, None)
+
+    if shard_publisher is not None:
+        shard_publisher.add(drone_id, None, None)
+
+def unregister_drone(drone_id: str):
+    """Drone'u depodan kaldır; istemciler X-Removed-Drones başlığından ve "remove" olayından öğrenir"""
+    global telemetry_version
+    if telemetry_data.pop(drone_id, None) is None:
+        return
+    drone_versions.pop(drone_id, None)
+    telemetry_version += 1
+    removed_drones[drone_id] = telemetry_version
+    metrics.unregister_drone(drone_id)
+    broadcaster.publish(drone_id, None)
+
+    if shm_writer is not None:
+        shm_writer.remove(drone_id)
+
+    if spatial_index is not None:
+        spatial_index.remove(drone_id)
+
+    if flight_recorder is not None:
+        flight_recorder.remove(drone_id)
+
+def update_telemetry(drone_id: str, key: str, value, source_time: Optional[float] = None,
+                     ingest_time: Optional[float] = None):
+    """
+    Drone'un tek bir telemetri alanını depoya yaz.
+    source_time örneğin otopilottaki zamanı (bilinmiyorsa None), ingest_time sunucuya giriş zamanıdır.
+    """
+    if ingest_time is None:
+        ingest_time = time.time()
+    entry = telemetry_data[drone_id]
+    entry[key] = value
+    # Akış aboneleri kaydın sığ kopyasını tuttuğu için zaman damgaları yerinde değiştirilmez
+    entry["timestamps"] = {**entry["timestamps"], key: {"source": source_time, "ingest": ingest_time}}
+    _bump_version(drone_id)
+    metrics.record_sample(drone_id, key, source_time, ingest_time)
+
+    # Yörünge geçmişi pozisyon örnekleriyle ilerler
+    if key == "position" and telemetry_history is not None:
+        telemetry_history.record(drone_id, ingest_time, entry)
+
+    broadcaster.publish(drone_id, entry)
+
+    if shm_writer is not None:
+        shm_writer.write(drone_id, entry)
+
+    if flight_recorder is not None:
+        flight_recorder.record(drone_id, key, value, ingest_time)
+
+    if shard_publisher is not None:
+        shard_publisher.add(drone_id, key, value, source_time, ingest_time)
+
+    # Yakınlık indeksi en son güncellenir; örnek diğer tüketicilere her durumda ulaşmış olur
+    if key == "position" and spatial_index is not None and value:
+        spatial_index.update(drone_id, value["lat"], value["lon"], value["alt"])
+
+def drone_index(drone_id: str) -> Optional[int]:
+    """"drone_<i>" kimliğinin indeksi; biçim uymuyorsa None"""
+    prefix, _, index = drone_id.partition("_")
+    if prefix != "drone" or not index.isdigit():
+        return None
+    return int(index)
+
+def sample_time(sample) -> Optional[float]:
+    """Örneğin kaynak zamanı; mavsdk tipleri zaman damgası taşımaz, sentetik örnekler taşır"""
+    return getattr(sample, "timestamp", None)
+
+def position_to_dict(position) -> Dict:
+    return {
+        "lat": position.latitude_deg,
+        "lon": position.longitude_deg,
+        "alt": position.absolute_altitude_m
+    }
+
+def velocity_to_dict(velocity) -> Dict:
+    return {
+        "north": velocity.north_m_s,
+        "east": velocity.east_m_s,
+        "down": velocity.down_m_s
+    }
+
+def battery_to_value(battery) -> float:
+    return round(battery.remaining_percent, 1)
 
 class TelemetryServer:
-    def _init_(self, config: ServerConfig):
+    def __init__(self, config: ServerConfig):
         self.config = config
-        self.drones: List[System] = []
-        self.server_processes: List[subprocess.Popen] = []
+        self.drones: Dict[str, System] = {}
+        self.server_processes: Dict[int, subprocess.Popen] = {}
+        self.startup_timings: Dict[str, Dict[str, float]] = {}
         self._running = False
         self._cleanup_done = False
+        self._tasks: List[asyncio.Task] = []
+        self._ingest: Optional[MavlinkIngest] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self.throttle_hz: Optional[float] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._fleet: Optional[SyntheticFleet] = None
+        self._drone_tasks: Dict[str, asyncio.Task] = {}
+        if config.drone_ids is not None:
+            self._indices = list(config.drone_ids)
+        else:
+            self._indices = list(range(config.num_drones))
 
-    async def start_mavsdk_servers(self) -> bool:
-        """Her drone için ayrı bir mavsdk_server başlat"""
+    def drone_indices(self) -> List[int]:
+        """Bu sunucunun sorumlu olduğu drone indeksleri (hot_plug ile çalışırken değişebilir)"""
+        return list(self._indices)
+
+    def _launch_mavsdk_server(self, drone_index: int) -> Optional[subprocess.Popen]:
+        """Tek bir drone için mavsdk_server sürecini başlat"""
+        udp_port = self.config.base_port + drone_index
+        server_port = self.config.server_base_port + drone_index
+        cmd = f"{self.config.mavsdk_server_path} -p {server_port} udpin://127.0.0.1:{udp_port}"
         try:
-            for i in range(self.config.num_drones):
-                udp_port = self.config.base_port + i
-                server_port = self.config.server_base_port + i
-                cmd = f"{self.config.mavsdk_server_path} -p {server_port} udpin://127.0.0.1:{udp_port}"
-                process = subprocess.Popen(
-                    cmd.split(),
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                self.server_processes.append(process)
-                await asyncio.sleep(0.5)  # Her server için kısa bir bekleme
-            
-            # Server'ların başlaması için bekle
-            await asyncio.sleep(self.config.server_startup_delay)
-            return True
+            # Çıktı okunmadığı için PIPE dolup sunucuyu bloklamasın
+            process = subprocess.Popen(
+                cmd.split(),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
         except Exception as e:
-            logger.error(f"mavsdk_server'lar başlatılırken hata: {str(e)}")
-            return False
+            logger.error(f"mavsdk_server {drone_index} başlatılırken hata: {str(e)}")
+            return None
+        self.server_processes[drone_index] = process
+        if resource_monitor is not None:
+            resource_monitor.track(f"mavsdk_server_{drone_index}", process.pid, "mavsdk_server")
+        return process
+
+    async def wait_server_ready(self, process: subprocess.Popen, drone_index: int) -> bool:
+        """mavsdk_server gRPC portunu açana kadar bekle (sistem keşfedilince port açılır)"""
+        server_port = self.config.server_base_port + drone_index
+        deadline = time.monotonic() + self.config.server_ready_timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                logger.error(f"mavsdk_server {drone_index} beklenmedik şekilde kapandı (kod {process.returncode})")
+                return False
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", server_port)
+                writer.close()
+                await writer.wait_closed()
+                return True
+            except OSError:
+                await asyncio.sleep(0.1)
+        logger.error(f"mavsdk_server {drone_index} {self.config.server_ready_timeout} sn içinde hazır olmadı")
+        return False
+
+    async def start_mavsdk_servers(self) -> Dict[int, bool]:
+        """Tüm mavsdk_server'ları aynı anda başlat ve hazır olmalarını paralel bekle"""
+        started = time.monotonic()
+        processes = {i: self._launch_mavsdk_server(i) for i in self.drone_indices()}
+
+        async def ready(i: int, process: Optional[subprocess.Popen]) -> bool:
+            if process is None or not await self.wait_server_ready(process, i):
+                return False
+            self.startup_timings.setdefault(f"drone_{i}", {})["server_ready"] = time.monotonic() - started
+            return True
+
+        results = await asyncio.gather(*[ready(i, p) for i, p in processes.items()])
+        return dict(zip(processes, results))
+
+    async def _wait_connected(self, drone: System):
+        async for state in drone.core.connection_state():
+            if state.is_connected:
+                return
 
     async def connect_drone(self, drone: System, drone_id: int) -> bool:
         """Drone'a bağlan"""
         port = self.config.base_port + drone_id
-        server_port = self.config.server_base_port + drone_id
         try:
             await drone.connect(system_address=f"udp://127.0.0.1:{port}")
             
             # Bağlantı durumunu kontrol et
-            timeout = self.config.connection_timeout
-            async for state in drone.core.connection_state():
-                if state.is_connected:
-                    logger.info(f"Drone {drone_id} başarıyla bağlandı")
-                    return True
-                await asyncio.sleep(0.1)
-                timeout -= 0.1
-                if timeout <= 0:
-                    logger.error(f"Drone {drone_id} bağlantı zaman aşımına uğradı")
-                    return False
+            await asyncio.wait_for(self._wait_connected(drone), self.config.connection_timeout)
+            logger.info(f"Drone {drone_id} başarıyla bağlandı")
+            return True
+        except asyncio.TimeoutError:
+            logger.error(f"Drone {drone_id} bağlantı zaman aşımına uğradı")
             return False
         except Exception as e:
             logger.error(f"Drone {drone_id} bağlantı hatası: {str(e)}")
             return False
 
+    def _make_system(self, drone_index: int):
+        if self._fleet is not None:
+            return SyntheticSystem(self._fleet, drone_index)
+        return System(mavsdk_server_address="localhost", port=self.config.server_base_port + drone_index)
+
+    async def _connect(self, drone_index: int) -> bool:
+        """Drone'a bağlan, depoya kaydet ve telemetri görevini başlat"""
+        drone_id = f"drone_{drone_index}"
+        drone = self._make_system(drone_index)
+        if not await self.connect_drone(drone, drone_index):
+            return False
+        self.drones[drone_id] = drone
+        register_drone(drone_id)
+        if self._running:
+            self._drone_tasks[drone_id] = asyncio.create_task(self.collect_telemetry(drone, drone_id))
+        return True
+
     async def collect_telemetry(self, drone: System, drone_id: str):
         """Drone'dan telemetri verilerini topla"""
+        if self.config.persistent_streams:
+            await self.stream_telemetry(drone, drone_id)
+        else:
+            await self.poll_telemetry(drone, drone_id)
+
+    async def poll_telemetry(self, drone: System, drone_id: str):
+        """Her turda stream'lerden birer örnek alıp telemetry_interval kadar bekle"""
         while self._running:
             try:
                 # Pozisyon verilerini al
                 async for position in drone.telemetry.position():
-                    telemetry_data[drone_id]["position"] = {
-                        "lat": position.latitude_deg,
-                        "lon": position.longitude_deg,
-                        "alt": position.absolute_altitude_m
-                    }
+                    update_telemetry(drone_id, "position", position_to_dict(position), sample_time(position))
                     break
 
                 # Hız verilerini al
                 async for velocity in drone.telemetry.velocity_ned():
-                    telemetry_data[drone_id]["velocity"] = {
-                        "north": velocity.north_m_s,
-                        "east": velocity.east_m_s,
-                        "down": velocity.down_m_s
-                    }
+                    update_telemetry(drone_id, "velocity", velocity_to_dict(velocity), sample_time(velocity))
                     break
 
                 # Batarya verilerini al
                 async for battery in drone.telemetry.battery():
-                    telemetry_data[drone_id]["battery"] = round(battery.remaining_percent, 1)
+                    update_telemetry(drone_id, "battery", battery_to_value(battery), sample_time(battery))
                     break
 
-                await asyncio.sleep(self.config.telemetry_interval)
+                await asyncio.sleep(self.poll_interval())
             except Exception as e:
                 logger.error(f"{drone_id} telemetri hatası: {str(e)}")
                 await asyncio.sleep(self.config.telemetry_interval)
 
+    def poll_interval(self) -> float:
+        """Kısma etkinse tur aralığı throttle_poll_factor kat uzar, en az 1 / throttle_hz olur"""
+        if self.throttle_hz:
+            return max(self.config.telemetry_interval * self.config.throttle_poll_factor, 1.0 / self.throttle_hz)
+        return self.config.telemetry_interval
+
+    async def stream_telemetry(self, drone: System, drone_id: str):
+        """Her stream için tek bir kalıcı abonelik aç, gelen her örneği depoya yaz"""
+        streams = [
+            ("position", drone.telemetry.position, position_to_dict,
+             self.config.position_rate_hz, drone.telemetry.set_rate_position),
+            ("velocity", drone.telemetry.velocity_ned, velocity_to_dict,
+             self.config.velocity_rate_hz, drone.telemetry.set_rate_velocity_ned),
+            ("battery", drone.telemetry.battery, battery_to_value,
+             self.config.battery_rate_hz, drone.telemetry.set_rate_battery),
+        ]
+        await asyncio.gather(*[
+            self.follow_stream(drone_id, key, subscribe, convert, rate_hz, set_rate)
+            for key, subscribe, convert, rate_hz, set_rate in streams
+        ])
+
+    async def follow_stream(self, drone_id: str, key: str, subscribe, convert,
+                            rate_hz: Optional[float], set_rate=None):
+        """Tek bir telemetri stream'ini takip et; kopan stream yeniden açılır"""
+        min_period = 1.0 / rate_hz if rate_hz else 0.0
+        last_update = 0.0
+
+        # Otopilottan istenen hızı ayarla; desteklenmezse istemci tarafı sınır yeterli
+        if rate_hz and set_rate is not None:
+            try:
+                await set_rate(rate_hz)
+            except Exception as e:
+                logger.warning(f"{drone_id} {key} hızı ayarlanamadı: {str(e)}")
+
+        while self._running:
+            try:
+                async for sample in subscribe():
+                    if not self._running:
+                        return
+                    now = time.monotonic()
+                    period = max(min_period, 1.0 / self.throttle_hz) if self.throttle_hz else min_period
+                    if now - last_update < period:
+                        continue
+                    last_update = now
+                    update_telemetry(drone_id, key, convert(sample), sample_time(sample))
+                # Hatasız biten stream de aynı beklemeyle yeniden açılır; yoksa döngü boşa döner
+                if self._running:
+                    logger.warning(f"{drone_id} {key} stream'i kapandı, yeniden açılıyor")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"{drone_id} {key} stream hatası: {str(e)}")
+            await asyncio.sleep(self.config.telemetry_interval)
+
+    def set_throttle(self, rate_hz: Optional[float]):
+        """Tüm stream'lere istemci tarafında üst hız sınırı uygula; None sınırı kaldırır"""
+        global telemetry_throttle_hz
+        self.throttle_hz = rate_hz
+        telemetry_throttle_hz = rate_hz
+        if self._ingest is not None:
+            self._ingest.set_throttle(rate_hz)
+
+    async def throttle_loop(self, monitor: ResourceMonitor):
+        """Makine CPU'su eşiği aşınca telemetriyi kıs, release_margin kadar altına inince geri aç"""
+        threshold = self.config.throttle_cpu_percent
+        release = threshold - self.config.throttle_release_margin
+        while self._running:
+            await asyncio.sleep(monitor.interval)
+            if self.throttle_hz is None and monitor.host_saturated(threshold):
+                logger.warning(
+                    f"Makine CPU'su %{threshold} eşiğini aştı, telemetri {self.config.throttle_rate_hz} Hz'e kısılıyor"
+                )
+                self.set_throttle(self.config.throttle_rate_hz)
+            elif self.throttle_hz is not None and not monitor.host_saturated(release):
+                logger.info("Makine yükü düştü, telemetri kısıtlaması kaldırıldı")
+                self.set_throttle(None)
+
+    def _start_resource_tasks(self):
+        """Kaynak izleyiciyi ve (açıksa) kısma politikasını başlat"""
+        monitor = resource_monitor
+        if monitor is None and self.config.throttle_cpu_percent is not None:
+            # configure_store çağrılmayan shard süreçleri: yalnızca makine yükü için yerel izleyici
+            monitor = ResourceMonitor(self.config.resource_interval or 2.0, log_interval=0)
+        if monitor is None:
+            return
+        self._tasks.append(asyncio.create_task(monitor.run()))
+        if self.config.throttle_cpu_percent is not None:
+            self._tasks.append(asyncio.create_task(self.throttle_loop(monitor)))
+
+    def _on_drone_connected(self, drone_id: str):
+        logger.info(f"{drone_id} MAVLink akışı alındı")
+        register_drone(drone_id)
+
+    async def run_mavlink_ingest(self):
+        """mavsdk_server olmadan drone portlarını dinle ve MAVLink mesajlarını doğrudan depoya yaz"""
+        self._ingest = MavlinkIngest(
+            self.config.mavlink_listen_host,
+            update_telemetry,
+            on_connect=self._on_drone_connected,
+            rate_limits={
+                "position": self.config.position_rate_hz,
+                "velocity": self.config.velocity_rate_hz,
+                "battery": self.config.battery_rate_hz
+            }
+        )
+        for i in self.drone_indices():
+            port = self.config.base_port + i
+            try:
+                await self._ingest.listen(f"drone_{i}", port)
+            except OSError as e:
+                logger.error(f"Drone {i} için UDP {port} dinlenemiyor: {str(e)}")
+
+        if not self._ingest.transports and not self.config.hot_plug:
+            logger.error("Hiçbir MAVLink portu açılamadı!")
+            self._running = False
+            return
+
+        logger.info(f"{len(self._ingest.transports)} MAVLink portu dinleniyor")
+        await self._stop_event.wait()
+
+    async def run_replay(self):
+        """Canlı drone'lar yerine kayıttan oynat; depo ve tüm endpoint'ler aynı şekilde beslenir"""
+        try:
+            replayer = FlightReplayer(self.config.replay_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Kayıt açılamadı: {str(e)}")
+            self._running = False
+            return
+
+        speed = "en yüksek" if self.config.replay_speed <= 0 else f"{self.config.replay_speed}x"
+        logger.info(
+            f"Kayıt oynatılıyor: {self.config.replay_path} "
+            f"({replayer.count} örnek, {replayer.duration():.1f} sn, hız {speed})"
+        )
+        try:
+            while self._running:
+                await replayer.replay(
+                    register_drone,
+                    update_telemetry,
+                    speed=self.config.replay_speed,
+                    start_offset=self.config.replay_start,
+                    is_known=telemetry_data.__contains__,
+                    on_remove=unregister_drone
+                )
+                if not self.config.replay_loop:
+                    break
+            logger.info("Kayıt oynatma tamamlandı")
+        finally:
+            replayer.close()
+
     async def start_telemetry(self):
         """Telemetri toplama işlemini başlat"""
+        global drone_controller
         logger.info("Telemetri toplama başlatılıyor...")
         self._running = True
+        self.loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._tasks.append(asyncio.create_task(metrics.monitor_loop_lag()))
+        self._start_resource_tasks()
 
-        # mavsdk_server'ları başlat
-        if not await self.start_mavsdk_servers():
-            logger.error("mavsdk_server'lar başlatılamadı!")
-            self._running = False
+        if self.config.replay_path:
+            await self.run_replay()
             return
 
-        # Drone'ları bağla
-        for i in range(self.config.num_drones):
-            drone_id = f"drone_{i}"
-            drone = System(mavsdk_server_address="localhost", port=self.config.server_base_port + i)
-            if await self.connect_drone(drone, i):
-                self.drones.append(drone)
-                telemetry_data[drone_id] = {"position": {}, "velocity": {}, "battery": 0}
-            else:
-                logger.error(f"Drone {i} başlatılamadı, diğer drone'lar devam ediyor...")
+        # Aynı süreçte drone'ları kendisi başlatan bir denetleyici (SimulationDaemon) yoksa API bu sunucuya bağlanır
+        if self.config.hot_plug and drone_controller is None:
+            drone_controller = self
+
+        if self.config.ingest_backend == "mavlink":
+            await self.run_mavlink_ingest()
+            return
+
+        started = time.monotonic()
+        if self.config.ingest_backend == "synthetic":
+            # mavsdk_server yok; System yerine aynı arayüzü sunan sentetik araçlar
+            fleet = SyntheticFleet(
+                self.drone_indices(),
+                rate_hz=self.config.synthetic_rate_hz,
+                seed=self.config.synthetic_seed
+            )
+            self._fleet = fleet
+            self._tasks.append(asyncio.create_task(fleet.run()))
+            ready = {i: True for i in self.drone_indices()}
+            logger.info(f"{len(ready)} sentetik drone {self.config.synthetic_rate_hz} Hz ile başlatıldı")
+        else:
+            # mavsdk_server'ları başlat
+            ready = await self.start_mavsdk_servers()
+            if not any(ready.values()) and not self.config.hot_plug:
+                logger.error("mavsdk_server'lar başlatılamadı!")
+                self._running = False
+                return
+
+        # Drone'ları sınırlı paralellikle bağla
+        semaphore = asyncio.Semaphore(self.config.connect_concurrency)
+
+        async def connect(i: int):
+            async with semaphore:
+                if await self._connect(i):
+                    self.startup_timings.setdefault(f"drone_{i}", {})["connected"] = time.monotonic() - started
+                else:
+                    logger.error(f"Drone {i} başlatılamadı, diğer drone'lar devam ediyor...")
 
-        if not self.drones:
+        await asyncio.gather(*[connect(i) for i, ok in ready.items() if ok])
+        self.log_startup_timings(time.monotonic() - started)
+
+        if not self.drones and not self.config.hot_plug:
             logger.error("Hiçbir drone başlatılamadı!")
             self._running = False
             return
 
-        # Telemetri toplama görevlerini başlat
-        tasks = [
-            self.collect_telemetry(drone, f"drone_{i}")
-            for i, drone in enumerate(self.drones)
-        ]
-        await asyncio.gather(*tasks)
+        # Telemetri görevleri bağlanınca başladı; stop() çağrılana kadar açık kal
+        await self._stop_event.wait()
+
+    def list_drones(self) -> Dict:
+        return {
+            "backend": self.config.ingest_backend,
+            "drones": {
+                f"drone_{i}": {"index": i, "registered": f"drone_{i}" in telemetry_data}
+                for i in self._indices
+            }
+        }
+
+    async def add_drone(self, index: Optional[int] = None, options: Optional[Dict] = None) -> Dict:
+        """
+        Çalışırken bir drone'u toplamaya ekle. index verilmezse ilk boş indeks kullanılır.
+        Geçersiz istekte ValueError, başlatma ya da bağlantı başarısızsa RuntimeError.
+        """
+        if not self._running or self.config.replay_path:
+            raise ValueError("Toplayıcı çalışmıyor ya da kayıt oynatılıyor")
+        if index is None:
+            index = max(self._indices, default=-1) + 1
+        # bool int'in alt sınıfı; {"index": true} 1 olarak kabul edilmesin
+        if not isinstance(index, int) or isinstance(index, bool) or index < 0:
+            raise ValueError(f"Geçersiz drone indeksi: {index!r}")
+        drone_id = f"drone_{index}"
+        if index in self._indices:
+            raise ValueError(f"{drone_id} zaten toplanıyor")
+        self._indices.append(index)
+
+        try:
+            if self.config.ingest_backend == "mavlink":
+                if self._ingest is None:
+                    raise RuntimeError("MAVLink toplayıcı henüz hazır değil")
+                port = self.config.base_port + index
+                try:
+                    await self._ingest.listen(drone_id, port)
+                except OSError as e:
+                    raise RuntimeError(f"UDP {port} dinlenemiyor: {str(e)}")
+                # Kayıt ilk MAVLink mesajı geldiğinde _on_drone_connected ile yapılır
+                logger.info(f"{drone_id} eklendi, UDP {port} dinleniyor")
+                return {"drone_id": drone_id, "index": index}
+
+            if self.config.ingest_backend == "synthetic":
+                self._fleet.add_vehicle(index)
+            else:
+                process = self._launch_mavsdk_server(index)
+                if process is None or not await self.wait_server_ready(process, index):
+                    raise RuntimeError(f"{drone_id} için mavsdk_server hazır olmadı")
+            if not await self._connect(index):
+                raise RuntimeError(f"{drone_id} bağlanamadı")
+        except Exception:
+            await self._release(index)
+            raise
+        logger.info(f"{drone_id} toplayıcıya eklendi")
+        return {"drone_id": drone_id, "index": index}
+
+    async def remove_drone(self, drone_id: str) -> bool:
+        """Drone'u toplayıcıdan ve depodan çıkar; bilinmiyorsa False"""
+        index = drone_index(drone_id)
+        if index is None or index not in self._indices:
+            return False
+        await self._release(index)
+        unregister_drone(drone_id)
+        logger.info(f"{drone_id} toplayıcıdan çıkarıldı")
+        return True
+
+    async def _release(self, index: int):
+        """Drone'un görevini, bağlantısını, portunu ve mavsdk_server'ını kapat"""
+        drone_id = f"drone_{index}"
+        if index in self._indices:
+            self._indices.remove(index)
+        task = self._drone_tasks.pop(drone_id, None)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        drone = self.drones.pop(drone_id, None)
+        if drone is not None:
+            try:
+                await drone.close()
+            except Exception as e:
+                logger.error(f"{drone_id} bağlantısı kapatılırken hata: {str(e)}")
+        if self._ingest is not None:
+            self._ingest.remove(drone_id)
+        if self._fleet is not None:
+            self._fleet.remove_vehicle(index)
+        process = self.server_processes.pop(index, None)
+        if process is not None:
+            if resource_monitor is not None:
+                resource_monitor.untrack(f"mavsdk_server_{index}")
+            await asyncio.get_running_loop().run_in_executor(None, self._terminate_server, process)
+
+    def _terminate_server(self, proc: subprocess.Popen):
+        try:
+            proc.send_signal(signal.SIGTERM)
+            proc.wait(timeout=5)  # 5 saniye bekle
+        except subprocess.TimeoutExpired:
+            proc.kill()  # Zaman aşımı olursa zorla sonlandır
+        except Exception as e:
+            logger.error(f"mavsdk_server sonlandırılırken hata: {str(e)}")
+
+    def log_startup_timings(self, total: float):
+        """Drone başına başlangıç sürelerini logla"""
+        for drone_id, timings in sorted(self.startup_timings.items()):
+            parts = ", ".join(f"{name}={value:.2f}s" for name, value in timings.items())
+            logger.info(f"{drone_id} başlangıç süreleri: {parts}")
+        logger.info(f"{len(self.drones)}/{len(self.drone_indices())} drone {total:.2f} sn içinde hazır")
 
     async def stop(self):
         """Telemetri toplama işlemini durdur"""
+        global drone_controller
         if self._cleanup_done:
             return
             
         self._running = False
         self._cleanup_done = True
+        if drone_controller is self:
+            drone_controller = None
+
+        # Kalıcı stream'ler yeni örnek gelene kadar bloklanır, görevleri iptal et
+        for task in [*self._tasks, *self._drone_tasks.values()]:
+            task.cancel()
+
+        # MAVLink UDP uç noktalarını kapat
+        if self._ingest is not None:
+            self._ingest.close()
+        if self._stop_event is not None:
+            self._stop_event.set()
         
         # Drone bağlantılarını kapat
-        for drone in self.drones:
+        for drone in self.drones.values():
             try:
                 await drone.close()
             except Exception as e:
                 logger.error(f"Drone bağlantısı kapatılırken hata: {str(e)}")
         
         # mavsdk_server'ları sonlandır
-        for proc in self.server_processes:
+        for proc in self.server_processes.values():
+            self._terminate_server(proc)
+
+class ShardPublisher:
+    """İşçi süreçte depo güncellemelerini biriktirip toplu halde ana sürece gönderir"""
+
+    def __init__(self, shard: int, out_queue, flush_interval: float, stats_interval: float):
+        self.shard = shard
+        self.out_queue = out_queue
+        self.flush_interval = flush_interval
+        self.stats_interval = stats_interval
+        self.samples_total = 0
+        self._batch: List[Tuple] = []
+
+    def add(self, drone_id: str, key: Optional[str], value, source_time: Optional[float] = None,
+            ingest_time: Optional[float] = None):
+        """key None ise drone kaydı, değilse tek bir telemetri örneği"""
+        self._batch.append((drone_id, key, value, source_time, ingest_time))
+        if key is not None:
+            self.samples_total += 1
+
+    def flush(self):
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self.out_queue.put(("samples", self.shard, batch))
+
+    async def run(self, server: "TelemetryServer"):
+        """Birikenleri flush_interval'da bir, istatistikleri stats_interval'da bir gönder"""
+        last_stats = 0.0
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+            now = time.monotonic()
+            if now - last_stats >= self.stats_interval:
+                last_stats = now
+                self.out_queue.put(("stats", self.shard, {
+                    "pid": os.getpid(),
+                    "drone_ids": server.drone_indices(),
+                    "connected": len(telemetry_data),
+                    "samples_total": self.samples_total,
+                    "throttle_hz": server.throttle_hz
+                }))
+
+def _run_shard(shard: int, config: ServerConfig, out_queue):
+    """İşçi süreç girişi: kendi drone dilimi ve portları için bir TelemetryServer çalıştırır"""
+    global shard_publisher
+    shard_publisher = ShardPublisher(shard, out_queue, config.shard_flush_interval, config.shard_stats_interval)
+
+    async def run():
+        server = TelemetryServer(config)
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop_event.set)
+
+        tasks = [
+            asyncio.create_task(server.start_telemetry()),
+            asyncio.create_task(shard_publisher.run(server))
+        ]
+        try:
+            await stop_event.wait()
+        finally:
+            await server.stop()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            shard_publisher.flush()
+            parent = multiprocessing.parent_process()
+            if parent is None or not parent.is_alive():
+                # Kuyruğu boşaltacak ana süreç yok; besleyici thread'i beklemek süreci sonsuza kadar asar
+                out_queue.cancel_join_thread()
+
+    logger.info(f"Shard {shard} başlatıldı: drone'lar {config.drone_ids}")
+    asyncio.run(run())
+
+class ShardedCollector:
+    """Drone'ları işçi süreçlere bölen ve gelen güncellemeleri bu süreçteki depoya birleştiren toplayıcı"""
+
+    def __init__(self, config: ServerConfig):
+        self.config = config
+        self.processes: Dict[int, multiprocessing.Process] = {}
+        self._context = multiprocessing.get_context("spawn")
+        self._queue = self._context.Queue()
+        self._running = False
+        self._cleanup_done = False
+
+    def _shard_slices(self) -> List[List[int]]:
+        """Drone indekslerini ardışık ve olabildiğince eşit dilimlere böl"""
+        indices = list(self.config.drone_ids) if self.config.drone_ids is not None \
+            else list(range(self.config.num_drones))
+        num_shards = min(self.config.num_shards, len(indices))
+        size, extra = divmod(len(indices), num_shards)
+        slices, start = [], 0
+        for shard in range(num_shards):
+            end = start + size + (1 if shard < extra else 0)
+            slices.append(indices[start:end])
+            start = end
+        return slices
+
+    def _get_message(self):
+        try:
+            return self._queue.get(timeout=0.5)
+        except queue.Empty:
+            return None
+
+    def _apply_message(self, message):
+        kind, shard, payload = message
+        if kind == "samples":
+            for drone_id, key, value, source_time, ingest_time in payload:
+                if key is None or drone_id not in telemetry_data:
+                    register_drone(drone_id)
+                if key is not None:
+                    # Giriş zamanı işçideki zamandır; IPC gecikmesi bayatlığa dahil olur
+                    update_telemetry(drone_id, key, value, source_time, ingest_time)
+        elif kind == "stats":
+            self._apply_stats(shard, payload)
+
+    def _drain(self):
+        """Kuyrukta bekleyenleri beklemeden uygula"""
+        while True:
             try:
-                proc.send_signal(signal.SIGTERM)
-                proc.wait(timeout=5)  # 5 saniye bekle
-            except subprocess.TimeoutExpired:
-                proc.kill()  # Zaman aşımı olursa zorla sonlandır
-            except Exception as e:
-                logger.error(f"mavsdk_server sonlandırılırken hata: {str(e)}")
+                message = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._apply_message(message)
+
+    def _apply_stats(self, shard: int, stats: Dict):
+        now = time.time()
+        status = shard_status.setdefault(shard, {"samples_total": 0})
+        previous_total = status["samples_total"]
+        previous_time = status.get("last_report")
+        status.update(stats)
+        status["last_report"] = now
+        if previous_time:
+            status["samples_per_sec"] = round((stats["samples_total"] - previous_total) / (now - previous_time), 1)
+
+    def _update_liveness(self):
+        now = time.time()
+        for shard, process in self.processes.items():
+            status = shard_status.setdefault(shard, {"samples_total": 0})
+            status["alive"] = process.is_alive()
+            status["exitcode"] = process.exitcode
+            if "last_report" in status:
+                status["report_age"] = round(now - status["last_report"], 2)
+
+    async def start_telemetry(self):
+        """İşçi süreçleri başlat ve kuyruktan gelen güncellemeleri depoya uygula"""
+        self._running = True
+        if self.config.hot_plug:
+            logger.warning("hot_plug parçalı toplayıcıda desteklenmiyor, /drones API'si kapalı")
+        for shard, drone_ids in enumerate(self._shard_slices()):
+            shard_config = replace(self.config, drone_ids=drone_ids, num_shards=1, history_size=0)
+            process = self._context.Process(
+                target=_run_shard,
+                args=(shard, shard_config, self._queue),
+                name=f"telemetry-shard-{shard}",
+                daemon=True
+            )
+            process.start()
+            self.processes[shard] = process
+            shard_status[shard] = {"samples_total": 0, "drone_ids": drone_ids, "pid": process.pid}
+            if resource_monitor is not None:
+                # Shard'ın mavsdk_server'ları alt süreç olarak bu kayda dahildir
+                resource_monitor.track(f"telemetry_shard_{shard}", process.pid, "shard")
+        logger.info(f"{len(self.processes)} telemetri shard'ı başlatıldı")
+
+        loop = asyncio.get_running_loop()
+        lag_task = asyncio.create_task(metrics.monitor_loop_lag())
+        resource_task = asyncio.create_task(resource_monitor.run()) if resource_monitor is not None else None
+        try:
+            while self._running:
+                # Kuyruk bloklayan bir API; bekleme executor'da, depo yazımı döngü thread'inde
+                message = await loop.run_in_executor(None, self._get_message)
+                self._update_liveness()
+                if message is not None:
+                    self._apply_message(message)
+        finally:
+            lag_task.cancel()
+            if resource_task is not None:
+                resource_task.cancel()
+
+    async def stop(self, timeout: float = 10.0):
+        """
+        İşçi süreçlere SIGTERM gönder; kendi mavsdk_server'larını kapatmalarını bekle. İşçiler son
+        toplu gönderimlerini kuyruğa yazıp kuyruğun besleyici thread'ini bekleyerek çıkar, bu yüzden
+        hepsi kapanana kadar kuyruk boşaltılmaya devam eder. Bekleme döngüyü bloklamaz.
+        """
+        if self._cleanup_done:
+            return
+        self._running = False
+        self._cleanup_done = True
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + timeout
+        while any(p.is_alive() for p in self.processes.values()) and time.monotonic() < deadline:
+            self._drain()
+            await asyncio.sleep(0.05)
+        self._drain()
+        for shard, process in self.processes.items():
+            if process.is_alive():
+                logger.error(f"Shard {shard} kapanmadı, zorla sonlandırılıyor")
+                process.kill()
+                await asyncio.get_running_loop().run_in_executor(None, process.join, 5.0)
+            else:
+                process.join()
+        self._update_liveness()
+
+def create_collector(config: ServerConfig):
+    """Yapılandırmaya göre tek süreçli ya da parçalı toplayıcı"""
+    if config.num_shards > 1:
+        return ShardedCollector(config)
+    return TelemetryServer(config)
 
 def run_flask(config: ServerConfig):
     """Flask sunucusunu başlat"""
     logger.info(f"Flask sunucusu başlatılıyor: {config.host}:{config.port}")
     app.run(host=config.host, port=config.port, debug=False, use_reloader=False)
 
-def main():
+async def run_async(config: ServerConfig):
+    """HTTP API ve telemetri toplayıcılarını tek bir asyncio döngüsünde çalıştır"""
+    from aiohttp import web
+
+    server = create_collector(config)
+    runner = web.AppRunner(
+        create_async_app(),
+        access_log=None,
+        keepalive_timeout=config.http_keepalive_timeout,
+        shutdown_timeout=config.http_shutdown_timeout
+    )
+    await runner.setup()
+    site = web.TCPSite(runner, config.host, config.port)
+    await site.start()
+    logger.info(f"Asenkron HTTP sunucusu başlatıldı: {config.host}:{config.port}")
+
+    # SIGINT/SIGTERM gelene kadar çalış; telemetri normal biterse API açık kalır, hatayla biterse kapanır
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    def on_telemetry_done(task: asyncio.Task):
+        if task.cancelled() or task.exception() is None:
+            return
+        logger.error(f"Telemetri toplayıcısı hatayla durdu: {task.exception()!r}", exc_info=task.exception())
+        stop_event.set()
+
+    telemetry_task = asyncio.create_task(server.start_telemetry())
+    telemetry_task.add_done_callback(on_telemetry_done)
+    try:
+        await stop_event.wait()
+    finally:
+        logger.info("Program kapatılıyor...")
+        await server.stop()
+        telemetry_task.cancel()
+        await asyncio.gather(telemetry_task, return_exceptions=True)
+        await runner.cleanup()
+
+def main(config: Optional[ServerConfig] = None):
     """Ana çalıştırma fonksiyonu"""
-    config = ServerConfig()
+    config = config or ServerConfig()
+    configure_store(config)
+
+    if config.async_http:
+        asyncio.run(run_async(config))
+        return
     
     # Flask'ı ayrı bir thread'de başlat
     flask_thread = threading.Thread(
@@ -207,29 +1452,42 @@ def main():
     logger.info("Flask thread başlatıldı")
 
     # Telemetri sunucusunu başlat
-    server = TelemetryServer(config)
-    
+    server = create_collector(config)
+    telemetry_loop = asyncio.new_event_loop()
+
     def run_telemetry():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        asyncio.set_event_loop(telemetry_loop)
         try:
-            loop.run_until_complete(server.start_telemetry())
-        except KeyboardInterrupt:
-            logger.info("Telemetri sunucusu kapatılıyor...")
-            loop.run_until_complete(server.stop())
-        finally:
-            loop.close()
+            telemetry_loop.run_until_complete(server.start_telemetry())
+        except Exception as e:
+            logger.error(f"Telemetri toplayıcısı hatayla durdu: {e!r}", exc_info=e)
+        # Kapanışta server.stop() ana thread'den bu döngüye gönderilir; toplama bitse de döngü açık kalır
+        telemetry_loop.run_forever()
 
     telemetry_thread = threading.Thread(target=run_telemetry, daemon=True)
     telemetry_thread.start()
     logger.info("Telemetri thread başlatıldı")
 
+    def on_sigterm(signum, frame):
+        raise KeyboardInterrupt
+
+    # SIGTERM de Ctrl-C ile aynı kapanış yolundan geçsin; aksi halde shard süreçleri öksüz kalır
+    signal.signal(signal.SIGTERM, on_sigterm)
     try:
         # Ana thread'in kapanmasını engelle
         while True:
             threading.Event().wait()
     except KeyboardInterrupt:
         logger.info("Program kapatılıyor...")
+        try:
+            asyncio.run_coroutine_threadsafe(server.stop(), telemetry_loop).result(timeout=30)
+        except Exception as e:
+            logger.error(f"Toplayıcı kapatılamadı: {e!r}")
+        # os._exit atexit işleyicilerini çalıştırmaz
+        if shm_writer is not None:
+            shm_writer.close()
+        if flight_recorder is not None:
+            flight_recorder.close()
         os._exit(0)
 
 if __name__ == "__main__":
@@ -0,0 +1,175 @@
+"""
+Gazebo dünyasını ve telemetri sunucusunu açık tutan uzun ömürlü süreç. Drone'lar çalışırken
+HTTP API ile eklenip çıkarılır; dünya ve diğer drone'lar yeniden başlatılmaz.
+
+Örnek:
+    python simulation_daemon.py --drones 2
+    curl -X POST localhost:5000/drones -H 'Content-Type: application/json' -d '{"pose": "5,5"}'
+    curl -X DELETE localhost:5000/drones/drone_2
+    curl localhost:5000/drones
+"""
+import argparse
+import asyncio
+import logging
+import signal
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Dict, Optional, Set
+
+from gazebo_simulation import SimulationConfig, SimulationManager, parse_pose
+import server6
+from server6 import ServerConfig, TelemetryServer, drone_index
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class DaemonConfig:
+    # simulation.num_drones açılışta başlatılacak drone sayısıdır (0 olabilir)
+    simulation: SimulationConfig = field(default_factory=lambda: SimulationConfig(num_drones=0))
+    server: ServerConfig = field(default_factory=ServerConfig)
+
+class SimulationDaemon:
+    """SimulationManager ile TelemetryServer'ı birlikte yöneten /drones denetleyicisi"""
+
+    def __init__(self, config: DaemonConfig):
+        self.config = config
+        self.manager = SimulationManager(replace(config.simulation, install_signal_handlers=False))
+        self.server: Optional[TelemetryServer] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # Başlatılması süren drone'lar; aynı indeks iki kez eklenmesin
+        self._pending: Set[int] = set()
+
+    def list_drones(self) -> Dict:
+        return {
+            "drones": {
+                f"drone_{i}": {
+                    "index": i,
+                    "pid": process.pid,
+                    "pose": self.manager.poses.get(i),
+                    "px4_running": process.returncode is None,
+                    "registered": f"drone_{i}" in server6.telemetry_data
+                }
+                for i, process in sorted(self.manager.drone_processes.items())
+            },
+            "starting": sorted(self._pending)
+        }
+
+    async def add_drone(self, index: Optional[int] = None, options: Optional[Dict] = None) -> Dict:
+        """PX4 örneğini başlat, hazır olunca toplayıcıya ekle"""
+        if self.server is None:
+            raise RuntimeError("Telemetri sunucusu henüz hazır değil")
+        options = options or {}
+        if index is None:
+            index = max([*self.manager.drone_processes, *self._pending], default=-1) + 1
+        if not isinstance(index, int) or isinstance(index, bool) or index < 0:
+            raise ValueError(f"Geçersiz drone indeksi: {index!r}")
+        if index in self.manager.drone_processes or index in self._pending:
+            raise ValueError(f"drone_{index} zaten çalışıyor")
+        # Poz istekten gelir; yalnızca sayılar kabul edilir (geçersizse ValueError -> 400)
+        pose = options.get("pose")
+        if pose is not None:
+            pose = parse_pose(pose)
+        if self.manager.host_saturated():
+            raise RuntimeError("Makine doygun, yeni drone başlatılmıyor")
+
+        self._pending.add(index)
+        try:
+            if not await self.manager.add_drone(index, pose):
+                raise RuntimeError(f"drone_{index} için PX4 başlatılamadı, {self.manager.config.log_dir}/drone_{index}.log'a bakın")
+            try:
+                result = await self.server.add_drone(index)
+            except Exception:
+                await self.manager.remove_drone(index)
+                raise
+        finally:
+            self._pending.discard(index)
+        return {**result, "pose": self.manager.poses.get(index)}
+
+    async def remove_drone(self, drone_id: str) -> bool:
+        """Drone'u önce toplayıcıdan, sonra dünyadan çıkar"""
+        index = drone_index(drone_id)
+        if index is None or index not in self.manager.drone_processes:
+            return False
+        if self.server is not None:
+            await self.server.remove_drone(drone_id)
+        await self.manager.remove_drone(index)
+        return True
+
+    async def run(self):
+        self.loop = asyncio.get_running_loop()
+        stop_event = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            self.loop.add_signal_handler(sig, stop_event.set)
+
+        ready_future = self.loop.create_future()
+        simulation = asyncio.create_task(self.manager.run(
+            on_ready=lambda ready: ready_future.done() or ready_future.set_result(ready),
+            require_drones=False
+        ))
+        stop = asyncio.create_task(stop_event.wait())
+        runner = None
+        try:
+            done, _ = await asyncio.wait({ready_future, simulation, stop}, return_when=asyncio.FIRST_COMPLETED)
+            if ready_future not in done:
+                return
+
+            config = replace(self.config.server, drone_ids=ready_future.result(), hot_plug=True, num_shards=1)
+            server6.resource_monitor = self.manager.resource_monitor
+            server6.configure_store(config)
+            server6.drone_controller = self
+            self.server = TelemetryServer(config)
+
+            if config.async_http:
+                from aiohttp import web
+                runner = web.AppRunner(
+                    server6.create_async_app(), access_log=None, keepalive_timeout=config.http_keepalive_timeout,
+                    shutdown_timeout=config.http_shutdown_timeout
+                )
+                await runner.setup()
+                await web.TCPSite(runner, config.host, config.port).start()
+            else:
+                threading.Thread(target=server6.run_flask, args=(config,), daemon=True).start()
+            logger.info(f"Simülasyon servisi hazır: http://{config.host}:{config.port}/drones")
+
+            telemetry = asyncio.create_task(self.server.start_telemetry())
+            await asyncio.wait({simulation, telemetry, stop}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop.cancel()
+            server6.drone_controller = None
+            if self.server is not None:
+                await self.server.stop()
+            simulation.cancel()
+            await asyncio.gather(simulation, return_exceptions=True)
+            if runner is not None:
+                await runner.cleanup()
+            if server6.shm_writer is not None:
+                server6.shm_writer.close()
+            if server6.flight_recorder is not None:
+                server6.flight_recorder.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Drone'ları çalışırken ekleyip çıkarmaya izin veren simülasyon servisi")
+    parser.add_argument("--drones", type=int, default=0, help="açılışta başlatılacak drone sayısı")
+    parser.add_argument("--px4-path", default=SimulationConfig.px4_path)
+    parser.add_argument("--px4-root", default=SimulationConfig.px4_root)
+    parser.add_argument("--gazebo-path", default=SimulationConfig.gazebo_path)
+    parser.add_argument("--world-path", default=SimulationConfig.world_path)
+    parser.add_argument("--backend", default=ServerConfig.ingest_backend, choices=["mavsdk", "mavlink"])
+    parser.add_argument("--port", type=int, default=ServerConfig.port)
+    parser.add_argument("--async-http", action="store_true")
+    args = parser.parse_args()
+
+    config = DaemonConfig(
+        simulation=SimulationConfig(
+            num_drones=args.drones,
+            px4_path=args.px4_path,
+            px4_root=args.px4_root,
+            gazebo_path=args.gazebo_path,
+            world_path=args.world_path
+        ),
+        server=ServerConfig(ingest_backend=args.backend, port=args.port, async_http=args.async_http)
+    )
+    asyncio.run(SimulationDaemon(config).run())
+
+if __name__ == "__main__":
+    main()
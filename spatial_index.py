@@ -0,0 +1,271 @@
+import math
+import threading
+from array import array
+from typing import Dict, List, Optional, Set, Tuple
+
+# synthetic_fleet ile aynı küre yarıçapı; izdüşüm ve sentetik filo tutarlı kalır
+EARTH_RADIUS_M = 6378137.0
+
+# Çift taramasında her hücre kendisi ve bu dört komşusuyla karşılaştırılır; her çift bir kez görülür
+HALF_NEIGHBOURS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+NEIGHBOURS = tuple((dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+
+Cell = Tuple[int, int]
+
+class SpatialIndex:
+    """
+    Drone konumlarını başlangıç noktası etrafındaki yerel düzleme (doğu/kuzey metre, eşdikdörtgen
+    izdüşüm) yansıtıp sabit boyutlu ızgara hücrelerinde tutar. Koordinatlar sütun dizilerindedir
+    (array('d')); her konum güncellemesi yalnızca drone'un hücresini taşır, sorgular yarıçapı
+    kapsayan hücrelerdeki adaylarla sınırlıdır. Birkaç on km'lik alanlar için izdüşüm hatası
+    metrenin altındadır.
+
+    separation verilirse yatayda bu mesafeden yakın çiftler de güncellemeyle birlikte tutulur
+    (separation boyutlu ikinci bir ızgarada yalnızca 3x3 komşu hücre kontrol edilir); bu eşiğe
+    kadar olan conflicts sorguları filoyu taramaz.
+    """
+
+    def __init__(self, cell_size: float = 100.0, origin: Optional[Tuple[float, float]] = None,
+                 separation: float = 0.0):
+        if cell_size <= 0:
+            raise ValueError("cell_size pozitif olmalı")
+        if separation < 0:
+            raise ValueError("separation negatif olamaz")
+        self.cell_size = cell_size
+        self.separation = separation
+        # (lat, lon); verilmezse ilk konum başlangıç noktası olur
+        self.origin: Optional[Tuple[float, float]] = None
+        self._cos_lat0 = 1.0
+        if origin is not None:
+            self._set_origin(*origin)
+        self.x = array('d')
+        self.y = array('d')
+        self.z = array('d')
+        self._ids: List[Optional[str]] = []
+        self._cell_of: List[Optional[Cell]] = []
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._cells: Dict[Cell, Set[int]] = {}
+        # separation ızgarası, her slotun separation içindeki komşuları ve komşusu olan slotlar
+        self._near_cell_of: List[Optional[Cell]] = []
+        self._near_cells: Dict[Cell, Set[int]] = {}
+        self._near: List[Set[int]] = []
+        self._crowded: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _set_origin(self, lat: float, lon: float):
+        self.origin = (lat, lon)
+        self._cos_lat0 = math.cos(math.radians(lat))
+
+    def project(self, lat: float, lon: float) -> Tuple[float, float]:
+        """lat/lon'u başlangıç noktasına göre (doğu, kuzey) metreye çevir"""
+        if self.origin is None:
+            self._set_origin(lat, lon)
+        lat0, lon0 = self.origin
+        return (
+            math.radians(lon - lon0) * EARTH_RADIUS_M * self._cos_lat0,
+            math.radians(lat - lat0) * EARTH_RADIUS_M
+        )
+
+    def _cell(self, x: float, y: float) -> Cell:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def update(self, drone_id: str, lat: float, lon: float, alt: float):
+        """Drone'un konumunu yaz; hücresi değiştiyse taşı. GPS fix'i yokken gelen NaN konum drone'u indeksten çıkarır"""
+        with self._lock:
+            if not (math.isfinite(lat) and math.isfinite(lon)):
+                self._remove(drone_id)
+                return
+            x, y = self.project(lat, lon)
+            cell = self._cell(x, y)
+            slot = self._slots.get(drone_id)
+            if slot is None:
+                if self._free:
+                    slot = self._free.pop()
+                    self._ids[slot] = drone_id
+                else:
+                    slot = len(self._ids)
+                    self._ids.append(drone_id)
+                    self._cell_of.append(None)
+                    self._near_cell_of.append(None)
+                    self._near.append(set())
+                    self.x.append(0.0)
+                    self.y.append(0.0)
+                    self.z.append(0.0)
+                self._slots[drone_id] = slot
+            self.x[slot] = x
+            self.y[slot] = y
+            self.z[slot] = alt
+            old = self._cell_of[slot]
+            if old != cell:
+                if old is not None:
+                    self._leave(old, slot)
+                self._cells.setdefault(cell, set()).add(slot)
+                self._cell_of[slot] = cell
+            if self.separation:
+                self._update_near(slot, x, y)
+
+    def _update_near(self, slot: int, x: float, y: float):
+        """slot'un separation içindeki komşularını yeniden bul, karşı taraflarını da güncelle"""
+        separation = self.separation
+        cx, cy = math.floor(x / separation), math.floor(y / separation)
+        old_cell = self._near_cell_of[slot]
+        if old_cell != (cx, cy):
+            if old_cell is not None:
+                self._leave(old_cell, slot, self._near_cells)
+            self._near_cells.setdefault((cx, cy), set()).add(slot)
+            self._near_cell_of[slot] = (cx, cy)
+
+        xs, ys, cells = self.x, self.y, self._near_cells
+        near = set()
+        for dx, dy in NEIGHBOURS:
+            members = cells.get((cx + dx, cy + dy))
+            if members:
+                near.update(other for other in members
+                            if other != slot and math.hypot(xs[other] - x, ys[other] - y) <= separation)
+        old = self._near[slot]
+        if near == old:
+            return
+        for other in old - near:
+            self._unlink(other, slot)
+        for other in near - old:
+            self._near[other].add(slot)
+            self._crowded.add(other)
+        self._near[slot] = near
+        if near:
+            self._crowded.add(slot)
+        else:
+            self._crowded.discard(slot)
+
+    def _unlink(self, slot: int, other: int):
+        near = self._near[slot]
+        near.discard(other)
+        if not near:
+            self._crowded.discard(slot)
+
+    def _leave(self, cell: Cell, slot: int, cells: Optional[Dict[Cell, Set[int]]] = None):
+        cells = self._cells if cells is None else cells
+        members = cells[cell]
+        members.discard(slot)
+        if not members:
+            del cells[cell]
+
+    def remove(self, drone_id: str):
+        with self._lock:
+            self._remove(drone_id)
+
+    def _remove(self, drone_id: str):
+        slot = self._slots.pop(drone_id, None)
+        if slot is None:
+            return
+        self._leave(self._cell_of[slot], slot)
+        self._cell_of[slot] = None
+        if self.separation:
+            self._leave(self._near_cell_of[slot], slot, self._near_cells)
+            self._near_cell_of[slot] = None
+            for other in self._near[slot]:
+                self._unlink(other, slot)
+            self._near[slot] = set()
+            self._crowded.discard(slot)
+        self._ids[slot] = None
+        self._free.append(slot)
+
+    def position(self, drone_id: str) -> Optional[Tuple[float, float, float]]:
+        """Drone'un izdüşümdeki (doğu, kuzey, irtifa) konumu"""
+        with self._lock:
+            slot = self._slots.get(drone_id)
+            if slot is None:
+                return None
+            return self.x[slot], self.y[slot], self.z[slot]
+
+    def _candidates(self, qx: float, qy: float, radius: float) -> List[int]:
+        """(qx, qy) etrafında radius'u kapsayan hücrelerdeki drone'lar"""
+        cx0, cy0 = self._cell(qx - radius, qy - radius)
+        cx1, cy1 = self._cell(qx + radius, qy + radius)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self._cells):
+            # Yarıçap filonun kapladığı alandan büyük; dolu hücreleri taramak daha ucuz
+            cells = [members for (cx, cy), members in self._cells.items()
+                     if cx0 <= cx <= cx1 and cy0 <= cy <= cy1]
+        else:
+            cells = [self._cells[(cx, cy)] for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)
+                     if (cx, cy) in self._cells]
+        return [slot for members in cells for slot in members]
+
+    def nearby(self, lat: float, lon: float, radius: float, alt: Optional[float] = None,
+               exclude: Optional[str] = None, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        radius metre içindeki drone'lar, yakından uzağa (drone_id, uzaklık) olarak.
+        alt verilirse 3B, verilmezse yatay uzaklık kullanılır.
+        """
+        if not (math.isfinite(lat) and math.isfinite(lon)):
+            return []
+        with self._lock:
+            if self.origin is None:
+                return []
+            qx, qy = self.project(lat, lon)
+            slots = self._candidates(qx, qy, radius)
+            xs, ys, zs, ids = self.x, self.y, self.z, self._ids
+            if alt is None:
+                distances = [math.hypot(xs[s] - qx, ys[s] - qy) for s in slots]
+            else:
+                distances = [math.hypot(xs[s] - qx, ys[s] - qy, zs[s] - alt) for s in slots]
+            result = [(ids[s], d) for s, d in zip(slots, distances) if d <= radius and ids[s] != exclude]
+        result.sort(key=lambda item: item[1])
+        return result[:limit] if limit else result
+
+    def conflicts(self, horizontal: float, vertical: Optional[float] = None) -> List[Dict]:
+        """
+        Yatayda horizontal, (verilmişse) dikeyde vertical metreden yakın drone çiftleri.
+        horizontal <= separation ise güncellemelerle tutulan çiftler süzülür. Aksi halde drone'lar
+        horizontal boyutlu geçici bir ızgaraya dağıtılır ve her hücre yalnızca kendisi ve yarım
+        komşuluğuyla karşılaştırılır; tarama sütunların kopyası üzerinde yapılır, güncellemeler
+        beklemez.
+        """
+        if horizontal <= 0:
+            raise ValueError("horizontal pozitif olmalı")
+        if horizontal <= self.separation:
+            with self._lock:
+                xs, ys, zs, ids = self.x, self.y, self.z, self._ids
+                pairs = []
+                for a in self._crowded:
+                    for b in self._near[a]:
+                        if b < a:
+                            continue
+                        h = math.hypot(xs[b] - xs[a], ys[b] - ys[a])
+                        v = abs(zs[b] - zs[a])
+                        if h > horizontal or (vertical is not None and v > vertical):
+                            continue
+                        pairs.append({"a": ids[a], "b": ids[b], "horizontal": round(h, 2), "vertical": round(v, 2)})
+            pairs.sort(key=lambda pair: pair["horizontal"])
+            return pairs
+
+        with self._lock:
+            xs, ys, zs, ids = self.x[:], self.y[:], self.z[:], list(self._ids)
+            slots = list(self._slots.values())
+
+        buckets: Dict[Cell, List[int]] = {}
+        for slot in slots:
+            buckets.setdefault((math.floor(xs[slot] / horizontal), math.floor(ys[slot] / horizontal)), []).append(slot)
+
+        pairs = []
+        for (cx, cy), members in buckets.items():
+            for dx, dy in HALF_NEIGHBOURS:
+                others = buckets.get((cx + dx, cy + dy))
+                if others is None:
+                    continue
+                same = dx == 0 and dy == 0
+                for i, a in enumerate(members):
+                    ax, ay, az = xs[a], ys[a], zs[a]
+                    for b in (members[i + 1:] if same else others):
+                        h = math.hypot(xs[b] - ax, ys[b] - ay)
+                        if h > horizontal:
+                            continue
+                        v = abs(zs[b] - az)
+                        if vertical is not None and v > vertical:
+                            continue
+                        pairs.append({"a": ids[a], "b": ids[b], "horizontal": round(h, 2), "vertical": round(v, 2)})
+        pairs.sort(key=lambda pair: pair["horizontal"])
+        return pairs
@@ -0,0 +1,276 @@
+"""
+PX4/Gazebo yerine kullanılabilen sentetik drone kaynağı. SyntheticSystem, TelemetryServer'ın
+kullandığı mavsdk System arayüzünün telemetri kısmını taklit eder; MavlinkEmitter ise aynı
+filoyu base_port + i portlarına gerçek MAVLink paketleri olarak gönderir.
+
+Tek başına çalıştırma (MAVLink yayını):
+    python synthetic_fleet.py --drones 500 --rate 10
+"""
+import argparse
+import asyncio
+import logging
+import math
+import random
+import socket
+import time
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+from mavlink_ingest import (
+    MSG_GLOBAL_POSITION_INT, MSG_HEARTBEAT, MSG_LOCAL_POSITION_NED, MSG_SYS_STATUS, encode_message
+)
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6378137.0
+
+# mavsdk.telemetry tiplerinin kullandığımız alanları; timestamp örneğin üretildiği adımın zamanıdır
+Position = namedtuple("Position", "latitude_deg longitude_deg absolute_altitude_m relative_altitude_m timestamp")
+VelocityNed = namedtuple("VelocityNed", "north_m_s east_m_s down_m_s timestamp")
+Battery = namedtuple("Battery", "id voltage_v remaining_percent timestamp")
+ConnectionState = namedtuple("ConnectionState", "is_connected")
+
+class SyntheticVehicle:
+    """Rastgele hedef noktalar arasında ivme sınırlı uçan, bataryası hız ile tükenen tek bir araç"""
+
+    def __init__(self, rng: random.Random, north: float, east: float):
+        self.rng = rng
+        self.north, self.east, self.up = north, east, 0.0
+        self.vn = self.ve = self.vu = 0.0
+        self.max_speed = rng.uniform(4.0, 12.0)
+        self.max_accel = 3.0
+        self.battery = rng.uniform(70.0, 100.0)
+        self._new_target()
+
+    def _new_target(self):
+        self.target_north = self.north + self.rng.uniform(-300.0, 300.0)
+        self.target_east = self.east + self.rng.uniform(-300.0, 300.0)
+        self.target_up = self.rng.uniform(10.0, 60.0)
+
+    def step(self, dt: float):
+        dn = self.target_north - self.north
+        de = self.target_east - self.east
+        du = self.target_up - self.up
+        distance = math.sqrt(dn * dn + de * de + du * du)
+        if distance < 2.0:
+            self._new_target()
+            return self.step(dt)
+
+        # Hedefe doğru istenen hız; yaklaştıkça yavaşla
+        speed = min(self.max_speed, math.sqrt(2 * self.max_accel * distance))
+        wanted = (dn / distance * speed, de / distance * speed, du / distance * speed)
+        max_dv = self.max_accel * dt
+        self.vn += max(-max_dv, min(max_dv, wanted[0] - self.vn))
+        self.ve += max(-max_dv, min(max_dv, wanted[1] - self.ve))
+        self.vu += max(-max_dv, min(max_dv, wanted[2] - self.vu))
+        self.north += self.vn * dt
+        self.east += self.ve * dt
+        self.up += self.vu * dt
+
+        # Havada asılı kalma maliyeti + hızla artan tüketim (%/sn)
+        ground_speed = math.hypot(self.vn, self.ve)
+        self.battery = max(0.0, self.battery - dt * (0.02 + 0.003 * ground_speed + 0.01 * max(self.vu, 0.0)))
+
+class SyntheticFleet:
+    """Bir grup sentetik aracı tek bir zamanlayıcı görevinde sabit hızda ilerletir"""
+
+    def __init__(self, drone_indices: List[int], rate_hz: float = 10.0, seed: int = 0,
+                 home_lat: float = 47.397742, home_lon: float = 8.545594, home_alt: float = 488.0):
+        self.rate_hz = rate_hz
+        self.home_lat = home_lat
+        self.home_lon = home_lon
+        self.home_alt = home_alt
+        self.seed = seed
+        self.vehicles: Dict[int, SyntheticVehicle] = {}
+        for i in drone_indices:
+            self.add_vehicle(i)
+        self.tick = 0
+        self.tick_time = time.time()
+        self._tick_future: Optional[asyncio.Future] = None
+        self._cos_home = math.cos(math.radians(home_lat))
+
+    def add_vehicle(self, i: int):
+        # Her drone kendi tohumunu kullanır; parçalı çalışmada ve sonradan eklenince de aynı yörüngeyi üretir
+        rng = random.Random(self.seed * 1_000_003 + i)
+        self.vehicles[i] = SyntheticVehicle(rng, north=(i // 32) * 10.0, east=(i % 32) * 10.0)
+
+    def remove_vehicle(self, i: int):
+        self.vehicles.pop(i, None)
+
+    def position(self, i: int) -> Position:
+        v = self.vehicles[i]
+        lat = self.home_lat + math.degrees(v.north / EARTH_RADIUS_M)
+        lon = self.home_lon + math.degrees(v.east / (EARTH_RADIUS_M * self._cos_home))
+        return Position(lat, lon, self.home_alt + v.up, v.up, self.tick_time)
+
+    def velocity(self, i: int) -> VelocityNed:
+        v = self.vehicles[i]
+        return VelocityNed(v.vn, v.ve, -v.vu, self.tick_time)
+
+    def battery(self, i: int) -> Battery:
+        v = self.vehicles[i]
+        return Battery(0, 12.6 * (0.8 + 0.2 * v.battery / 100.0), v.battery, self.tick_time)
+
+    async def wait_tick(self):
+        """Bir sonraki adım tamamlanana kadar bekle"""
+        if self._tick_future is None or self._tick_future.done():
+            self._tick_future = asyncio.get_running_loop().create_future()
+        await asyncio.shield(self._tick_future)
+
+    async def run(self):
+        """Araçları rate_hz ile ilerlet; gecikme birikirse adımları atlamadan dt büyür"""
+        period = 1.0 / self.rate_hz
+        last = time.monotonic()
+        next_tick = last + period
+        while True:
+            await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+            now = time.monotonic()
+            dt, last = now - last, now
+            next_tick = max(next_tick + period, now)
+            for vehicle in self.vehicles.values():
+                vehicle.step(dt)
+            self.tick += 1
+            self.tick_time = time.time()
+            if self._tick_future is not None and not self._tick_future.done():
+                self._tick_future.set_result(self.tick)
+
+class _SyntheticTelemetry:
+    def __init__(self, fleet: SyntheticFleet, index: int):
+        self._fleet = fleet
+        self._index = index
+        self._min_period: Dict[str, float] = {}
+
+    async def _stream(self, name: str, sample):
+        last = 0.0
+        while True:
+            await self._fleet.wait_tick()
+            now = time.monotonic()
+            if now - last < self._min_period.get(name, 0.0):
+                continue
+            last = now
+            yield sample(self._index)
+
+    def position(self):
+        return self._stream("position", self._fleet.position)
+
+    def velocity_ned(self):
+        return self._stream("velocity_ned", self._fleet.velocity)
+
+    def battery(self):
+        return self._stream("battery", self._fleet.battery)
+
+    async def _set_rate(self, name: str, rate_hz: float):
+        self._min_period[name] = 1.0 / rate_hz if rate_hz > 0 else 0.0
+
+    async def set_rate_position(self, rate_hz: float):
+        await self._set_rate("position", rate_hz)
+
+    async def set_rate_velocity_ned(self, rate_hz: float):
+        await self._set_rate("velocity_ned", rate_hz)
+
+    async def set_rate_battery(self, rate_hz: float):
+        await self._set_rate("battery", rate_hz)
+
+class _SyntheticCore:
+    async def connection_state(self):
+        yield ConnectionState(True)
+
+class SyntheticSystem:
+    """mavsdk.System yerine TelemetryServer'a verilebilen, sentetik filodan beslenen drone"""
+
+    def __init__(self, fleet: SyntheticFleet, index: int):
+        self.telemetry = _SyntheticTelemetry(fleet, index)
+        self.core = _SyntheticCore()
+
+    async def connect(self, system_address: Optional[str] = None):
+        return None
+
+    async def close(self):
+        return None
+
+class MavlinkEmitter:
+    """Filoyu her adımda base_port + i UDP portlarına MAVLink v2 paketleri olarak gönderir"""
+
+    def __init__(self, fleet: SyntheticFleet, host: str = "127.0.0.1", base_port: int = 14540):
+        self.fleet = fleet
+        self.host = host
+        self.base_port = base_port
+        self.packets_sent = 0
+        self._seq: Dict[int, int] = {i: 0 for i in fleet.vehicles}
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+
+    def _next_seq(self, i: int) -> int:
+        self._seq[i] = (self._seq[i] + 1) & 0xFF
+        return self._seq[i]
+
+    def send_all(self, heartbeat: bool = False):
+        time_boot_ms = int(time.monotonic() * 1000) & 0xFFFFFFFF
+        for i, vehicle in self.fleet.vehicles.items():
+            sysid = (i % 255) + 1
+            position = self.fleet.position(i)
+            packet = encode_message(MSG_GLOBAL_POSITION_INT, (
+                time_boot_ms,
+                int(position.latitude_deg * 1e7),
+                int(position.longitude_deg * 1e7),
+                int(position.absolute_altitude_m * 1000),
+                int(position.relative_altitude_m * 1000),
+                int(vehicle.vn * 100), int(vehicle.ve * 100), int(-vehicle.vu * 100),
+                0
+            ), sysid=sysid, seq=self._next_seq(i))
+            packet += encode_message(MSG_LOCAL_POSITION_NED, (
+                time_boot_ms, vehicle.north, vehicle.east, -vehicle.up,
+                vehicle.vn, vehicle.ve, -vehicle.vu
+            ), sysid=sysid, seq=self._next_seq(i))
+            packet += encode_message(MSG_SYS_STATUS, (
+                0, 0, 0, 0, int(self.fleet.battery(i).voltage_v * 1000), -1,
+                0, 0, 0, 0, 0, 0, int(vehicle.battery)
+            ), sysid=sysid, seq=self._next_seq(i))
+            if heartbeat:
+                # MAV_TYPE_QUADROTOR, MAV_AUTOPILOT_PX4, MAV_STATE_ACTIVE
+                packet += encode_message(MSG_HEARTBEAT, (0, 2, 12, 0, 4, 3), sysid=sysid, seq=self._next_seq(i))
+            try:
+                self._sock.sendto(packet, (self.host, self.base_port + i))
+                self.packets_sent += 1
+            except (BlockingIOError, OSError):
+                # Dinleyen yoksa ya da tampon doluysa bu adım düşer; bir sonraki adım yenisini getirir
+                pass
+
+    async def run(self):
+        last_heartbeat = 0.0
+        while True:
+            await self.fleet.wait_tick()
+            now = time.monotonic()
+            heartbeat = now - last_heartbeat >= 1.0
+            if heartbeat:
+                last_heartbeat = now
+            self.send_all(heartbeat)
+
+    def close(self):
+        self._sock.close()
+
+async def _run_emitter(args):
+    fleet = SyntheticFleet(list(range(args.drones)), rate_hz=args.rate, seed=args.seed)
+    emitter = MavlinkEmitter(fleet, args.host, args.base_port)
+    logger.info(f"{args.drones} sentetik drone {args.rate} Hz ile {args.host}:{args.base_port}+ portlarına yayında")
+    try:
+        await asyncio.gather(fleet.run(), emitter.run())
+    finally:
+        emitter.close()
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Sentetik drone filosunu MAVLink olarak yayınla")
+    parser.add_argument("--drones", type=int, default=5)
+    parser.add_argument("--rate", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=14540)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_run_emitter(args))
+    except KeyboardInterrupt:
+        logger.info("Sentetik filo kapatılıyor...")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import math
+import struct
+from typing import Dict, Tuple
+
+JSON_MIME = "application/json"
+PACKED_MIME = "application/x-telemetry-packed"
+
+PACKED_MAGIC = b"TLMP"
+# 2: kimlik uzunluk önekli, kayıtlar stream başına kaynak/giriş zamanlarını taşır
+PACKED_FORMAT_VERSION = 2
+
+# Başlık: magic, biçim sürümü, drone sayısı, depo sürümü
+PACKED_HEADER = struct.Struct('<4sHIQ')
+# Drone kaydı: kimlik uzunluğu (bayt) ve UTF-8 kimlik, ardından
+# lat, lon, alt, north, east, down, battery ve STREAMS sırasıyla (kaynak, giriş) zamanları (eksik değerler NaN)
+PACKED_ID_LENGTH = struct.Struct('<H')
+STREAMS = ("position", "velocity", "battery")
+PACKED_VALUES = struct.Struct(f'<{7 + 2 * len(STREAMS)}d')
+
+def _value(container: Dict, key: str) -> float:
+    value = container.get(key)
+    return math.nan if value is None else float(value)
+
+def wants_packed(accept: str) -> bool:
+    """Accept başlığı paketli biçimi JSON'dan daha çok tercih ediyor mu"""
+    quality = {}
+    for media_range in (accept or "").split(","):
+        parts = [p.strip() for p in media_range.split(";")]
+        q = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        quality[parts[0]] = q
+    packed = quality.get(PACKED_MIME, 0.0)
+    return packed > 0 and packed >= quality.get(JSON_MIME, 0.0)
+
+def encode_packed(data: Dict[str, Dict], version: int = 0) -> bytes:
+    """/telemetry verisini kimlik önekli, sabit değer bloklu kayıtlara paketle"""
+    parts = [PACKED_HEADER.pack(PACKED_MAGIC, PACKED_FORMAT_VERSION, len(data), version)]
+    for drone_id, entry in data.items():
+        raw_id = drone_id.encode()
+        if len(raw_id) > 0xFFFF:
+            raise ValueError(f"Drone kimliği çok uzun ({len(raw_id)} bayt)")
+        position = entry.get("position") or {}
+        velocity = entry.get("velocity") or {}
+        timestamps = entry.get("timestamps") or {}
+        stamps = []
+        for stream in STREAMS:
+            stamp = timestamps.get(stream) or {}
+            stamps.append(_value(stamp, "source"))
+            stamps.append(_value(stamp, "ingest"))
+        parts.append(PACKED_ID_LENGTH.pack(len(raw_id)))
+        parts.append(raw_id)
+        parts.append(PACKED_VALUES.pack(
+            _value(position, "lat"), _value(position, "lon"), _value(position, "alt"),
+            _value(velocity, "north"), _value(velocity, "east"), _value(velocity, "down"),
+            _value(entry, "battery"), *stamps
+        ))
+    return b"".join(parts)
+
+def decode_packed(payload: bytes) -> Tuple[Dict[str, Dict], int]:
+    """
+    Paketli yanıtı çöz.
+
+    Returns:
+        Tuple[Dict, int]: /telemetry ile aynı biçimde veri ve depo sürümü
+    """
+    magic, format_version, count, version = PACKED_HEADER.unpack_from(payload, 0)
+    if magic != PACKED_MAGIC or format_version != PACKED_FORMAT_VERSION:
+        raise ValueError("Tanınmayan paketli telemetri biçimi")
+
+    data = {}
+    view = memoryview(payload)
+    offset = PACKED_HEADER.size
+    for _ in range(count):
+        (id_length,) = PACKED_ID_LENGTH.unpack_from(view, offset)
+        offset += PACKED_ID_LENGTH.size
+        drone_id = bytes(view[offset:offset + id_length]).decode()
+        offset += id_length
+        lat, lon, alt, north, east, down, battery, *stamps = PACKED_VALUES.unpack_from(view, offset)
+        offset += PACKED_VALUES.size
+        timestamps = {}
+        for i, stream in enumerate(STREAMS):
+            source, ingest = stamps[2 * i], stamps[2 * i + 1]
+            if not math.isnan(ingest):
+                timestamps[stream] = {"source": None if math.isnan(source) else source, "ingest": ingest}
+        data[drone_id] = {
+            "position": {} if math.isnan(lat) else {"lat": lat, "lon": lon, "alt": alt},
+            "velocity": {} if math.isnan(north) else {"north": north, "east": east, "down": down},
+            "battery": 0 if math.isnan(battery) else battery,
+            "timestamps": timestamps
+        }
+    return data, version
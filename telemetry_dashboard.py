@@ -0,0 +1,188 @@
+import curses
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# (başlık, genişlik, hücre metni)
+Column = Tuple[str, int, Callable[[str, Dict, float], str]]
+
+def _fmt(value, digits: int) -> str:
+    return "N/A" if value is None else f"{value:.{digits}f}"
+
+def staleness(drone_data: Dict, now: float) -> Optional[float]:
+    """Son sunucuya giriş zamanından bu yana geçen süre; zaman damgası yoksa None"""
+    ingest = [stamp.get("ingest") for stamp in (drone_data.get("timestamps") or {}).values() if stamp.get("ingest")]
+    return now - max(ingest) if ingest else None
+
+COLUMNS: List[Column] = [
+    ("Drone", 16, lambda drone_id, d, now: drone_id[:16]),
+    ("Enlem", 12, lambda drone_id, d, now: _fmt((d.get("position") or {}).get("lat"), 6)),
+    ("Boylam", 12, lambda drone_id, d, now: _fmt((d.get("position") or {}).get("lon"), 6)),
+    ("Yük.", 8, lambda drone_id, d, now: _fmt((d.get("position") or {}).get("alt"), 1)),
+    ("Kuzey", 7, lambda drone_id, d, now: _fmt((d.get("velocity") or {}).get("north"), 1)),
+    ("Doğu", 7, lambda drone_id, d, now: _fmt((d.get("velocity") or {}).get("east"), 1)),
+    ("Aşağı", 7, lambda drone_id, d, now: _fmt((d.get("velocity") or {}).get("down"), 1)),
+    ("Batarya", 8, lambda drone_id, d, now: _fmt(d.get("battery"), 0)),
+    ("Yaş(sn)", 8, lambda drone_id, d, now: _fmt(staleness(d, now), 1)),
+]
+
+def _sort_value(key: str, drone_id: str, drone_data: Dict, now: float):
+    if key == "battery":
+        return drone_data.get("battery") or 0.0
+    if key == "altitude":
+        return (drone_data.get("position") or {}).get("alt") or 0.0
+    if key == "staleness":
+        age = staleness(drone_data, now)
+        return float("inf") if age is None else age
+    return drone_id
+
+SORT_KEYS = {ord("i"): "id", ord("b"): "battery", ord("a"): "altitude", ord("s"): "staleness"}
+
+class TelemetryDashboard:
+    """
+    TelemetryClient için tam ekran terminal görünümü. Veri arka plan thread'inde yoklanır ya
+    da akıştan alınır; ekran sabit düzende çizilir ve her karede yalnızca değişen hücreler yazılır.
+
+    Tuşlar: n/PgDn sonraki sayfa, p/PgUp önceki sayfa, i/b/a/s kimlik/batarya/yükseklik/yaş
+    sıralaması, r ters sıra, q çıkış.
+    """
+
+    def __init__(self, client, refresh_interval: float = 0.25):
+        self.client = client
+        self.refresh_interval = refresh_interval
+        self.data: Dict[str, Dict] = {}
+        self.sort_key = "id"
+        self.reverse = False
+        self.page = 0
+        self.status = "Bağlanılıyor..."
+        # Ekrandaki (satır, sütun) -> metin; yalnızca farklı olan hücreler yeniden yazılır
+        self._cells: Dict[Tuple[int, int], str] = {}
+
+    def _feed(self):
+        """Veriyi istemcinin kendi yoklama/akış mantığıyla al; dashboard ekran thread'inde kalır"""
+        client = self.client
+        if client.config.stream:
+            data: Dict[str, Dict] = {}
+            for event, update, _ in client.iter_stream_events():
+                if event == "snapshot":
+                    data = dict(update)
+                elif event == "remove":
+                    removed = set(update.get("drones", []))
+                    data = {k: v for k, v in data.items() if k not in removed}
+                else:
+                    data = {**data, **update}
+                # Ekran thread'i her zaman tutarlı bir sözlük görür
+                self.data = data
+                self.status = "Akış"
+        else:
+            while client.running:
+                data = client.fetch_telemetry()
+                if data is not None:
+                    self.data = data
+                    self.status = "Yoklama"
+                else:
+                    self.status = "Sunucuya ulaşılamıyor"
+                time.sleep(client.config.update_interval)
+
+    def _put(self, screen, row: int, col: int, text: str, width: int, attr: int = 0):
+        text = text.ljust(width)[:width]
+        if self._cells.get((row, col)) == text:
+            return
+        self._cells[(row, col)] = text
+        try:
+            screen.addstr(row, col, text, attr)
+        except curses.error:
+            # Sağ alt köşeye yazmak curses'ta hata verir; pencere küçükse satır kırpılır
+            pass
+
+    def _invalidate(self, screen):
+        self._cells.clear()
+        screen.erase()
+
+    def draw(self, screen):
+        height, width = screen.getmaxyx()
+        rows_per_page = max(1, height - 3)
+        now = time.time()
+        data = self.data
+        order = sorted(
+            data, key=lambda drone_id: _sort_value(self.sort_key, drone_id, data[drone_id], now),
+            reverse=self.reverse
+        )
+        pages = max(1, (len(order) + rows_per_page - 1) // rows_per_page)
+        if self.page >= pages:
+            self.page = pages - 1
+
+        direction = "azalan" if self.reverse else "artan"
+        self._put(screen, 0, 0, (
+            f" {len(order)} drone | sayfa {self.page + 1}/{pages} | sıralama: {self.sort_key} ({direction})"
+            f" | {self.status}"
+        ), width, curses.A_REVERSE)
+
+        col = 0
+        for title, column_width, _ in COLUMNS:
+            if col >= width:
+                break
+            self._put(screen, 1, col, title, min(column_width, width - col), curses.A_BOLD)
+            col += column_width + 1
+
+        start = self.page * rows_per_page
+        visible = order[start:start + rows_per_page]
+        for i in range(rows_per_page):
+            row = i + 2
+            col = 0
+            for _, column_width, cell in COLUMNS:
+                if col >= width:
+                    break
+                text = cell(visible[i], data[visible[i]], now) if i < len(visible) else ""
+                self._put(screen, row, col, text, min(column_width, width - col))
+                col += column_width + 1
+
+        self._put(screen, height - 1, 0,
+                  " n/p sayfa  i/b/a/s sırala  r ters  q çıkış", width - 1, curses.A_DIM)
+        screen.refresh()
+
+    def handle_key(self, key: int, screen) -> bool:
+        """Tuşu işle; çıkış istendiyse False"""
+        if key in (ord("q"), 27):
+            return False
+        if key in (ord("n"), curses.KEY_NPAGE, ord(" ")):
+            self.page += 1
+        elif key in (ord("p"), curses.KEY_PPAGE):
+            self.page = max(0, self.page - 1)
+        elif key in SORT_KEYS:
+            self.sort_key = SORT_KEYS[key]
+            self.page = 0
+        elif key == ord("r"):
+            self.reverse = not self.reverse
+        elif key == curses.KEY_RESIZE:
+            self._invalidate(screen)
+        return True
+
+    def _main(self, screen):
+        curses.curs_set(0)
+        screen.timeout(int(self.refresh_interval * 1000))
+        self._invalidate(screen)
+        while True:
+            self.draw(screen)
+            key = screen.getch()
+            if key != -1 and not self.handle_key(key, screen):
+                break
+
+    def run(self):
+        # Konsola yazan log handler'ları ekranı bozar; çalışma boyunca yalnızca dosya logları kalır
+        root = logging.getLogger()
+        console = [h for h in root.handlers if type(h) is logging.StreamHandler]
+        for handler in console:
+            root.removeHandler(handler)
+
+        self.client.start()
+        threading.Thread(target=self._feed, daemon=True).start()
+        try:
+            curses.wrapper(self._main)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.client.stop()
+            for handler in console:
+                root.addHandler(handler)
@@ -0,0 +1,111 @@
+import math
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+# Her drone için tutulan sütunlar (hepsi float64)
+HISTORY_COLUMNS = ("t", "lat", "lon", "alt", "north", "east", "down", "battery")
+
+class DroneHistory:
+    """Tek bir drone için sabit kapasiteli, sütun bazlı halka tampon"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.columns: Dict[str, array] = {
+            name: array('d', [math.nan]) * capacity for name in HISTORY_COLUMNS
+        }
+        self._head = 0   # Bir sonraki yazılacak satır
+        self._count = 0  # Dolu satır sayısı
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, row: Dict[str, float]):
+        """Bir satır ekle; tampon doluysa en eski satırın üzerine yazılır"""
+        for name in HISTORY_COLUMNS:
+            self.columns[name][self._head] = row.get(name, math.nan)
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def _physical(self, i: int) -> int:
+        """Kronolojik sıradaki i. satırın tampondaki indeksi"""
+        return (self._head - self._count + i) % self.capacity
+
+    def _lower_bound(self, t: float) -> int:
+        """Zaman damgası t'den küçük olmayan ilk satır (kronolojik indeks)"""
+        times = self.columns["t"]
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if times[self._physical(mid)] < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def query(self, since: Optional[float] = None, until: Optional[float] = None,
+              step: Optional[float] = None) -> Dict[str, List[Optional[float]]]:
+        """[since, until] aralığındaki satırları, step saniyede en fazla bir örnek olacak şekilde döndür"""
+        start = self._lower_bound(since) if since is not None else 0
+        end = self._lower_bound(math.nextafter(until, math.inf)) if until is not None else self._count
+
+        times = self.columns["t"]
+        indices = []
+        next_t = -math.inf
+        for i in range(start, end):
+            p = self._physical(i)
+            if step and times[p] < next_t:
+                continue
+            indices.append(p)
+            if step:
+                next_t = times[p] + step
+
+        # JSON'da NaN geçersiz olduğu için boş değerler None olarak döner
+        return {
+            name: [None if math.isnan(col[p]) else col[p] for p in indices]
+            for name, col in self.columns.items()
+        }
+
+class TelemetryHistory:
+    """Drone başına halka tamponları tutan, thread-safe geçmiş deposu"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._drones: Dict[str, DroneHistory] = {}
+        self._lock = threading.Lock()
+
+    def record(self, drone_id: str, timestamp: float, entry: Dict):
+        """telemetry_data'daki bir drone kaydının anlık görüntüsünü geçmişe ekle"""
+        position = entry.get("position") or {}
+        velocity = entry.get("velocity") or {}
+        row = {
+            "t": timestamp,
+            "lat": position.get("lat", math.nan),
+            "lon": position.get("lon", math.nan),
+            "alt": position.get("alt", math.nan),
+            "north": velocity.get("north", math.nan),
+            "east": velocity.get("east", math.nan),
+            "down": velocity.get("down", math.nan),
+            "battery": entry.get("battery", math.nan),
+        }
+        with self._lock:
+            history = self._drones.get(drone_id)
+            if history is None:
+                history = self._drones[drone_id] = DroneHistory(self.capacity)
+            history.append(row)
+
+    def drone_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._drones)
+
+    def query(self, drone_id: str, since: Optional[float] = None, until: Optional[float] = None,
+              step: Optional[float] = None) -> Optional[Dict[str, List[Optional[float]]]]:
+        with self._lock:
+            history = self._drones.get(drone_id)
+            if history is None:
+                return None
+            return history.query(since, until, step)
+
+    def bytes_per_drone(self) -> int:
+        """Bir drone'un geçmişi için ayrılan sabit bellek (bayt)"""
+        return self.capacity * len(HISTORY_COLUMNS) * array('d').itemsize
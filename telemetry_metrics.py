@@ -0,0 +1,181 @@
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+PROMETHEUS_MIME = "text/plain; version=0.0.4; charset=utf-8"
+
+STREAMS = ("position", "velocity", "battery")
+STREAM_INDEX = {name: i for i, name in enumerate(STREAMS)}
+
+# Saniye cinsinden kova sınırları
+INTERVAL_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+class Histogram:
+    """Sabit kovalı histogram; observe bellek ayırmaz"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str, lines: List[str]):
+        cumulative = 0
+        prefix = f"{labels}," if labels else ""
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.sum}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+
+class DroneMetrics:
+    """Bir drone için kayıt anında ayrılan sayaçlar"""
+
+    __slots__ = ("samples", "last_sample")
+
+    def __init__(self):
+        self.samples = [0] * len(STREAMS)
+        self.last_sample = [0.0] * len(STREAMS)
+
+class TelemetryMetrics:
+    """Telemetri sunucusunun sıcak yol ölçümleri; Prometheus metin biçiminde dışa verilir"""
+
+    def __init__(self):
+        self.drones: Dict[str, DroneMetrics] = {}
+        self.stream_interval = [Histogram(INTERVAL_BUCKETS) for _ in STREAMS]
+        self.stream_latency = [Histogram(LATENCY_BUCKETS) for _ in STREAMS]
+        self.loop_lag = Histogram(LATENCY_BUCKETS)
+        self.loop_lag_last = 0.0
+        self.serialize: Dict[str, Histogram] = {}
+        self.spatial: Dict[str, Histogram] = {}
+        self.http_duration: Dict[str, Histogram] = {}
+        self.http_requests: Dict[Tuple[str, str, int], int] = {}
+
+    def register_drone(self, drone_id: str):
+        if drone_id not in self.drones:
+            self.drones[drone_id] = DroneMetrics()
+
+    def unregister_drone(self, drone_id: str):
+        self.drones.pop(drone_id, None)
+
+    def record_sample(self, drone_id: str, key: str, source_time: Optional[float] = None,
+                      ingest_time: Optional[float] = None):
+        """Örneği say; kaynak zamanı biliniyorsa kaynaktan sunucuya giriş gecikmesini de ölç"""
+        drone = self.drones.get(drone_id)
+        index = STREAM_INDEX.get(key)
+        if drone is None or index is None:
+            return
+        if source_time is not None and ingest_time is not None:
+            # Saatler arası küçük kayma negatif gecikme üretebilir
+            self.stream_latency[index].observe(max(0.0, ingest_time - source_time))
+        now = time.monotonic()
+        last = drone.last_sample[index]
+        if last:
+            self.stream_interval[index].observe(now - last)
+        drone.last_sample[index] = now
+        drone.samples[index] += 1
+
+    def observe_serialize(self, fmt: str, seconds: float):
+        histogram = self.serialize.get(fmt)
+        if histogram is None:
+            histogram = self.serialize[fmt] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+
+    def observe_spatial(self, query: str, seconds: float):
+        histogram = self.spatial.get(query)
+        if histogram is None:
+            histogram = self.spatial[query] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+
+    def observe_request(self, route: str, method: str, status: int, seconds: float):
+        histogram = self.http_duration.get(route)
+        if histogram is None:
+            histogram = self.http_duration[route] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+        key = (route, method, status)
+        self.http_requests[key] = self.http_requests.get(key, 0) + 1
+
+    async def monitor_loop_lag(self, interval: float = 0.5):
+        """Döngünün zamanlanmış uyanmayı ne kadar geç yaptığını ölç"""
+        while True:
+            expected = time.monotonic() + interval
+            await asyncio.sleep(interval)
+            lag = max(0.0, time.monotonic() - expected)
+            self.loop_lag_last = lag
+            self.loop_lag.observe(lag)
+
+    def render(self, store: Dict[str, float]) -> str:
+        """Prometheus metin biçimi; store depo ile ilgili anlık göstergeleri içerir"""
+        lines: List[str] = []
+        now = time.monotonic()
+
+        lines.append("# HELP telemetry_samples_total Depoya yazılan telemetri örnekleri")
+        lines.append("# TYPE telemetry_samples_total counter")
+        for drone_id, drone in list(self.drones.items()):
+            for name, count in zip(STREAMS, drone.samples):
+                lines.append(f'telemetry_samples_total{{drone="{drone_id}",stream="{name}"}} {count}')
+
+        lines.append("# HELP telemetry_sample_age_seconds Son örnekten bu yana geçen süre")
+        lines.append("# TYPE telemetry_sample_age_seconds gauge")
+        for drone_id, drone in list(self.drones.items()):
+            for name, last in zip(STREAMS, drone.last_sample):
+                if last:
+                    lines.append(f'telemetry_sample_age_seconds{{drone="{drone_id}",stream="{name}"}} {now - last:.6f}')
+
+        lines.append("# HELP telemetry_stream_interval_seconds Aynı drone'un ardışık örnekleri arasındaki süre")
+        lines.append("# TYPE telemetry_stream_interval_seconds histogram")
+        for name, histogram in zip(STREAMS, self.stream_interval):
+            histogram.render("telemetry_stream_interval_seconds", f'stream="{name}"', lines)
+
+        lines.append("# HELP telemetry_stream_latency_seconds Örneğin kaynak zamanından sunucuya girişine kadar geçen süre")
+        lines.append("# TYPE telemetry_stream_latency_seconds histogram")
+        for name, histogram in zip(STREAMS, self.stream_latency):
+            histogram.render("telemetry_stream_latency_seconds", f'stream="{name}"', lines)
+
+        lines.append("# HELP telemetry_loop_lag_seconds Toplayıcı asyncio döngüsünün gecikmesi")
+        lines.append("# TYPE telemetry_loop_lag_seconds histogram")
+        self.loop_lag.render("telemetry_loop_lag_seconds", "", lines)
+        lines.append("# TYPE telemetry_loop_lag_last_seconds gauge")
+        lines.append(f"telemetry_loop_lag_last_seconds {self.loop_lag_last:.6f}")
+
+        for name, value in store.items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+
+        lines.append("# HELP telemetry_serialize_seconds /telemetry yanıtını serileştirme süresi")
+        lines.append("# TYPE telemetry_serialize_seconds histogram")
+        for fmt, histogram in list(self.serialize.items()):
+            histogram.render("telemetry_serialize_seconds", f'format="{fmt}"', lines)
+
+        lines.append("# HELP telemetry_spatial_query_seconds Yakınlık indeksi sorgu süresi")
+        lines.append("# TYPE telemetry_spatial_query_seconds histogram")
+        for query, histogram in list(self.spatial.items()):
+            histogram.render("telemetry_spatial_query_seconds", f'query="{query}"', lines)
+
+        lines.append("# HELP http_requests_total HTTP istekleri")
+        lines.append("# TYPE http_requests_total counter")
+        for (route, method, status), count in list(self.http_requests.items()):
+            lines.append(f'http_requests_total{{route="{route}",method="{method}",status="{status}"}} {count}')
+
+        lines.append("# HELP http_request_duration_seconds HTTP isteği işleme süresi")
+        lines.append("# TYPE http_request_duration_seconds histogram")
+        for route, histogram in list(self.http_duration.items()):
+            histogram.render("http_request_duration_seconds", f'route="{route}"', lines)
+
+        lines.append("")
+        return "\n".join(lines)
+
+def route_label(route: Optional[str]) -> str:
+    """Eşleşmeyen yollar tek etikette toplanır; kardinalite sınırlı kalır"""
+    return route or "unmatched"
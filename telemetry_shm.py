@@ -0,0 +1,132 @@
+import math
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_SHM_NAME = "server_sim_telemetry"
+
+SHM_MAGIC = b"TLMSHM01"
+SHM_LAYOUT_VERSION = 1
+
+# Başlık: magic, düzen sürümü, kapasite, kayıt boyutu, kullanılan kayıt sayısı
+HEADER = struct.Struct('<8sIIII')
+HEADER_SIZE = 64
+
+# Kayıt: seqlock sayacı, drone kimliği, lat, lon, alt, north, east, down, battery, updated_at
+RECORD = struct.Struct('<Q16s8d')
+RECORD_SIZE = 96
+SEQ = struct.Struct('<Q')
+DRONE_ID_SIZE = 16
+
+def shm_size(capacity: int) -> int:
+    return HEADER_SIZE + capacity * RECORD_SIZE
+
+def record_offset(slot: int) -> int:
+    return HEADER_SIZE + slot * RECORD_SIZE
+
+def _value(container: Dict, key: str) -> float:
+    value = container.get(key)
+    return math.nan if value is None else float(value)
+
+def unpack_record(fields: Tuple) -> Tuple[str, Dict, float]:
+    """Kaydı /telemetry ile aynı biçimde (drone_id, veri, updated_at) olarak aç"""
+    _, raw_id, lat, lon, alt, north, east, down, battery, updated_at = fields
+    drone_id = raw_id.rstrip(b'\x00').decode()
+    position = {} if math.isnan(lat) else {"lat": lat, "lon": lon, "alt": alt}
+    velocity = {} if math.isnan(north) else {"north": north, "east": east, "down": down}
+    return drone_id, {
+        "position": position,
+        "velocity": velocity,
+        "battery": 0 if math.isnan(battery) else battery
+    }, updated_at
+
+class SharedTelemetryWriter:
+    """Filo durumunu sabit düzenli bir paylaşımlı bellek bloğuna yazan, seqlock korumalı yazıcı"""
+
+    def __init__(self, name: str = DEFAULT_SHM_NAME, capacity: int = 1024):
+        self.name = name
+        self.capacity = capacity
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=shm_size(capacity))
+        except FileExistsError:
+            # Önceki çalıştırmadan kalmış blok; kaldırıp yeniden oluştur
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=shm_size(capacity))
+        self.buf = self.shm.buf
+        self._slots: Dict[str, int] = {}
+        # Kaldırılan drone'lardan boşalan kayıtlar; yeni drone'lar önce bunları kullanır
+        self._free: List[int] = []
+        self.buf[:shm_size(capacity)] = bytes(shm_size(capacity))
+        HEADER.pack_into(self.buf, 0, SHM_MAGIC, SHM_LAYOUT_VERSION, capacity, RECORD_SIZE, 0)
+
+    def _slot(self, drone_id: str) -> Optional[int]:
+        slot = self._slots.get(drone_id)
+        if slot is None:
+            if self._free:
+                slot = self._slots[drone_id] = self._free.pop()
+            elif self._used() >= self.capacity:
+                return None
+            else:
+                slot = self._slots[drone_id] = self._used()
+            # Kimlik burada yazılmaz: write onu verilerle aynı seqlock penceresinde yazar. O zamana kadar
+            # kayıt boş kimliklidir (yeni kayıt sıfırlı, boşalan kayıt remove ile boşaltılmış), okuyucular atlar
+            HEADER.pack_into(self.buf, 0, SHM_MAGIC, SHM_LAYOUT_VERSION, self.capacity, RECORD_SIZE, self._used())
+        return slot
+
+    def _used(self) -> int:
+        """Okuyucuların taradığı kayıt sayısı; boşalan kayıtlar da dahil"""
+        return len(self._slots) + len(self._free)
+
+    def remove(self, drone_id: str):
+        """Drone'un kaydını boş kimlikle işaretle; okuyucular boş kimlikli kayıtları atlar"""
+        slot = self._slots.pop(drone_id, None)
+        if slot is None:
+            return
+        offset = record_offset(slot)
+        seq = SEQ.unpack_from(self.buf, offset)[0]
+        SEQ.pack_into(self.buf, offset, seq + 1)
+        RECORD.pack_into(self.buf, offset, seq + 1, b"", *([math.nan] * 7), time.time())
+        SEQ.pack_into(self.buf, offset, seq + 2)
+        self._free.append(slot)
+
+    def write(self, drone_id: str, entry: Dict) -> bool:
+        """Drone kaydını güncelle; kapasite doluysa False"""
+        slot = self._slot(drone_id)
+        if slot is None:
+            return False
+        offset = record_offset(slot)
+        position = entry.get("position") or {}
+        velocity = entry.get("velocity") or {}
+        seq = SEQ.unpack_from(self.buf, offset)[0]
+
+        # Tek sayı: yazım sürüyor; okuyucu çift ve değişmemiş bir sayaç görene kadar tekrar dener
+        SEQ.pack_into(self.buf, offset, seq + 1)
+        RECORD.pack_into(
+            self.buf, offset, seq + 1, drone_id.encode()[:DRONE_ID_SIZE],
+            _value(position, "lat"), _value(position, "lon"), _value(position, "alt"),
+            _value(velocity, "north"), _value(velocity, "east"), _value(velocity, "down"),
+            _value(entry, "battery"), time.time()
+        )
+        SEQ.pack_into(self.buf, offset, seq + 2)
+        return True
+
+    def close(self):
+        """Bloğu kapat ve sistemden kaldır"""
+        self.buf = None
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+def attach_readonly(name: str) -> shared_memory.SharedMemory:
+    """Var olan bloğa bağlan; okuyucu çıkarken bloğun silinmemesi için resource_tracker kaydını kaldır"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
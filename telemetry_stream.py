@@ -0,0 +1,125 @@
+import asyncio
+import json
+import threading
+from typing import Dict, Optional, Set
+
+class StreamSubscriber:
+    """Bir akış istemcisinin bekleyen güncellemeleri; drone başına yalnızca en son kayıt tutulur"""
+
+    def __init__(self):
+        self._pending: Dict[str, Dict] = {}
+        self._cond = threading.Condition()
+        self.closed = False
+
+    def push(self, drone_id: str, entry: Optional[Dict]):
+        with self._cond:
+            # Yavaş istemci için eski güncellemeler birleştirilir, kuyruk büyümez
+            self._pending[drone_id] = entry
+            self._cond.notify()
+
+    def close(self):
+        """Bekleyen pop'u uyandır; sonraki pop'lar None döner"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify()
+
+    def pop(self, timeout: float) -> Optional[Dict[str, Dict]]:
+        """Bekleyen güncellemeleri al; hiç yoksa en fazla timeout saniye bekle. Kapatıldıysa None"""
+        with self._cond:
+            if not self._pending and not self.closed:
+                self._cond.wait(timeout)
+            if self.closed:
+                return None
+            pending, self._pending = self._pending, {}
+        return pending
+
+class AsyncStreamSubscriber(StreamSubscriber):
+    """asyncio döngüsünde beklenen abone; push herhangi bir thread'den çağrılabilir"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        super().__init__()
+        self._loop = loop
+        self._event = asyncio.Event()
+
+    def push(self, drone_id: str, entry: Optional[Dict]):
+        with self._cond:
+            self._pending[drone_id] = entry
+        self._loop.call_soon_threadsafe(self._event.set)
+
+    def close(self):
+        self.closed = True
+        self._loop.call_soon_threadsafe(self._event.set)
+
+    async def pop_async(self, timeout: float) -> Optional[Dict[str, Dict]]:
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._event.clear()
+        if self.closed:
+            return None
+        with self._cond:
+            pending, self._pending = self._pending, {}
+        return pending
+
+class TelemetryBroadcaster:
+    """Toplayıcılardan gelen drone güncellemelerini tüm akış abonelerine dağıtır"""
+
+    def __init__(self):
+        self._subscribers: Set[StreamSubscriber] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, subscriber: Optional[StreamSubscriber] = None) -> StreamSubscriber:
+        if subscriber is None:
+            subscriber = StreamSubscriber()
+        with self._lock:
+            if self._closed:
+                # Kapanış sırasında gelen istemci hemen sonlanır
+                subscriber.close()
+            else:
+                self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: StreamSubscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, drone_id: str, entry: Optional[Dict]):
+        """entry None ise drone depodan kaldırılmıştır"""
+        if not self._subscribers:
+            return
+        # Aboneler kaydı başka thread'de serileştirir, anlık kopyasını gönder
+        snapshot = dict(entry) if entry is not None else None
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.push(drone_id, snapshot)
+
+    def close(self):
+        """Sunucu kapanıyor: tüm aboneleri sonlandır; akış üreteçleri pop None döndüğünde çıkar"""
+        with self._lock:
+            self._closed = True
+            subscribers, self._subscribers = list(self._subscribers), set()
+        for subscriber in subscribers:
+            subscriber.close()
+
+def format_sse(event: str, data: Dict, published: Optional[float] = None) -> str:
+    """
+    Server-Sent Events formatında tek bir olay. published, olayın yayın zamanını
+    standart dışı bir alan olarak taşır; SSE istemcileri tanımadıkları alanları yok sayar.
+    """
+    published_line = f"published: {published!r}\n" if published is not None else ""
+    return f"event: {event}\n{published_line}data: {json.dumps(data)}\n\n"
+
+def format_pending(pending: Dict[str, Optional[Dict]], published: Optional[float] = None) -> str:
+    """Bekleyen güncellemeleri "update", kaldırılan drone'ları (None) {"drones": [...]} ile "remove" olayı yap"""
+    updates = {drone_id: entry for drone_id, entry in pending.items() if entry is not None}
+    removed = [drone_id for drone_id, entry in pending.items() if entry is None]
+    events = format_sse("update", updates, published) if updates else ""
+    if removed:
+        events += format_sse("remove", {"drones": removed}, published)
+    return events
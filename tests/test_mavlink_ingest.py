@@ -0,0 +1,99 @@
+import asyncio
+import socket
+import time
+
+import pytest
+
+import server6
+from mavlink_ingest import MSG_GLOBAL_POSITION_INT, MavlinkIngest, encode_message
+from synthetic_fleet import MavlinkEmitter, SyntheticFleet
+
+HOST = "127.0.0.1"
+
+@pytest.fixture(autouse=True)
+def empty_store():
+    server6.telemetry_data.clear()
+    server6.drone_versions.clear()
+    server6.removed_drones.clear()
+    yield
+    server6.telemetry_data.clear()
+    server6.drone_versions.clear()
+    server6.removed_drones.clear()
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+def position_frame(lat: float, lon: float, version: int, seq: int = 0) -> bytes:
+    return encode_message(MSG_GLOBAL_POSITION_INT, (
+        1000, int(lat * 1e7), int(lon * 1e7), 500_000, 10_000, 0, 0, 0, 0
+    ), seq=seq, version=version)
+
+async def wait_for(predicate, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("Beklenen telemetri depoya ulaşmadı")
+        await asyncio.sleep(0.01)
+
+async def run_ingest(body, samples=None):
+    """Loopback portunda drone_0 için MavlinkIngest aç, body(port)'u çalıştır ve kapat"""
+    def on_sample(drone_id, key, value, source_time=None):
+        if samples is not None:
+            samples.append((drone_id, key, value))
+        server6.update_telemetry(drone_id, key, value, source_time)
+
+    port = free_port()
+    ingest = MavlinkIngest(HOST, on_sample, on_connect=server6.register_drone)
+    await ingest.listen("drone_0", port)
+    try:
+        await body(port)
+    finally:
+        ingest.close()
+
+def test_emitter_populates_store():
+    async def body(port):
+        fleet = SyntheticFleet([0])
+        emitter = MavlinkEmitter(fleet, HOST, port)
+        try:
+            emitter.send_all(heartbeat=True)
+            await wait_for(lambda: server6.telemetry_data.get("drone_0", {}).get("velocity"))
+        finally:
+            emitter.close()
+
+        expected = fleet.position(0)
+        entry = server6.telemetry_data["drone_0"]
+        assert entry["position"]["lat"] == pytest.approx(expected.latitude_deg, abs=1e-6)
+        assert entry["position"]["lon"] == pytest.approx(expected.longitude_deg, abs=1e-6)
+        assert entry["battery"] == pytest.approx(fleet.vehicles[0].battery, abs=1.0)
+        assert set(entry["timestamps"]) == {"position", "velocity", "battery"}
+        assert entry["timestamps"]["position"]["source"] is not None
+
+    asyncio.run(run_ingest(body))
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_accepts_mavlink_versions(version):
+    async def body(port):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.sendto(position_frame(47.5, 8.5, version), (HOST, port))
+            await wait_for(lambda: server6.telemetry_data.get("drone_0", {}).get("position"))
+        assert server6.telemetry_data["drone_0"]["position"]["lat"] == pytest.approx(47.5)
+
+    asyncio.run(run_ingest(body))
+
+def test_drops_frame_with_bad_crc():
+    samples = []
+
+    async def body(port):
+        corrupt = bytearray(position_frame(10.0, 10.0, 2))
+        corrupt[-1] ^= 0xFF
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            # Bozuk çerçeve ardından geçerli bir çerçeve: yalnızca ikincisi depoya yazılmalı
+            sock.sendto(bytes(corrupt), (HOST, port))
+            sock.sendto(position_frame(47.5, 8.5, 2, seq=1), (HOST, port))
+            await wait_for(lambda: server6.telemetry_data.get("drone_0", {}).get("position"))
+        assert server6.telemetry_data["drone_0"]["position"]["lat"] == pytest.approx(47.5)
+        assert [key for _, key, _ in samples] == ["position"]
+
+    asyncio.run(run_ingest(body, samples))
@@ -0,0 +1,124 @@
+import json
+import os
+import socket
+import sys
+import time
+import urllib.request
+
+import psutil
+import pytest
+
+from gazebo_simulation import SimulationConfig
+from scenario_runner import ScenarioConfig, ScenarioRunner, stack_configs
+from server6 import ServerConfig
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Gazebo yerine: GAZEBO_MASTER_URI'deki portu açıp bekler
+GAZEBO_STUB = """#!{python}
+import os, socket, time
+port = int(os.environ["GAZEBO_MASTER_URI"].rsplit(":", 1)[1])
+sock = socket.socket()
+sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+sock.bind(("127.0.0.1", port))
+sock.listen()
+print("[Msg] master", port, flush=True)
+while True:
+    time.sleep(1)
+"""
+
+# PX4 yerine: hazır satırını yazar, PX4_SITL_PORT'a HEARTBEAT ve konum yollar
+PX4_STUB = """#!{python}
+import os, socket, sys, time
+sys.path.insert(0, {repo!r})
+from mavlink_ingest import MSG_GLOBAL_POSITION_INT, MSG_HEARTBEAT, encode_message
+instance = int(sys.argv[-1])
+port = int(os.environ["PX4_SITL_PORT"])
+print("INFO  [init] Startup script returned successfully", flush=True)
+sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+seq = 0
+while True:
+    seq = (seq + 1) & 0xFF
+    packet = encode_message(MSG_HEARTBEAT, (0, 2, 12, 0, 4, 3), seq=seq)
+    packet += encode_message(MSG_GLOBAL_POSITION_INT, (
+        int(time.monotonic() * 1000) & 0xFFFFFFFF, 473977420 + instance, 85455940, 488000, 10000, 0, 0, 0, 0
+    ), seq=seq)
+    sock.sendto(packet, ("127.0.0.1", port))
+    time.sleep(0.1)
+"""
+
+def write_stub(path, source: str) -> str:
+    path.write_text(source)
+    path.chmod(0o755)
+    return str(path)
+
+def free_tcp_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def fetch_telemetry(port: int):
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/telemetry", timeout=1) as response:
+            return json.loads(response.read())
+    except OSError:
+        return None
+
+@pytest.fixture
+def scenario(tmp_path):
+    http_port = free_tcp_port()
+    config = ScenarioConfig(
+        num_stacks=2,
+        drones_per_stack=1,
+        port_stride=10,
+        log_root=str(tmp_path / "logs"),
+        stop_timeout=10.0,
+        simulation=SimulationConfig(
+            px4_path=write_stub(tmp_path / "px4", PX4_STUB.format(python=sys.executable, repo=REPO_ROOT)),
+            px4_root=str(tmp_path),
+            gazebo_path=write_stub(tmp_path / "gazebo", GAZEBO_STUB.format(python=sys.executable)),
+            world_path="empty.world",
+            base_port=free_tcp_port(),
+            gazebo_master_port=free_tcp_port(),
+            px4_ready_timeout=10.0,
+            gazebo_ready_timeout=10.0,
+            resource_interval=0
+        ),
+        server=ServerConfig(ingest_backend="mavlink", host="127.0.0.1", port=http_port)
+    )
+    return config
+
+def test_stack_configs_do_not_overlap(scenario):
+    configs = [stack_configs(scenario, i) for i in range(scenario.num_stacks)]
+    assert len({simulation.log_dir for simulation, _ in configs}) == scenario.num_stacks
+    assert len({server.port for _, server in configs}) == scenario.num_stacks
+    assert len({server.base_port for _, server in configs}) == scenario.num_stacks
+    assert len({simulation.gazebo_master_port for simulation, _ in configs}) == scenario.num_stacks
+
+def test_stacks_start_and_stop(scenario):
+    runner = ScenarioRunner(scenario)
+    runner.start()
+    try:
+        ports = [stack_configs(scenario, i)[1].port for i in range(scenario.num_stacks)]
+        deadline = time.monotonic() + 30
+        snapshots = {}
+        while time.monotonic() < deadline and len(snapshots) < len(ports):
+            for port in ports:
+                data = fetch_telemetry(port)
+                if data and data.get("drone_0", {}).get("position"):
+                    snapshots[port] = data
+            time.sleep(0.2)
+        assert len(snapshots) == len(ports), "Yığınlar telemetri yayınlamadı"
+        stub_pids = {child.pid for p in runner.processes for child in psutil.Process(p.pid).children(recursive=True)}
+    finally:
+        runner.stop()
+
+    assert [p.exitcode for p in runner.processes] == [0] * scenario.num_stacks
+    assert not [pid for pid in stub_pids if psutil.pid_exists(pid) and psutil.Process(pid).status() != psutil.STATUS_ZOMBIE]
+    # Her yığının kendi sunucu/simülasyon logu vardır; ortak dosyaya yazılmaz
+    for i in range(scenario.num_stacks):
+        log_dir = stack_configs(scenario, i)[0].log_dir
+        assert os.path.exists(os.path.join(log_dir, "drone_0.log"))
+        with open(os.path.join(log_dir, "simulation.log")) as f:
+            lines = f.read().splitlines()
+        assert lines and all(f"stack_{i}" in line for line in lines if " - " in line)